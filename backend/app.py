@@ -8,17 +8,48 @@ from utils.middleware import (
     request_logging_middleware,
     security_headers_middleware,
 )
+from utils.compression import compression_middleware
+from utils.json_provider import init_json_provider
+import threading
+import click
+import time
 import os
 
 jwt = JWTManager()
 cors = CORS()
 
 
+def env_flag(name, default="false"):
+    """True if the environment variable is set to true/1/yes"""
+    return os.getenv(name, default).lower() in ("true", "1", "yes")
+
+
+def init_db():
+    """Create all database tables that don't exist yet"""
+    from models.gym import Gym
+    from models.members import Member
+    from models.subscription import Subscription
+    from models.subscription_plan import SubscriptionPlan
+    from models.trainers import Trainer
+    from models.contest import Contest
+    from models.participants import Participant
+    from models.contest_rank_counter import ContestRankCounter
+    from models.notification import Notification
+    from models.push_subscription import PushSubscription
+    from models.resource_version import ResourceVersion
+    from models.notification_counter import GymNotificationCounter
+    from models.notification_archive import NotificationArchive
+    from models.notification_retention_policy import NotificationRetentionPolicy
+
+    db.create_all()
+
+
 def create_app():
     app = Flask(__name__)
     # from_object() looks for uppercase attributes in the
     # given object and loads them into app.config. So lowercase variables are ignored.
     app.config.from_object(Config)
+    init_json_provider(app)
 
     # Ensure JWT_SECRET_KEY is set
     if not app.config.get("JWT_SECRET_KEY"):
@@ -66,7 +97,7 @@ def create_app():
     if not is_production:
         # In development, add common local network IP patterns to allowed origins
         # This allows access from any device on the local network
-        logger.info("Development mode: Allowing requests from local network IPs")
+        logger.debug("Development mode: Allowing requests from local network IPs")
         # Note: For production, explicitly set ALLOWED_ORIGINS with specific URLs
 
     # Add frontend URL to allowed origins if in production
@@ -89,7 +120,7 @@ def create_app():
     # Remove duplicates and filter empty strings
     allowed_origins = list(set(filter(None, allowed_origins)))
 
-    logger.info(f"CORS allowed origins: {allowed_origins}")
+    logger.debug(f"CORS allowed origins: {allowed_origins}")
 
     # Configure CORS with comprehensive settings
     # In development, allow local network IPs by adding them dynamically
@@ -98,11 +129,13 @@ def create_app():
         # This allows access from IP addresses like http://10.242.121.46:3000
         # Note: You can also explicitly add your IP via ALLOWED_ORIGINS env var
         # Example: ALLOWED_ORIGINS=http://localhost:3000,http://10.242.121.46:3000
-        logger.info(
+        logger.debug(
             "Development mode: CORS will allow local network IPs if added to ALLOWED_ORIGINS"
         )
-        logger.info("To allow a specific IP, add it to ALLOWED_ORIGINS env var, e.g.:")
-        logger.info("  ALLOWED_ORIGINS=http://localhost:3000,http://10.242.121.46:3000")
+        logger.debug("To allow a specific IP, add it to ALLOWED_ORIGINS env var, e.g.:")
+        logger.debug(
+            "  ALLOWED_ORIGINS=http://localhost:3000,http://10.242.121.46:3000"
+        )
 
     # Configure CORS - flask-cors requires explicit origins when using credentials
     cors.init_app(
@@ -119,6 +152,36 @@ def create_app():
     # Initialize database with engine options
     db.init_app(app)
 
+    # Bump resource versions (ETags, response cache) when models are flushed
+    from utils.etag_utils import init_resource_versioning
+
+    init_resource_versioning(app)
+
+    # Deliver real-time notification events when transactions commit
+    from services.notification_events import init_notification_events
+
+    init_notification_events(app)
+
+    # Connection-pool metrics (exposed at /health/pool)
+    from utils.db_pool import init_pool_metrics
+
+    init_pool_metrics(app)
+
+    # Versioned cache of gym-scoped GET responses (metrics at /health/cache)
+    from utils.response_cache import init_response_cache
+
+    init_response_cache(app)
+
+    # Coalescing of identical concurrent GETs (metrics at /health/coalescing)
+    from utils.single_flight import init_single_flight
+
+    init_single_flight(app)
+
+    # Read-only requests read from replicas when DATABASE_REPLICA_URLS is set
+    from utils.db_routing import init_replica_routing
+
+    init_replica_routing(app)
+
     # Apply SQLAlchemy engine options for production
     if hasattr(Config, "SQLALCHEMY_ENGINE_OPTIONS"):
         app.config["SQLALCHEMY_ENGINE_OPTIONS"] = Config.SQLALCHEMY_ENGINE_OPTIONS
@@ -163,6 +226,7 @@ def create_app():
     # Register middleware
     request_logging_middleware(app)
     security_headers_middleware(app)
+    compression_middleware(app)
 
     # register_blueprint() is used to register the blueprints with the app. just like routes in express.
     from routes.auth_route import auth_bp
@@ -191,29 +255,41 @@ def create_app():
     app.register_blueprint(participants_bp)
     app.register_blueprint(notification_bp)
 
-    # Import models and create tables after everything is registered
-    with app.app_context():
-        try:
-            from models.gym import Gym
-            from models.members import Member
-            from models.subscription import Subscription
-            from models.subscription_plan import SubscriptionPlan
-            from models.trainers import Trainer
-            from models.contest import Contest
-            from models.participants import Participant
-            from models.notification import Notification
-            from models.push_subscription import PushSubscription
-
-            # Test database connection
-            logger.info("Attempting to connect to database...")
-            db.create_all()
-            logger.info("Database tables created/verified successfully")
-        except Exception as e:
-            logger.error(f"Database initialization error: {str(e)}")
-            # Don't fail silently - raise the error so deployment fails if DB is misconfigured
-            raise
+    @app.cli.command("init-db")
+    def init_db_command():
+        """Create the database tables."""
+        init_db()
+        click.echo("Database tables created/verified successfully")
+
+    @app.cli.command("run-scheduler")
+    def run_scheduler_command():
+        """Run the scheduled background jobs in this process."""
+        from services.scheduler_service import init_scheduler, shutdown_scheduler
 
-        # Initialize scheduler for daily expiration checks
+        init_scheduler(app)
+        click.echo("Scheduler running, press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except (KeyboardInterrupt, SystemExit):
+            shutdown_scheduler()
+
+    # Tables are created with `flask --app app init-db`; set AUTO_CREATE_TABLES=true
+    # to create them at startup instead (convenient for local development)
+    if env_flag("AUTO_CREATE_TABLES"):
+        with app.app_context():
+            try:
+                logger.info("Attempting to connect to database...")
+                init_db()
+                logger.info("Database tables created/verified successfully")
+            except Exception as e:
+                logger.error(f"Database initialization error: {str(e)}")
+                # Don't fail silently - raise the error so deployment fails if DB is misconfigured
+                raise
+
+    # The scheduler only runs in processes that opt in with ENABLE_SCHEDULER=true
+    # (or in a dedicated `flask --app app run-scheduler` process)
+    if env_flag("ENABLE_SCHEDULER"):
         try:
             from services.scheduler_service import init_scheduler
 
@@ -227,8 +303,27 @@ def create_app():
     return app
 
 
-# Create app instance for gunicorn/production servers
-app = create_app()
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_app():
+    """Return this process's app instance, creating it on first use"""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
+
+
+def __getattr__(name):
+    # App instance for gunicorn/production servers (`gunicorn app:app`). It is
+    # created on first access, so importing this module has no side effects
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    get_app().run(debug=True)
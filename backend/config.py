@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import logging
 from datetime import timedelta
 from urllib.parse import urlparse, urlunparse
 
@@ -16,6 +17,11 @@ def get_database_url():
             "Please set it in your environment variables."
         )
 
+    return normalize_database_url(database_url)
+
+
+def normalize_database_url(database_url):
+    """Convert postgres:// URLs for SQLAlchemy 2.x and require SSL"""
     # Handle PostgreSQL URLs for production (Render, Heroku, etc.)
     # Add SSL requirement for production databases
     if database_url.startswith("postgres://"):
@@ -48,21 +54,136 @@ def get_database_url():
     return database_url
 
 
-class Config:
-    SQLALCHEMY_DATABASE_URI = get_database_url()
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
+def get_replica_binds():
+    """
+    SQLALCHEMY_BINDS for the read replicas in DATABASE_REPLICA_URLS
+    (comma-separated), named replica_1, replica_2, ...
+    """
+    urls = [
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    return {
+        f"replica_{index}": normalize_database_url(url)
+        for index, url in enumerate(urls, start=1)
+    }
+
+
+def _env_int(name, default=None):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def get_pool_size(workers=None, threads=None, max_connections=None, reserved=None):
+    """
+    Per-worker (pool_size, max_overflow) so that all workers together stay
+    within the database's connection limit.
+
+    Each worker needs one connection per request thread. The connections the
+    server allows (DB_MAX_CONNECTIONS minus DB_RESERVED_CONNECTIONS for
+    migrations, the scheduler and admin tools) are split between the
+    WEB_CONCURRENCY workers; whatever a worker's share leaves beyond its
+    threads becomes overflow. Without DB_MAX_CONNECTIONS the previous 10/20
+    sizing is kept.
+    """
+    workers = workers or _env_int("WEB_CONCURRENCY", 1)
+    threads = threads or _env_int("GUNICORN_THREADS", _env_int("THREADS", 1))
+    max_connections = max_connections or _env_int("DB_MAX_CONNECTIONS")
+    reserved = (
+        reserved if reserved is not None else _env_int("DB_RESERVED_CONNECTIONS", 5)
+    )
+
+    if not max_connections:
+        return 10, 20
+    per_worker = max(1, (max_connections - reserved) // workers)
+    pool_size = max(1, min(threads, per_worker))
+    return pool_size, per_worker - pool_size
+
+
+def get_engine_options(database_url=None, profile=None):
+    """
+    SQLAlchemy engine options for the DB_POOL_PROFILE environment variable:
+
+    - default: sized per worker (see get_pool_size), pre-ping on checkout,
+      connections recycled after 30 minutes
+    - long_lived: for a stable network path to the database; no pre-ping
+      round trip on every checkout and no time-based recycling. LIFO reuse
+      keeps hot connections busy and lets idle ones age out server-side;
+      broken connections are still detected and replaced on first error.
+    - pgbouncer: for PgBouncer in transaction mode; NullPool, so every
+      checkout borrows a server connection from PgBouncer and gives it back
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE and
+    DB_POOL_PRE_PING override individual settings of the chosen profile.
+    """
+    from utils.db_pool import InstrumentedQueuePool
+    from sqlalchemy.pool import NullPool
 
-    # Connection pool settings for production
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_pre_ping": True,  # Verify connections before using
-        "pool_recycle": 300,  # Recycle connections after 5 minutes
-        "pool_size": 10,  # Number of connections to maintain
-        "max_overflow": 20,  # Maximum number of additional connections
+    database_url = database_url or os.getenv("DATABASE_URL", "")
+    profile = (profile or os.getenv("DB_POOL_PROFILE", "default")).lower()
+    options = {
         "echo": os.getenv("SQL_DEBUG", "False").lower()
         == "true",  # Log SQL queries if debug is enabled
     }
 
+    # SQLite (local development) uses Flask-SQLAlchemy's own pool defaults
+    if database_url.startswith("sqlite"):
+        return options
+
+    if profile == "pgbouncer":
+        options.update({"poolclass": NullPool, "pool_pre_ping": False})
+        return options
+
+    pool_size, max_overflow = get_pool_size()
+    options.update(
+        {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": _env_int("DB_POOL_SIZE", pool_size),
+            "max_overflow": _env_int("DB_MAX_OVERFLOW", max_overflow),
+            "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        }
+    )
+    if profile == "long_lived":
+        options.update(
+            {"pool_pre_ping": False, "pool_recycle": -1, "pool_use_lifo": True}
+        )
+    else:
+        if profile != "default":
+            logging.getLogger(__name__).warning(
+                f"Unknown DB_POOL_PROFILE '{profile}', using 'default'"
+            )
+        options.update({"pool_pre_ping": True, "pool_recycle": 1800})
+
+    if os.getenv("DB_POOL_RECYCLE"):
+        options["pool_recycle"] = _env_int("DB_POOL_RECYCLE")
+    if os.getenv("DB_POOL_PRE_PING"):
+        options["pool_pre_ping"] = os.getenv("DB_POOL_PRE_PING").lower() == "true"
+    return options
+
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = get_database_url()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool settings, chosen with DB_POOL_PROFILE (see get_engine_options)
+    DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "default").lower()
+    SQLALCHEMY_ENGINE_OPTIONS = get_engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Optional read replicas for GET requests (see utils/db_routing.py)
+    SQLALCHEMY_BINDS = get_replica_binds()
+
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+
+    # Bearer token for the /health/* metrics endpoints (disabled when unset)
+    OPS_TOKEN = os.getenv("OPS_TOKEN")
+
+    # Server-Sent Events notification stream; each open stream holds a worker
+    # thread/greenlet, so it needs gthread or gevent workers (dashboards poll
+    # when it's off)
+    NOTIFICATION_STREAM_ENABLED = (
+        os.getenv("NOTIFICATION_STREAM_ENABLED", "false").lower() == "true"
+    )
     # JWT token expiration time
     # Options: timedelta(hours=24) for 24 hours, timedelta(days=7) for 7 days, etc.
     # Default if not set: 15 minutes
@@ -1,4 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
+from utils.db_routing import RoutingSession
 
 # Create a single SQLAlchemy instance
-db = SQLAlchemy()
+# (RoutingSession sends read-only requests to replicas, if configured)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -8,6 +8,11 @@ from .subscription_plan import SubscriptionPlan
 from .trainers import Trainer
 from .contest import Contest
 from .participants import Participant
+from .contest_rank_counter import ContestRankCounter
+from .resource_version import ResourceVersion
+from .notification_counter import GymNotificationCounter
+from .notification_archive import NotificationArchive
+from .notification_retention_policy import NotificationRetentionPolicy
 
 __all__ = [
     "Gym",
@@ -17,4 +22,9 @@ __all__ = [
     "Trainer",
     "Contest",
     "Participant",
+    "ContestRankCounter",
+    "ResourceVersion",
+    "GymNotificationCounter",
+    "NotificationArchive",
+    "NotificationRetentionPolicy",
 ]
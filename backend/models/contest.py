@@ -14,6 +14,12 @@ class Contest(db.Model):
     gym_id = db.Column(db.Integer, db.ForeignKey("gym.gym_id"), nullable=False)
     gym = db.relationship("Gym", backref="contests")
     participants = db.relationship("Participant")
+    # Incremented by every change to the contest's participants or scores, and
+    # the version Participant.contest_rank was last recomputed at
+    score_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    ranks_computed_version = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
 
     def to_dict(self):
         return {
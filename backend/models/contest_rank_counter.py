@@ -0,0 +1,22 @@
+from database import db
+from datetime import datetime
+
+
+class ContestRankCounter(db.Model):
+    """Last registration rank handed out in a contest, maintained on registration"""
+
+    contest_id = db.Column(
+        db.Integer,
+        db.ForeignKey("contest.contest_id", ondelete="CASCADE"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    last_rank = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "contest_id": self.contest_id,
+            "last_rank": self.last_rank,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -1,6 +1,7 @@
 from database import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from models.search import add_search_indexes
 
 
 class Member(db.Model):
@@ -27,6 +28,31 @@ class Member(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     gym_id = db.Column(db.Integer, db.ForeignKey("gym.gym_id"), nullable=False)
     gym = db.relationship("Gym", backref="members")
+    # Latest subscription and a copy of its status and end date, kept in sync
+    # by services/subscription_state_service.py
+    current_subscription_id = db.Column(
+        db.Integer,
+        db.ForeignKey(
+            "subscription.subscription_id",
+            name="fk_member_current_subscription",
+            use_alter=True,
+            ondelete="SET NULL",
+        ),
+        nullable=True,
+    )
+    subscription_status = db.Column(db.String(100), nullable=True)
+    subscription_end_date = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index(
+            "ix_member_subscription_expiry",
+            "subscription_status",
+            "subscription_end_date",
+        ),
+    )
+
+    # Columns matched by services/search_service.py
+    SEARCH_FIELDS = ("name", "email", "phone", "city")
 
     def set_password(self, password):
         """Hash and set the password"""
@@ -58,4 +84,12 @@ class Member(db.Model):
             else None,
             "gym_id": self.gym_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
+            "current_subscription_id": self.current_subscription_id,
+            "subscription_status": self.subscription_status,
+            "subscription_end_date": self.subscription_end_date.isoformat()
+            if self.subscription_end_date
+            else None,
         }
+
+
+add_search_indexes(Member)
@@ -13,6 +13,10 @@ class Notification(db.Model):
     )  # 'subscription_expired', 'subscription_expiring_soon'
     is_read = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Serves the newest-first listing and its cursor pagination
+    __table_args__ = (
+        db.Index("ix_notification_gym_created", "gym_id", "created_at", "id"),
+    )
     gym = db.relationship("Gym", backref="notifications")
     member = db.relationship("Member", backref="notifications")
 
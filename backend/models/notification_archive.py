@@ -0,0 +1,36 @@
+from database import db
+from datetime import datetime
+
+
+class NotificationArchive(db.Model):
+    """
+    Read notifications moved out of the hot notification table by the
+    retention job. Keeps the original id; no foreign keys, so archived rows
+    never block deleting a member or gym.
+    """
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    gym_id = db.Column(db.Integer, nullable=False)
+    member_id = db.Column(db.Integer, nullable=True)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    type = db.Column(db.String(50), nullable=False)
+    is_read = db.Column(db.Boolean, default=True, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    __table_args__ = (
+        db.Index("ix_notification_archive_gym_created", "gym_id", "created_at"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "gym_id": self.gym_id,
+            "member_id": self.member_id,
+            "title": self.title,
+            "message": self.message,
+            "type": self.type,
+            "is_read": self.is_read,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "archived_at": self.archived_at.isoformat() if self.archived_at else None,
+        }
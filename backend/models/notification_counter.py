@@ -0,0 +1,19 @@
+from database import db
+from datetime import datetime
+
+
+class GymNotificationCounter(db.Model):
+    """Unread notification count of a gym, maintained alongside Notification writes"""
+
+    gym_id = db.Column(
+        db.Integer, db.ForeignKey("gym.gym_id"), primary_key=True, autoincrement=False
+    )
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "gym_id": self.gym_id,
+            "unread_count": self.unread_count,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,23 @@
+from database import db
+from datetime import datetime
+
+
+class NotificationRetentionPolicy(db.Model):
+    """Per-gym notification retention; gyms without a row use the defaults"""
+
+    gym_id = db.Column(
+        db.Integer, db.ForeignKey("gym.gym_id"), primary_key=True, autoincrement=False
+    )
+    # Read notifications older than this are moved to the archive table
+    archive_after_days = db.Column(db.Integer, nullable=False)
+    # Archived notifications older than this are deleted (None keeps them)
+    purge_after_days = db.Column(db.Integer, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "gym_id": self.gym_id,
+            "archive_after_days": self.archive_after_days,
+            "purge_after_days": self.purge_after_days,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
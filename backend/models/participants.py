@@ -16,6 +16,18 @@ class Participant(db.Model):
     gym_id = db.Column(db.Integer, db.ForeignKey("gym.gym_id"), nullable=False)
     gym = db.relationship("Gym", backref="participants")
     participant_status = db.Column(db.String(100), nullable=False)
+    score = db.Column(db.Float, nullable=False, default=0)
+    # Contest.score_version of the last change to this participant
+    score_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "contest_id", "member_id", name="uq_participant_contest_member"
+        ),
+        # Rank recomputation and incremental leaderboard sync
+        db.Index("ix_participant_contest_score", "contest_id", "score"),
+        db.Index("ix_participant_contest_score_version", "contest_id", "score_version"),
+    )
 
     def to_dict(self):
         return {
@@ -25,6 +37,7 @@ class Participant(db.Model):
             "gym_id": self.gym_id,
             "contest_rank": self.contest_rank,
             "participant_status": self.participant_status,
+            "score": self.score,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
@@ -0,0 +1,22 @@
+from database import db
+from datetime import datetime
+
+# gym_id used for data that isn't scoped to a single gym (e.g. the gym list)
+GLOBAL_SCOPE = 0
+
+
+class ResourceVersion(db.Model):
+    """Version stamp of a gym's resource (members, trainers, ...), bumped on every write"""
+
+    gym_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    resource = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "gym_id": self.gym_id,
+            "resource": self.resource,
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,38 @@
+"""
+Search expressions shared by the PostgreSQL search indexes and the queries
+in services/search_service.py. The query expressions must match the indexed
+ones exactly for the planner to use the indexes.
+"""
+from database import db
+from sqlalchemy import cast, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+SEARCH_CONFIG = cast(literal("simple"), REGCONFIG)
+
+
+def search_text(columns):
+    """Lower-cased searchable columns joined by spaces"""
+    expression = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        expression = expression + " " + func.coalesce(column, "")
+    return func.lower(expression)
+
+
+def search_document(columns):
+    """tsvector of the searchable columns (words, no stemming)"""
+    return func.to_tsvector(SEARCH_CONFIG, search_text(columns))
+
+
+def add_search_indexes(model):
+    """
+    Add a tsvector index over model.SEARCH_FIELDS (PostgreSQL only). The
+    pg_trgm index needs the extension and is added by
+    scripts/add_search_indexes.py; SQLite uses an FTS5 table instead.
+    """
+    table = model.__table__
+    columns = [table.c[field] for field in model.SEARCH_FIELDS]
+    db.Index(
+        f"ix_{table.name}_search_document",
+        search_document(columns),
+        postgresql_using="gin",
+    ).ddl_if(dialect="postgresql")
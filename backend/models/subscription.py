@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 class Subscription(db.Model):
     id = db.Column("subscription_id", db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey("member.member_id"), nullable=False)
-    member = db.relationship("Member", backref="subscriptions")
+    member = db.relationship(
+        "Member", backref="subscriptions", foreign_keys=[member_id]
+    )
     gym_id = db.Column(db.Integer, db.ForeignKey("gym.gym_id"), nullable=False)
     gym = db.relationship("Gym", backref="subscriptions")
     subscription_plan = db.Column(db.String(100), nullable=False)
@@ -14,6 +16,13 @@ class Subscription(db.Model):
     end_date = db.Column(db.DateTime, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_subscription_member_created", "member_id", "created_at"),
+        # Expiry sweep (status = 'active' AND end_date < now) and status counts
+        db.Index("ix_subscription_status_end", "subscription_status", "end_date"),
+        db.Index("ix_subscription_gym_status", "gym_id", "subscription_status"),
+    )
+
     def is_active(self):
         return (
             datetime.utcnow() <= self.end_date and self.subscription_status == "active"
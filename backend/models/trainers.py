@@ -1,6 +1,7 @@
 from database import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from models.search import add_search_indexes
 
 
 class Trainer(db.Model):
@@ -33,6 +34,9 @@ class Trainer(db.Model):
     gym_id = db.Column(db.Integer, db.ForeignKey("gym.gym_id"), nullable=False)
     gym = db.relationship("Gym", backref="trainers")
 
+    # Columns matched by services/search_service.py
+    SEARCH_FIELDS = ("name", "specialization", "skills")
+
     def set_password(self, password):
         """Hash and set the password"""
         self.password = generate_password_hash(password)
@@ -57,3 +61,6 @@ class Trainer(db.Model):
             "gym_id": self.gym_id,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+add_search_indexes(Trainer)
@@ -3,14 +3,22 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from utils.email_utils import send_password_reset_email
 from utils.auth_utils import owner_required, get_current_gym
-from utils.validation import (
-    validate_gym_registration,
-    validate_login_data,
-    validate_password_reset_data,
-    validate_change_password_data,
-    validate_json_request,
+from utils.validation import validate_json_request
+from utils.schema import (
+    validate_payload,
+    GYM_REGISTRATION_SCHEMA,
+    LOGIN_SCHEMA,
+    PASSWORD_RESET_SCHEMA,
+    CHANGE_PASSWORD_SCHEMA,
 )
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version
+from utils.single_flight import coalesce_requests
+from models.resource_version import GLOBAL_SCOPE
+from services.gym_directory_service import (
+    gym_directory_response,
+    invalidate_gym_directory,
+)
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
@@ -18,15 +26,11 @@ auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
 @auth_bp.route("/register", methods=["POST"])
 @validate_json_request
+@validate_payload(GYM_REGISTRATION_SCHEMA)
 @handle_database_errors
-def register():
+def register(data):
     from models.gym import Gym
 
-    data = request.get_json()
-
-    # Validate registration data
-    validate_gym_registration(data)
-
     # Check if email already exists
     existing_gym = Gym.query.filter_by(email=data["email"]).first()
     if existing_gym:
@@ -45,27 +49,16 @@ def register():
     from database import db
 
     db.session.add(gym)
+    bump_resource_version(GLOBAL_SCOPE, "gyms")
     db.session.commit()
+    invalidate_gym_directory()
     return jsonify({"success": True, "message": "Gym registered successfully"}), 201
 
 
 @auth_bp.route("/get_gyms", methods=["GET"])
 def get_gyms():
     """Get list of all gyms for dropdown selection (public endpoint)"""
-    from models.gym import Gym
-
-    gyms = Gym.query.all()
-    gyms_list = [
-        {
-            "id": gym.id,
-            "name": gym.name,
-            "email": gym.email,
-            "city": gym.city,
-            "state": gym.state,
-        }
-        for gym in gyms
-    ]
-    return jsonify({"success": True, "gyms": gyms_list}), 200
+    return gym_directory_response()
 
 
 @auth_bp.route("/trainer/check", methods=["POST"])
@@ -530,15 +523,12 @@ def member_login():
 
 @auth_bp.route("/login", methods=["POST"])
 @validate_json_request
-def login():
+@validate_payload(LOGIN_SCHEMA)
+def login(data):
     from models.gym import Gym
     import logging
 
     logger = logging.getLogger(__name__)
-    data = request.get_json()
-
-    # Validate login data
-    validate_login_data(data)
 
     gym = Gym.query.filter_by(email=data["email"]).first()
     if gym and gym.check_password(data["password"]):
@@ -636,16 +626,12 @@ def forgot_password():
 
 @auth_bp.route("/reset_password", methods=["POST"])
 @validate_json_request
+@validate_payload(PASSWORD_RESET_SCHEMA)
 @handle_database_errors
-def reset_password():
+def reset_password(data):
     from models.gym import Gym
     from database import db
 
-    data = request.get_json()
-
-    # Validate password reset data
-    validate_password_reset_data(data)
-
     email = data["email"]
     otp = data["otp"]
     password = data["password"]
@@ -660,16 +646,12 @@ def reset_password():
 
 @auth_bp.route("/change_password", methods=["POST"])
 @validate_json_request
+@validate_payload(CHANGE_PASSWORD_SCHEMA)
 @handle_database_errors
-def change_password():
+def change_password(data):
     from models.gym import Gym
     from database import db
 
-    data = request.get_json()
-
-    # Validate change password data
-    validate_change_password_data(data)
-
     email = data["email"]
     old_password = data["old_password"]
     new_password = data["new_password"]
@@ -805,7 +787,9 @@ def update_gym_profile():
             gym.logo_link = (
                 logo_link if logo_link else None
             )  # Convert empty string to None
+        bump_resource_version(GLOBAL_SCOPE, "gyms")
         db.session.commit()
+        invalidate_gym_directory()
         return jsonify({"message": "gym profile updated successfully"}), 200
     return jsonify({"message": "gym not found"}), 404
 
@@ -820,7 +804,9 @@ def delete_gym_profile():
     gym = Gym.query.filter_by(email=email).first()
     if gym:
         db.session.delete(gym)
+        bump_resource_version(GLOBAL_SCOPE, "gyms")
         db.session.commit()
+        invalidate_gym_directory()
         return jsonify({"message": "gym profile deleted successfully"}), 200
     return jsonify({"message": "gym not found"}), 404
 
@@ -851,6 +837,9 @@ def get_gym_by_id():
 
 @auth_bp.route("/dashboard_stats", methods=["GET"])
 @owner_required
+@coalesce_requests(
+    resource=("members", "trainers", "subscriptions", "subscription_plans")
+)
 @handle_database_errors
 def get_dashboard_stats(current_gym):
     """Get dashboard statistics for the current gym"""
@@ -886,16 +875,9 @@ def get_dashboard_stats(current_gym):
         total_trainers = Trainer.query.filter(Trainer.gym_id == gym_id).count()
         logger.info(f"Total trainers for gym_id {gym_id}: {total_trainers}")
 
-        # Unpaid Memberships (subscriptions that are expired or not active) - filtered by gym_id
-        unpaid_memberships = Subscription.query.filter(
-            Subscription.gym_id == gym_id,
-            (Subscription.subscription_status != "active")
-            | (Subscription.end_date < now),
-        ).count()
-        logger.info(f"Unpaid memberships for gym_id {gym_id}: {unpaid_memberships}")
-
-        # Total Income (sum of prices from active subscriptions) - filtered by gym_id
-        # Get all active subscriptions and their plan prices
+        # Active subscriptions (status active and not past end_date) - filtered by gym_id.
+        # The expiry job moves overdue subscriptions to expired, but it only runs
+        # where ENABLE_SCHEDULER is set, so end_date is checked here as well
         active_subscriptions = Subscription.query.filter(
             Subscription.gym_id == gym_id,
             Subscription.subscription_status == "active",
@@ -905,6 +887,15 @@ def get_dashboard_stats(current_gym):
             f"Active subscriptions for gym_id {gym_id}: {len(active_subscriptions)}"
         )
 
+        # Unpaid Memberships (subscriptions that are expired or not active) - filtered by gym_id.
+        # Counted as all minus active, so both counts use the gym_id indexes
+        unpaid_memberships = Subscription.query.filter(
+            Subscription.gym_id == gym_id
+        ).count() - len(active_subscriptions)
+        logger.info(f"Unpaid memberships for gym_id {gym_id}: {unpaid_memberships}")
+
+        # Total Income (sum of prices from active subscriptions) - filtered by gym_id
+
         total_income = 0
         for subscription in active_subscriptions:
             # Get the subscription plan price - filtered by gym_id
@@ -945,14 +936,4 @@ def get_dashboard_stats(current_gym):
 
 @auth_bp.route("/get_all_gyms", methods=["GET"])
 def get_all_gyms():
-    from models.gym import Gym
-
-    gyms = Gym.query.all()
-    # fmt: off
-    return jsonify(
-        {
-            "message": "All gyms fetched successfully",
-            "gyms": [gym.to_dict() for gym in gyms],
-        }
-    ), 200
-    # fmt: on
+    return gym_directory_response(view="full")
@@ -3,8 +3,17 @@ from database import db
 from models.contest import Contest
 from models.participants import Participant
 from utils.auth_utils import owner_required
-from utils.validation import validate_json_request
+from utils.validation import validate_json_request, validate_scores
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version, conditional_get
+from utils.response_cache import cached_response
+from utils.serializers import serialize_many, parse_fields, projection
+from utils.single_flight import coalesce_requests
+from services.contest_leaderboard_service import (
+    get_leaderboard as get_contest_leaderboard,
+    record_scores as record_contest_scores,
+)
+from sqlalchemy import select
 
 contest_bp = Blueprint("contest", __name__, url_prefix="/api/contest")
 
@@ -29,6 +38,7 @@ def add_contest(current_gym):
         gym_id=current_gym.id,
     )
     db.session.add(contest)
+    bump_resource_version(current_gym.id, "contests")
     db.session.commit()
     return (
         jsonify(
@@ -44,16 +54,21 @@ def add_contest(current_gym):
 
 @contest_bp.route("/get_contest_by_id", methods=["GET"])
 @owner_required
+@cached_response("contests")
 @handle_database_errors
 def get_contest_by_id(current_gym):
-    contest_id = request.args.get("contest_id")
+    contest_id = request.args.get("contest_id", type=int)
+    if not contest_id:
+        return jsonify({"error": "A numeric contest_id is required"}), 400
     contest = Contest.query.filter_by(id=contest_id, gym_id=current_gym.id).first()
+    if not contest:
+        return jsonify({"success": False, "message": "Contest not found"}), 404
     return (
         jsonify(
             {
                 "success": True,
                 "message": "Contest fetched successfully",
-                "contest": contest,
+                "contest": contest.to_dict(),
             }
         ),
         200,
@@ -62,15 +77,22 @@ def get_contest_by_id(current_gym):
 
 @contest_bp.route("/get_all_contests", methods=["GET"])
 @owner_required
+@conditional_get("contests")
+@cached_response("contests")
 @handle_database_errors
 def get_all_contests(current_gym):
-    contests = Contest.query.filter_by(gym_id=current_gym.id).all()
+    fields = parse_fields(Contest, request.args.get("fields"))
+    contests = (
+        Contest.query.options(projection(Contest, fields))
+        .filter_by(gym_id=current_gym.id)
+        .all()
+    )
     return (
         jsonify(
             {
                 "success": True,
                 "message": "All contests fetched successfully",
-                "contests": [contest.to_dict() for contest in contests],
+                "contests": serialize_many(Contest, contests, fields),
             }
         ),
         200,
@@ -88,6 +110,7 @@ def delete_contest(current_gym):
     if not contest:
         return jsonify({"success": False, "message": "Contest not found"}), 404
     db.session.delete(contest)
+    bump_resource_version(current_gym.id, "contests")
     db.session.commit()
     return jsonify({"success": True, "message": "Contest deleted successfully"}), 200
 
@@ -106,6 +129,7 @@ def update_contest(current_gym):
     contest.description = data["description"]
     contest.start_date = data["start_date"]
     contest.end_date = data["end_date"]
+    bump_resource_version(current_gym.id, "contests")
     db.session.commit()
     return jsonify({"success": True, "message": "Contest updated successfully"}), 200
 
@@ -115,15 +139,18 @@ def update_contest(current_gym):
 @handle_database_errors
 def get_all_participants(current_gym):
     contest_id = request.args.get("contest_id")
-    participants = Participant.query.filter_by(
-        gym_id=current_gym.id, contest_id=contest_id
-    ).all()
+    fields = parse_fields(Participant, request.args.get("fields"))
+    participants = (
+        Participant.query.options(projection(Participant, fields))
+        .filter_by(gym_id=current_gym.id, contest_id=contest_id)
+        .all()
+    )
     return (
         jsonify(
             {
                 "success": True,
                 "message": "All participants fetched successfully",
-                "participants": [participant.to_dict() for participant in participants],
+                "participants": serialize_many(Participant, participants, fields),
             }
         ),
         200,
@@ -155,49 +182,56 @@ def get_participant_by_id(current_gym):
 
 @contest_bp.route("/get_leaderboard", methods=["GET"])
 @owner_required
+@coalesce_requests(resource=("contests", "participants", "members"))
 @handle_database_errors
 def get_leaderboard(current_gym):
+    """
+    Participants ordered by score (live ranks). Optional limit and offset
+    return one page of the leaderboard.
+    """
     from models.members import Member
 
     contest_id = request.args.get("contest_id")
+    limit = request.args.get("limit", type=int)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    if limit is not None and limit <= 0:
+        return jsonify({"error": "limit must be a positive integer"}), 400
 
     # If contest_id not provided, get the first active contest
     if not contest_id:
         contest = Contest.query.filter_by(gym_id=current_gym.id).first()
         if not contest:
             return jsonify({"success": False, "message": "No contests found"}), 404
-        contest_id = contest.id
     else:
         contest = Contest.query.filter_by(id=contest_id, gym_id=current_gym.id).first()
         if not contest:
             return jsonify({"success": False, "message": "Contest not found"}), 404
 
-    # Get participants sorted by contest_rank
-    participants = (
-        Participant.query.filter_by(gym_id=current_gym.id, contest_id=contest_id)
-        .order_by(Participant.contest_rank.asc())
-        .all()
-    )
-
-    # Build leaderboard with member names
-    leaderboard = []
-    for participant in participants:
-        member = Member.query.get(participant.member_id)
-        member_name = member.name if member else f"Member #{participant.member_id}"
+    board = get_contest_leaderboard(contest)
+    entries = board.top(limit, offset)
 
-        # Calculate score (using 1000 - rank*10 as a simple scoring system)
-        # You can modify this based on your actual scoring logic
-        score = 1000 - (participant.contest_rank - 1) * 10
+    # Participant rows and member names of this page in one query
+    rows = db.session.execute(
+        select(Participant, Member.name)
+        .outerjoin(Member, Member.id == Participant.member_id)
+        .where(Participant.id.in_([entry[1] for entry in entries]))
+    ).all()
+    participants = {participant.id: (participant, name) for participant, name in rows}
 
+    leaderboard = []
+    for rank, participant_id, member_id, score in entries:
+        if participant_id not in participants:
+            continue
+        participant, member_name = participants[participant_id]
         leaderboard.append(
             {
                 "id": participant.id,
-                "member_id": participant.member_id,
+                "member_id": member_id,
                 "contest_id": participant.contest_id,
-                "contest_rank": participant.contest_rank,
+                "contest_rank": rank,
                 "participant_status": participant.participant_status,
-                "member_name": member_name,
-                "score": max(score, 0),  # Ensure score is not negative
+                "member_name": member_name or f"Member #{member_id}",
+                "score": score,
             }
         )
 
@@ -208,6 +242,44 @@ def get_leaderboard(current_gym):
                 "message": "Leaderboard fetched successfully",
                 "contest": contest.to_dict(),
                 "leaderboard": leaderboard,
+                "total_participants": len(board),
+            }
+        ),
+        200,
+    )
+
+
+@contest_bp.route("/record_scores", methods=["POST"])
+@owner_required
+@validate_json_request
+@handle_database_errors
+def record_scores(current_gym):
+    """
+    Set or add to participants' scores:
+    {"contest_id": 1, "scores": [{"member_id": 2, "score": 120},
+                                 {"member_id": 3, "delta": 15}]}
+    """
+    data = request.get_json()
+    contest_id = data.get("contest_id")
+    scores = data.get("scores")
+
+    if not contest_id:
+        return jsonify({"error": "Contest ID is required"}), 400
+    scores = validate_scores(scores)
+
+    contest = Contest.query.filter_by(id=contest_id, gym_id=current_gym.id).first()
+    if not contest:
+        return jsonify({"success": False, "message": "Contest not found"}), 404
+
+    not_registered = record_contest_scores(contest.id, scores)
+    bump_resource_version(current_gym.id, "participants")
+    db.session.commit()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Scores recorded successfully",
+                "not_registered": not_registered,
             }
         ),
         200,
@@ -1,6 +1,6 @@
 from flask import Blueprint, jsonify
-from models.gym import Gym
-from database import db
+from services.gym_directory_service import gym_directory_response
+from utils.validation import ValidationError
 
 gyms_bp = Blueprint("gyms", __name__, url_prefix="/api/gyms")
 
@@ -9,17 +9,8 @@ gyms_bp = Blueprint("gyms", __name__, url_prefix="/api/gyms")
 def get_gyms():
     """Get list of all gyms for dropdown selection (public endpoint)"""
     try:
-        gyms = Gym.query.all()
-        gyms_list = [
-            {
-                "id": gym.id,
-                "name": gym.name,
-                "email": gym.email,
-                "city": gym.city,
-                "state": gym.state,
-            }
-            for gym in gyms
-        ]
-        return jsonify({"success": True, "gyms": gyms_list}), 200
+        return gym_directory_response()
+    except ValidationError:
+        raise
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1,18 +1,35 @@
 from flask import Blueprint, request, jsonify
 from database import db
 from models.members import Member
-from models.trainers import Trainer
-from models.contest import Contest
 from models.subscription import Subscription
-from models.participants import Participant
 from utils.auth_utils import owner_required, member_required
 from utils.validation import (
-    validate_member_data,
-    validate_member_update_data,
+    ValidationError,
     validate_json_request,
+    validate_search_query,
+)
+from utils.schema import (
+    validate_payload,
+    request_payload,
+    MEMBER_SCHEMA,
+    MEMBER_UPDATE_SCHEMA,
 )
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version, conditional_get
+from utils.serializers import serialize_many, parse_fields, projection
 from utils.cloudinary_utils import upload_member_photo, validate_image_file
+from services.member_import_service import import_members_from_file
+from services.member_dashboard_service import get_dashboard_snapshot
+from services.subscription_state_service import (
+    extend_current_subscription,
+    extend_current_subscriptions,
+)
+from services.member_home_service import build_member_home, parse_sections
+from services.search_service import search
+from utils.export_utils import stream_export, get_export_format
+from utils.sql_utils import start_of_day, add_months
+from utils.single_flight import coalesce_requests
+from sqlalchemy import case, exists, func, or_, select, update
 from datetime import datetime, timedelta
 
 members_bp = Blueprint("members", __name__, url_prefix="/api/members")
@@ -26,63 +43,14 @@ def add_member(current_gym):
 
     logger = logging.getLogger(__name__)
 
-    # Handle both JSON (for backward compatibility) and form-data (for file uploads)
-    if request.is_json:
-        data = request.get_json()
-        photo_file = None
-    else:
-        # Handle multipart/form-data
-        # Get all form fields and strip whitespace
-        name = request.form.get("name", "").strip()
-        email = request.form.get("email", "").strip()
-        phone = request.form.get("phone", "").strip()
-        address = request.form.get("address", "").strip()
-        city = request.form.get("city", "").strip()
-        state = request.form.get("state", "").strip()
-        zip_code = request.form.get("zip", "").strip()
-        expiration_date = request.form.get("expiration_date", "").strip() or None
-
-        data = {
-            "name": name,
-            "email": email,
-            "phone": phone,
-            "address": address,
-            "city": city,
-            "state": state,
-            "zip": zip_code,
-            "expiration_date": expiration_date,
-        }
-        photo_file = request.files.get("photo")
-
-        # Log received data for debugging (without sensitive info)
-        logger.info(
-            f"Received FormData - name: {name[:20] if name else 'empty'}, email: {email[:20] if email else 'empty'}, phone: {phone[:10] if phone else 'empty'}"
-        )
-        logger.info(
-            f"Address: {address[:30] if address else 'empty'}, City: {city[:20] if city else 'empty'}, State: {state[:20] if state else 'empty'}, ZIP: {zip_code[:10] if zip_code else 'empty'}"
-        )
-        logger.info(f"Photo file: {photo_file.filename if photo_file else 'None'}")
-
-        # Check for empty required fields before validation
-        empty_fields = [
-            k for k, v in data.items() if k != "expiration_date" and (not v or v == "")
-        ]
-        if empty_fields:
-            logger.warning(f"Empty required fields detected: {empty_fields}")
-            return (
-                jsonify(
-                    {"error": f"Missing required fields: {', '.join(empty_fields)}"}
-                ),
-                400,
-            )
-
-    # Validate member data
+    # JSON (for backward compatibility) and form-data (for file uploads) are
+    # validated the same way
+    photo_file = None if request.is_json else request.files.get("photo")
     try:
-        validate_member_data(data)
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        logger.error(f"Data received: {data}")
-        return jsonify({"error": str(e)}), 400
+        data = MEMBER_SCHEMA.validate(request_payload())
+    except ValidationError as e:
+        logger.warning(f"Validation error: {e.message}")
+        return jsonify({"error": e.message, "errors": e.errors}), 400
 
     # Check if email already exists for this gym
     existing_member = Member.query.filter_by(
@@ -118,25 +86,16 @@ def add_member(current_gym):
         city=data["city"],
         state=data["state"],
         zip=data["zip"],
+        expiration_date=data.get("expiration_date"),
         gym_id=current_gym.id,
     )
 
-    # Add expiration_date if provided
-    if "expiration_date" in data and data["expiration_date"]:
-        try:
-            from datetime import datetime
-
-            member.expiration_date = datetime.fromisoformat(
-                data["expiration_date"].replace("Z", "+00:00")
-            )
-        except:
-            pass
-
     # Add dp_link if we have one
     if dp_link:
         member.dp_link = dp_link
 
     db.session.add(member)
+    bump_resource_version(current_gym.id, "members")
     db.session.commit()
 
     # If we uploaded a photo, update it with the member_id for better organization
@@ -157,34 +116,96 @@ def add_member(current_gym):
     )
 
 
+@members_bp.route("/import_members", methods=["POST"])
+@owner_required
+@handle_database_errors
+def import_members(current_gym):
+    """
+    Bulk import members from an uploaded CSV or XLSX file (form field "file").
+    The header row must contain: name, email, phone, address, city, state, zip
+    and optionally expiration_date. Invalid rows are skipped and reported.
+    An unreadable file is a 400, unless part of it was already imported.
+    """
+    upload = request.files.get("file")
+    if not upload or not upload.filename:
+        return jsonify({"error": "A CSV or XLSX file is required"}), 400
+
+    report = import_members_from_file(upload, current_gym.id)
+
+    message = f"Imported {report['imported']} of {report['total_rows']} members"
+    if report["file_error"]:
+        message += f". The rest of the file could not be read: {report['file_error']}"
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": message,
+                **report,
+            }
+        ),
+        200,
+    )
+
+
 @members_bp.route("/get_members", methods=["GET"])
 @owner_required
+@conditional_get("members", gym_id_arg="gym_id")
+@coalesce_requests(resource="members", gym_id_arg="gym_id")
 @handle_database_errors
 def get_member(current_gym):
     gym_id = request.args.get("gym_id", current_gym.id)
-    members = Member.query.filter_by(gym_id=gym_id).all()
+    fields = parse_fields(Member, request.args.get("fields"))
+    members = (
+        Member.query.options(projection(Member, fields)).filter_by(gym_id=gym_id).all()
+    )
     return (
         jsonify(
             {
                 "success": True,
                 "message": "Members fetched successfully",
-                "members": [member.to_dict() for member in members],
+                "members": serialize_many(Member, members, fields),
             }
         ),
         200,
     )
 
 
-@members_bp.route("/update_member", methods=["PUT"])
+@members_bp.route("/export_members", methods=["GET"])
 @owner_required
-@validate_json_request
 @handle_database_errors
-def update_member(current_gym):
-    data = request.get_json()
+def export_members(current_gym):
+    """Stream all members of the gym as CSV (default) or NDJSON (?format=ndjson)"""
+    export_format = get_export_format(request.args.get("format"))
+    if not export_format:
+        return jsonify({"error": "Format must be one of: csv, ndjson"}), 400
+
+    statement = (
+        db.select(
+            Member.id.label("id"),
+            Member.name,
+            Member.email,
+            Member.phone,
+            Member.address,
+            Member.city,
+            Member.state,
+            Member.zip,
+            Member.is_active,
+            Member.expiration_date,
+            Member.created_at,
+        )
+        .where(Member.gym_id == current_gym.id)
+        .order_by(Member.id)
+    )
+    return stream_export(statement, export_format, "members")
 
-    # Validate member update data (only validates fields that are provided)
-    validate_member_update_data(data)
 
+@members_bp.route("/update_member", methods=["PUT"])
+@owner_required
+@validate_json_request
+@validate_payload(MEMBER_UPDATE_SCHEMA)
+@handle_database_errors
+def update_member(current_gym, data):
     member_id = data.get("member_id")
     print(member_id)
     if not member_id:
@@ -216,7 +237,8 @@ def update_member(current_gym):
         if "dp_link" in data:
             member.dp_link = data["dp_link"]  # dp_link can be None/empty
         if "expiration_date" in data and data["expiration_date"]:
-            member.expiration_date = data["expiration_date"]
+            extend_current_subscription(member, data["expiration_date"])
+            bump_resource_version(current_gym.id, "subscriptions")
         if "state" in data and data["state"]:
             member.state = data["state"]
         if "zip" in data and data["zip"]:
@@ -230,6 +252,7 @@ def update_member(current_gym):
             if existing_member:
                 return jsonify({"error": "Member with this email already exists"}), 409
 
+        bump_resource_version(current_gym.id, "members")
         db.session.commit()
 
     return jsonify({"success": True, "message": "Member updated successfully"}), 200
@@ -308,8 +331,10 @@ def extend_subscription(current_gym):
         member.expiration_date.isoformat() if member.expiration_date else None
     )
 
-    # Update member's expiration_date
-    member.expiration_date = new_expiration_date
+    # Update member's expiration_date and their current subscription's end date
+    extend_current_subscription(member, new_expiration_date)
+    bump_resource_version(current_gym.id, "members")
+    bump_resource_version(current_gym.id, "subscriptions")
     db.session.commit()
 
     return (
@@ -325,6 +350,120 @@ def extend_subscription(current_gym):
     )
 
 
+@members_bp.route("/bulk_extend_subscription", methods=["POST"])
+@owner_required
+@validate_json_request
+@handle_database_errors
+def bulk_extend_subscription(current_gym):
+    """
+    Extend many members' expiration dates by a number of months with one UPDATE.
+    Select members either by id or by filter:
+    - {"months": 1, "member_ids": [1, 2, 3]}
+    - {"months": 1, "filter": {"status": "expired" | "active" | "all", "plan": "Gold"}}
+    Same rules as extend_subscription: expired members are extended from today,
+    active members from their current expiration_date.
+    """
+    data = request.get_json()
+    months = data.get("months")
+    member_ids = data.get("member_ids")
+    member_filter = data.get("filter")
+
+    # Whole months only: int(0.5) would be 0 and true would count as 1
+    if not isinstance(months, int) or isinstance(months, bool) or months < 1:
+        return (
+            jsonify({"error": "months must be a whole number of at least 1"}),
+            400,
+        )
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    current_expiration = start_of_day(Member.expiration_date)
+    is_expired = or_(Member.expiration_date.is_(None), current_expiration < today)
+
+    conditions = [Member.gym_id == current_gym.id]
+    if member_ids is not None:
+        if not isinstance(member_ids, list) or not member_ids:
+            return jsonify({"error": "member_ids must be a non-empty list"}), 400
+        if any(
+            not isinstance(member_id, int) or isinstance(member_id, bool)
+            for member_id in member_ids
+        ):
+            return jsonify({"error": "member_ids must contain integer ids"}), 400
+        conditions.append(Member.id.in_(member_ids))
+    elif isinstance(member_filter, dict):
+        status = member_filter.get("status", "all")
+        if status not in ("expired", "active", "all"):
+            return (
+                jsonify(
+                    {"error": "Filter status must be one of: expired, active, all"}
+                ),
+                400,
+            )
+        # Filters only match member accounts that haven't been deactivated
+        conditions.append(Member.is_active == True)
+        if status == "expired":
+            # Members without an expiration date count as expired
+            conditions.append(is_expired)
+        elif status == "active":
+            conditions.append(current_expiration >= today)
+
+        plan = member_filter.get("plan")
+        if plan:
+            conditions.append(
+                exists().where(
+                    Subscription.member_id == Member.id,
+                    Subscription.gym_id == current_gym.id,
+                    Subscription.subscription_plan == plan,
+                )
+            )
+    else:
+        return jsonify({"error": "Either member_ids or filter is required"}), 400
+
+    matched, previously_expired = db.session.execute(
+        select(
+            func.count(Member.id),
+            func.coalesce(func.sum(case((is_expired, 1), else_=0)), 0),
+        ).where(*conditions)
+    ).one()
+
+    # Fixed before the UPDATE: the status filters match other members afterwards
+    extended_ids = (
+        db.session.execute(select(Member.id).where(*conditions)).scalars().all()
+    )
+
+    base_date = case((is_expired, today), else_=current_expiration)
+    result = db.session.execute(
+        update(Member)
+        .where(Member.id.in_(extended_ids))
+        .values(expiration_date=add_months(base_date, months))
+        .execution_options(synchronize_session=False)
+    )
+    extend_current_subscriptions(current_gym.id, extended_ids)
+    bump_resource_version(current_gym.id, "members")
+    bump_resource_version(current_gym.id, "subscriptions")
+    db.session.commit()
+
+    summary = {
+        "months": months,
+        "matched": matched,
+        "extended": result.rowcount,
+        "previously_expired": previously_expired,
+        "previously_active": matched - previously_expired,
+    }
+    if member_ids is not None:
+        summary["not_found"] = len(set(member_ids)) - matched
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": f"Extended {result.rowcount} member(s) by {months} month(s)",
+                "summary": summary,
+            }
+        ),
+        200,
+    )
+
+
 @members_bp.route("/delete_member", methods=["DELETE"])
 @owner_required
 def delete_member(current_gym):
@@ -335,6 +474,7 @@ def delete_member(current_gym):
         return jsonify({"success": False, "message": "Member not found"}), 404
 
     db.session.delete(member)
+    bump_resource_version(current_gym.id, "members")
     db.session.commit()
     return jsonify({"success": True, "message": "Member deleted successfully"}), 200
 
@@ -377,142 +517,90 @@ def get_member_by_email(current_gym):
     )
 
 
+@members_bp.route("/search_members", methods=["GET"])
+@owner_required
+@handle_database_errors
+def search_members(current_gym):
+    """
+    Members whose name, email, phone or city match ?q=, best match
+    first. Paginated with limit (default 20) and offset.
+    """
+    query = validate_search_query(request.args.get("q"))
+    fields = parse_fields(Member, request.args.get("fields"))
+    limit = request.args.get("limit", type=int, default=20)
+    offset = request.args.get("offset", type=int, default=0)
+    members, has_more = search(
+        Member, current_gym.id, query, limit=limit, offset=offset, fields=fields
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Members fetched successfully",
+                "members": serialize_many(Member, members, fields),
+                "has_more": has_more,
+            }
+        ),
+        200,
+    )
+
+
 # ========== MEMBER-FACING ENDPOINTS ==========
 
 
-@members_bp.route("/get_member_dashboard", methods=["GET"])
-@member_required
-@handle_database_errors
-def get_member_dashboard(member_id, gym_id, member):
-    """Get member dashboard data including stats and subscription info"""
-    try:
-        # Get active subscription
-        subscription = (
-            Subscription.query.filter_by(member_id=member_id, gym_id=gym_id)
-            .order_by(Subscription.created_at.desc())
-            .first()
-        )
+def _member_home(member_id, gym_id, sections):
+    """Check the member via the dashboard snapshot, then build the sections"""
+    snapshot = get_dashboard_snapshot(member_id, gym_id)
+    if snapshot is None:
+        return None, (jsonify({"message": "Member not found"}), 404)
+    if not snapshot["is_active"]:
+        return None, (jsonify({"message": "Member account is inactive"}), 403)
+    return build_member_home(member_id, gym_id, snapshot, sections), None
 
-        # Calculate days remaining
-        days_remaining = 0
-        if subscription and subscription.end_date:
-            days_remaining = max(0, (subscription.end_date - datetime.utcnow()).days)
 
-        # Calculate active days (days since joining)
-        active_days = 0
-        if member.created_at:
-            active_days = (datetime.utcnow() - member.created_at).days
+def _member_section(section, member_id, gym_id):
+    try:
+        home, error_response = _member_home(member_id, gym_id, [section])
+        if error_response:
+            return error_response
+        return jsonify(home[section]), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 500
 
-        # Calculate workouts this week (placeholder - would need workout tracking model)
-        workouts_this_week = {"completed": 0, "total": 0}
 
-        # Get contests joined
-        contests_joined = Participant.query.filter_by(
-            member_id=member_id, gym_id=gym_id
-        ).count()
+@members_bp.route("/home", methods=["GET"])
+@member_required(load_member=False)
+@handle_database_errors
+def get_member_home(member_id, gym_id):
+    """
+    Everything the member app loads on open, in one request.
 
-        # Build member data
-        member_data = member.to_dict()
-        member_data.update(
-            {
-                "phone": member.phone,
-                "address": member.address,
-                "city": member.city,
-                "state": member.state,
-                "zipCode": member.zip,
-                "dateOfBirth": member.dob.isoformat() if member.dob else None,
-                "gender": member.gender,
-                "fitnessGoals": None,  # Would need additional field
-                "profilePhoto": member.dp_link,
-                "subscription": {
-                    "status": subscription.subscription_status
-                    if subscription
-                    else "Expired",
-                    "daysRemaining": days_remaining,
-                    "plan": subscription.subscription_plan if subscription else "None",
-                    "startDate": subscription.start_date.isoformat()
-                    if subscription and subscription.start_date
-                    else None,
-                    "endDate": subscription.end_date.isoformat()
-                    if subscription and subscription.end_date
-                    else None,
-                },
-                "stats": {
-                    "weight": member.weight or 0,
-                    "height": member.height or 0,
-                    "bmi": (member.weight / ((member.height / 100) ** 2))
-                    if member.weight and member.height
-                    else 0,
-                    "joinDate": member.created_at.isoformat()
-                    if member.created_at
-                    else None,
-                },
-            }
-        )
+    Query parameters:
+        sections: comma-separated subset of dashboard, profile, workout_plan,
+            diet_plan, trainer, contests, todays_schedule, weekly_progress
+            (default: all). Each section is the body of its own endpoint.
+    """
+    sections = parse_sections(request.args.get("sections"))
+    home, error_response = _member_home(member_id, gym_id, sections)
+    if error_response:
+        return error_response
+    return jsonify({"success": True, "sections": home}), 200
 
-        stats_data = {
-            "activeDays": active_days,
-            "daysRemaining": days_remaining,
-            "workoutsThisWeek": workouts_this_week,
-            "contestsJoined": contests_joined,
-        }
 
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "member": member_data,
-                    "stats": stats_data,
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+@members_bp.route("/get_member_dashboard", methods=["GET"])
+@member_required(load_member=False)
+@handle_database_errors
+def get_member_dashboard(member_id, gym_id):
+    """Get member dashboard data including stats and subscription info"""
+    return _member_section("dashboard", member_id, gym_id)
 
 
 @members_bp.route("/get_member_profile", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_member_profile(member_id, gym_id, member):
+def get_member_profile(member_id, gym_id):
     """Get member profile data"""
-    try:
-        member_data = member.to_dict()
-        member_data.update(
-            {
-                "phone": member.phone,
-                "address": member.address,
-                "city": member.city,
-                "state": member.state,
-                "zipCode": member.zip,
-                "dateOfBirth": member.dob.isoformat() if member.dob else None,
-                "gender": member.gender,
-                "fitnessGoals": None,
-                "profilePhoto": member.dp_link,
-                "stats": {
-                    "weight": member.weight or 0,
-                    "height": member.height or 0,
-                    "bmi": (member.weight / ((member.height / 100) ** 2))
-                    if member.weight and member.height
-                    else 0,
-                    "joinDate": member.created_at.isoformat()
-                    if member.created_at
-                    else None,
-                },
-            }
-        )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "member": member_data,
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+    return _member_section("profile", member_id, gym_id)
 
 
 @members_bp.route("/update_profile", methods=["PUT"])
@@ -555,6 +643,7 @@ def update_member_profile(member_id, gym_id, member):
         if "dp_link" in data:
             member.dp_link = data["dp_link"] if data["dp_link"] else None
 
+        bump_resource_version(gym_id, "members")
         db.session.commit()
 
         return (
@@ -573,161 +662,35 @@ def update_member_profile(member_id, gym_id, member):
 
 
 @members_bp.route("/get_workout_plan", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_workout_plan(member_id, gym_id, member):
+def get_workout_plan(member_id, gym_id):
     """Get member workout plan (placeholder - would need workout plan model)"""
-    # Return placeholder data structure
-    return (
-        jsonify(
-            {
-                "success": True,
-                "workoutPlan": {
-                    "name": "No Workout Plan",
-                    "duration": "N/A",
-                    "progress": 0,
-                    "daysPerWeek": 0,
-                    "weeklySchedule": [],
-                    "exercises": {},
-                },
-            }
-        ),
-        200,
-    )
+    return _member_section("workout_plan", member_id, gym_id)
 
 
 @members_bp.route("/get_diet_plan", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_diet_plan(member_id, gym_id, member):
+def get_diet_plan(member_id, gym_id):
     """Get member diet plan (placeholder - would need diet plan model)"""
-    # Return placeholder data structure
-    return (
-        jsonify(
-            {
-                "success": True,
-                "dietPlan": {
-                    "name": "No Diet Plan",
-                    "duration": "N/A",
-                    "calories": 0,
-                    "protein": 0,
-                    "carbs": 0,
-                    "fats": 0,
-                    "meals": [],
-                },
-            }
-        ),
-        200,
-    )
+    return _member_section("diet_plan", member_id, gym_id)
 
 
 @members_bp.route("/get_my_trainer", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_my_trainer(member_id, gym_id, member):
+def get_my_trainer(member_id, gym_id):
     """Get member's assigned trainer"""
-    try:
-        # Get first trainer from the gym (placeholder - would need trainer assignment model)
-        trainer = Trainer.query.filter_by(gym_id=gym_id, is_active=True).first()
-
-        if not trainer:
-            return (
-                jsonify(
-                    {
-                        "success": True,
-                        "trainer": None,
-                        "message": "No trainer assigned",
-                    }
-                ),
-                200,
-            )
-
-        trainer_data = trainer.to_dict()
-        trainer_data.update(
-            {
-                "specialization": trainer.specialization,
-                "experience": trainer.experience,
-                "bio": trainer.bio,
-                "photo": trainer.dp_link,
-            }
-        )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "trainer": trainer_data,
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+    return _member_section("trainer", member_id, gym_id)
 
 
 @members_bp.route("/get_contests", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_contests(member_id, gym_id, member):
+def get_contests(member_id, gym_id):
     """Get contests available to member"""
-    try:
-        # Get all contests for the gym
-        contests = Contest.query.filter_by(gym_id=gym_id).all()
-
-        # Get contests the member has joined
-        joined_contest_ids = [
-            p.contest_id
-            for p in Participant.query.filter_by(
-                member_id=member_id, gym_id=gym_id
-            ).all()
-        ]
-
-        contests_data = []
-        for contest in contests:
-            contest_dict = contest.to_dict()
-            # Determine status
-            now = datetime.utcnow()
-            if contest.start_date > now:
-                status = "upcoming"
-            elif contest.end_date < now:
-                status = "completed"
-            else:
-                status = "ongoing"
-
-            # Get participant count
-            participants_count = Participant.query.filter_by(
-                contest_id=contest.id
-            ).count()
-
-            contests_data.append(
-                {
-                    "id": str(contest.id),
-                    "name": contest.name,
-                    "description": contest.description,
-                    "startDate": contest.start_date.isoformat()
-                    if contest.start_date
-                    else None,
-                    "endDate": contest.end_date.isoformat()
-                    if contest.end_date
-                    else None,
-                    "status": status,
-                    "participants": participants_count,
-                    "prize": "Trophy",  # Placeholder
-                    "joined": contest.id in joined_contest_ids,
-                }
-            )
-
-        return (
-            jsonify(
-                {
-                    "success": True,
-                    "contests": contests_data,
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"success": False, "message": str(e)}), 500
+    return _member_section("contests", member_id, gym_id)
 
 
 @members_bp.route("/get_progress", methods=["GET"])
@@ -859,48 +822,16 @@ def request_session(member_id, gym_id, member):
 
 
 @members_bp.route("/get_todays_schedule", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_todays_schedule(member_id, gym_id, member):
+def get_todays_schedule(member_id, gym_id):
     """Get today's schedule for member (placeholder - would need schedule model)"""
-    # Return placeholder data structure
-    return (
-        jsonify(
-            {
-                "success": True,
-                "schedule": [],
-            }
-        ),
-        200,
-    )
+    return _member_section("todays_schedule", member_id, gym_id)
 
 
 @members_bp.route("/get_weekly_progress", methods=["GET"])
-@member_required
+@member_required(load_member=False)
 @handle_database_errors
-def get_weekly_progress(member_id, gym_id, member):
+def get_weekly_progress(member_id, gym_id):
     """Get weekly progress data (placeholder - would need progress tracking model)"""
-    # Return placeholder data structure with default values
-    today = datetime.utcnow()
-    week_start = today - timedelta(days=today.weekday())
-
-    weekly_progress = []
-    for i in range(7):
-        day = week_start + timedelta(days=i)
-        day_name = day.strftime("%a")
-        weekly_progress.append(
-            {
-                "day": day_name,
-                "value": 0,  # Would calculate from progress tracking model
-            }
-        )
-
-    return (
-        jsonify(
-            {
-                "success": True,
-                "weeklyProgress": weekly_progress,
-            }
-        ),
-        200,
-    )
+    return _member_section("weekly_progress", member_id, gym_id)
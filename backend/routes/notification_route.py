@@ -1,15 +1,37 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from database import db
 from models.notification import Notification
+from models.members import Member
+from models.notification_retention_policy import NotificationRetentionPolicy
 from models.push_subscription import PushSubscription
-from utils.auth_utils import owner_required
+from utils.auth_utils import (
+    owner_required,
+    stream_token_required,
+    create_stream_token,
+    STREAM_TOKEN_MAX_AGE,
+)
 from utils.middleware import handle_database_errors
+from utils.serializers import serialize_many, projection
+from services.notification_events import (
+    open_notification_stream,
+    publish_unread_count,
+)
+from services.notification_counter_service import (
+    adjust_unread_count,
+    get_unread_count as get_gym_unread_count,
+)
+from services.notification_retention_service import get_retention_policy
+from utils.pagination import encode_cursor, after_cursor
+from utils.validation import ValidationError, validate_json_request
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+MAX_NOTIFICATIONS_PAGE_SIZE = 100
+
 notification_bp = Blueprint("notifications", __name__, url_prefix="/api/notifications")
 
 
@@ -17,51 +39,129 @@ notification_bp = Blueprint("notifications", __name__, url_prefix="/api/notifica
 @owner_required
 @handle_database_errors
 def get_notifications(current_gym):
-    """Get all notifications for the current gym"""
+    """Get notifications for the current gym, newest first, one page at a time"""
     try:
         # Get query parameters
         limit = request.args.get("limit", type=int, default=50)
+        limit = max(1, min(limit, MAX_NOTIFICATIONS_PAGE_SIZE))
+        cursor = request.args.get("cursor")
         # Handle unread_only parameter correctly (Flask's type=bool doesn't work as expected)
         unread_only_str = request.args.get("unread_only", "false").lower()
         unread_only = unread_only_str in ("true", "1", "yes")
 
-        # Build query
-        query = Notification.query.filter_by(gym_id=current_gym.id)
+        # Build query - member columns come from the same query (no lazy loads)
+        query = Notification.query.options(
+            projection(Notification),
+            joinedload(Notification.member).load_only(
+                Member.name, Member.phone, Member.dp_link
+            ),
+        ).filter_by(gym_id=current_gym.id)
 
         if unread_only:
             query = query.filter_by(is_read=False)
 
-        # Order by created_at descending (newest first)
+        if cursor:
+            query = after_cursor(
+                query, Notification.created_at, Notification.id, cursor
+            )
+
+        # Order by created_at descending (newest first), id breaks ties.
+        # One extra row tells us whether there is another page.
         notifications = (
-            query.order_by(Notification.created_at.desc()).limit(limit).all()
+            query.order_by(Notification.created_at.desc(), Notification.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit]
+        next_cursor = (
+            encode_cursor(notifications[-1].created_at, notifications[-1].id)
+            if has_more
+            else None
         )
 
         return (
             jsonify(
                 {
                     "success": True,
-                    "notifications": [
-                        notification.to_dict() for notification in notifications
-                    ],
+                    "notifications": serialize_many(Notification, notifications),
                     "count": len(notifications),
+                    "next_cursor": next_cursor,
+                    "has_more": has_more,
                 }
             ),
             200,
         )
+    except ValidationError:
+        raise
     except Exception as e:
         logger.error(f"Error fetching notifications: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def _stream_disabled():
+    """404 response when NOTIFICATION_STREAM_ENABLED is off, else None"""
+    if current_app.config.get("NOTIFICATION_STREAM_ENABLED"):
+        return None
+    return jsonify({"success": False, "error": "Notification stream is disabled"}), 404
+
+
+@notification_bp.route("/stream-token", methods=["POST"])
+@owner_required
+def get_stream_token(current_gym):
+    """Short-lived token for opening the notification stream"""
+    disabled = _stream_disabled()
+    if disabled:
+        return disabled
+    return (
+        jsonify(
+            {
+                "success": True,
+                "token": create_stream_token(current_gym.id),
+                "expires_in": STREAM_TOKEN_MAX_AGE,
+            }
+        ),
+        200,
+    )
+
+
+@notification_bp.route("/stream", methods=["GET"])
+@stream_token_required
+def stream_notifications(current_gym):
+    """
+    Server-Sent Events stream of new notifications and unread-count changes.
+
+    Authenticated with ?token= from /stream-token (EventSource can't send an
+    Authorization header). Reconnecting clients send Last-Event-ID (or
+    ?last_event_id=) and get the notifications they missed.
+
+    Each open stream occupies a worker thread or greenlet, so the stream is
+    off unless NOTIFICATION_STREAM_ENABLED is set, and then needs threaded
+    or gevent workers (see SETUP_GUIDE.md).
+    """
+    disabled = _stream_disabled()
+    if disabled:
+        return disabled
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get(
+        "last_event_id"
+    )
+    stream = open_notification_stream(
+        current_app._get_current_object(), current_gym.id, last_event_id
+    )
+    response = Response(stream, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Tell nginx-style proxies not to buffer the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @notification_bp.route("/unread-count", methods=["GET"])
 @owner_required
 @handle_database_errors
 def get_unread_count(current_gym):
     """Get count of unread notifications"""
     try:
-        count = Notification.query.filter_by(
-            gym_id=current_gym.id, is_read=False
-        ).count()
+        count = get_gym_unread_count(current_gym.id)
 
         return jsonify({"success": True, "count": count}), 200
     except Exception as e:
@@ -82,8 +182,15 @@ def mark_as_read(current_gym, notification_id):
         if not notification:
             return jsonify({"success": False, "error": "Notification not found"}), 404
 
-        notification.is_read = True
-        db.session.commit()
+        if not notification.is_read:
+            # Conditional update so concurrent requests only decrement once
+            marked = Notification.query.filter_by(
+                id=notification.id, is_read=False
+            ).update({"is_read": True})
+            if marked:
+                adjust_unread_count(current_gym.id, -marked)
+                publish_unread_count(current_gym.id)
+            db.session.commit()
 
         return jsonify({"success": True, "message": "Notification marked as read"}), 200
     except Exception as e:
@@ -102,6 +209,9 @@ def mark_all_as_read(current_gym):
             gym_id=current_gym.id, is_read=False
         ).update({"is_read": True})
 
+        if updated:
+            adjust_unread_count(current_gym.id, -updated)
+            publish_unread_count(current_gym.id)
         db.session.commit()
 
         return (
@@ -119,6 +229,78 @@ def mark_all_as_read(current_gym):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@notification_bp.route("/retention", methods=["GET"])
+@owner_required
+@handle_database_errors
+def get_notification_retention(current_gym):
+    """Get the gym's notification retention policy"""
+    archive_after_days, purge_after_days = get_retention_policy(current_gym.id)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "archive_after_days": archive_after_days,
+                "purge_after_days": purge_after_days,
+            }
+        ),
+        200,
+    )
+
+
+@notification_bp.route("/retention", methods=["PUT"])
+@owner_required
+@validate_json_request
+@handle_database_errors
+def update_notification_retention(current_gym):
+    """
+    Update the gym's notification retention policy.
+    Body: {archive_after_days, purge_after_days (null keeps archived rows)}
+    """
+    data = request.get_json()
+    archive_after_days = data.get("archive_after_days")
+    purge_after_days = data.get("purge_after_days")
+
+    if (
+        not isinstance(archive_after_days, int)
+        or isinstance(archive_after_days, bool)
+        or not 1 <= archive_after_days <= 3650
+    ):
+        raise ValidationError(
+            "archive_after_days must be a whole number between 1 and 3650",
+            "archive_after_days",
+        )
+    if purge_after_days is not None and (
+        not isinstance(purge_after_days, int)
+        or isinstance(purge_after_days, bool)
+        or not archive_after_days <= purge_after_days <= 3650
+    ):
+        raise ValidationError(
+            "purge_after_days must be null or a whole number between "
+            "archive_after_days and 3650",
+            "purge_after_days",
+        )
+
+    policy = db.session.get(NotificationRetentionPolicy, current_gym.id)
+    if not policy:
+        policy = NotificationRetentionPolicy(gym_id=current_gym.id)
+        db.session.add(policy)
+    policy.archive_after_days = archive_after_days
+    policy.purge_after_days = purge_after_days
+    policy.updated_at = datetime.utcnow()
+    db.session.commit()
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Retention policy updated successfully",
+                "policy": policy.to_dict(),
+            }
+        ),
+        200,
+    )
+
+
 @notification_bp.route("/subscribe", methods=["POST"])
 @owner_required
 @handle_database_errors
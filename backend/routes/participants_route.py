@@ -5,6 +5,10 @@ from models.contest import Contest
 from utils.auth_utils import owner_required, member_required
 from utils.validation import validate_json_request
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version
+from services.contest_rank_service import next_contest_rank
+from services.contest_leaderboard_service import get_leaderboard, mark_scores_changed
+from sqlalchemy.exc import IntegrityError
 
 participants_bp = Blueprint("participants", __name__, url_prefix="/api/participants")
 
@@ -20,6 +24,8 @@ def add_participant(current_gym, contest_id):
         member_id=member_id, contest_id=contest_id, gym_id=current_gym.id
     )
     db.session.add(participant)
+    participant.score_version = mark_scores_changed(contest_id)
+    bump_resource_version(current_gym.id, "participants")
     db.session.commit()
     return jsonify({"success": True, "message": "Participant added successfully"}), 201
 
@@ -34,7 +40,10 @@ def delete_participant(current_gym, contest_id, participant_id):
     ).first()
     if not participant:
         return jsonify({"success": False, "message": "Participant not found"}), 404
+    # Lock the contest row first, in the same order as record_scores
+    mark_scores_changed(contest_id)
     db.session.delete(participant)
+    bump_resource_version(current_gym.id, "participants")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Participant deleted successfully"}),
@@ -72,24 +81,29 @@ def register_for_contest(member_id, gym_id, member):
             400,
         )
 
-    # Get the next rank (highest rank + 1)
-    highest_rank = (
-        db.session.query(db.func.max(Participant.contest_rank))
-        .filter_by(contest_id=contest_id, gym_id=gym_id)
-        .scalar()
-        or 0
-    )
-
-    # Create new participant with initial rank
+    # Create new participant with the contest's next rank
     participant = Participant(
         member_id=member_id,
         contest_id=contest_id,
         gym_id=gym_id,
-        contest_rank=highest_rank + 1,
+        contest_rank=next_contest_rank(contest.id),
         participant_status="active",
     )
 
     db.session.add(participant)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # A concurrent request registered the member after our check
+        db.session.rollback()
+        return (
+            jsonify(
+                {"success": False, "message": "Already registered for this contest"}
+            ),
+            400,
+        )
+    participant.score_version = mark_scores_changed(contest.id)
+    bump_resource_version(gym_id, "participants")
     db.session.commit()
 
     return (
@@ -128,3 +142,40 @@ def check_registration(member_id, gym_id, member):
         ),
         200,
     )
+
+
+@participants_bp.route("/my_rank", methods=["GET"])
+@member_required
+@handle_database_errors
+def get_my_rank(member_id, gym_id, member):
+    """The member's live rank and score in a contest"""
+    contest_id = request.args.get("contest_id")
+
+    if not contest_id:
+        return jsonify({"success": False, "message": "Contest ID is required"}), 400
+
+    contest = Contest.query.filter_by(id=contest_id, gym_id=gym_id).first()
+    if not contest:
+        return jsonify({"success": False, "message": "Contest not found"}), 404
+
+    leaderboard = get_leaderboard(contest)
+    position = leaderboard.rank_of_member(member_id)
+    if position is None:
+        return (
+            jsonify({"success": False, "message": "Not registered for this contest"}),
+            404,
+        )
+
+    rank, score = position
+    return (
+        jsonify(
+            {
+                "success": True,
+                "contest_id": contest.id,
+                "rank": rank,
+                "score": score,
+                "participants": len(leaderboard),
+            }
+        ),
+        200,
+    )
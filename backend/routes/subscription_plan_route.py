@@ -3,8 +3,11 @@ from models.subscription_plan import SubscriptionPlan
 from database import db
 from flask import request, jsonify
 from utils.auth_utils import owner_required
-from utils.validation import validate_subscription_plan_data, validate_json_request
+from utils.validation import validate_json_request
+from utils.schema import validate_payload, SUBSCRIPTION_PLAN_SCHEMA
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version, conditional_get
+from utils.response_cache import cached_response
 
 
 subscription_plan_route = Blueprint(
@@ -15,13 +18,9 @@ subscription_plan_route = Blueprint(
 @subscription_plan_route.route("/add_subscription_plan", methods=["POST"])
 @owner_required
 @validate_json_request
+@validate_payload(SUBSCRIPTION_PLAN_SCHEMA)
 @handle_database_errors
-def add_subscription_plan(current_gym):
-    data = request.get_json()
-
-    # Validate subscription plan data
-    validate_subscription_plan_data(data)
-
+def add_subscription_plan(current_gym, data):
     # Check if plan name already exists for this gym
     existing_plan = SubscriptionPlan.query.filter_by(
         name=data["name"], gym_id=current_gym.id
@@ -40,6 +39,7 @@ def add_subscription_plan(current_gym):
         gym_id=current_gym.id,
     )
     db.session.add(subscription_plan)
+    bump_resource_version(current_gym.id, "subscription_plans")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Subscription plan added successfully"}),
@@ -49,6 +49,8 @@ def add_subscription_plan(current_gym):
 
 @subscription_plan_route.route("/get_subscription_plans", methods=["GET"])
 @owner_required
+@conditional_get("subscription_plans")
+@cached_response("subscription_plans")
 def get_subscription_plans(current_gym):
     subscription_plans = SubscriptionPlan.query.filter_by(gym_id=current_gym.id).all()
     return (
@@ -88,6 +90,7 @@ def update_subscription_plan(current_gym):
     subscription_plan.description = description
     subscription_plan.price = price
     subscription_plan.duration = duration
+    bump_resource_version(current_gym.id, "subscription_plans")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Subscription plan updated successfully"}),
@@ -110,6 +113,7 @@ def delete_subscription_plan(current_gym):
         )
 
     db.session.delete(subscription_plan)
+    bump_resource_version(current_gym.id, "subscription_plans")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Subscription plan deleted successfully"}),
@@ -1,24 +1,41 @@
 from flask import Blueprint, request, jsonify
 from database import db
 from models.subscription import Subscription
+from models.members import Member
 from utils.auth_utils import owner_required
-from utils.validation import validate_subscription_data, validate_json_request
+from utils.validation import validate_json_request
+from utils.schema import validate_payload, SUBSCRIPTION_SCHEMA
 from utils.middleware import handle_database_errors
+from utils.etag_utils import bump_resource_version, conditional_get
+from utils.serializers import serialize_many, parse_fields, projection
+from utils.export_utils import stream_export, get_export_format
+from services.subscription_state_service import refresh_current_subscription
 
 
 subscription_bp = Blueprint("subscription", __name__, url_prefix="/api/subscription")
 
 
+def _current_subscription(member_id, gym_id):
+    """The subscription the member's current_subscription_id points at"""
+    return (
+        Subscription.query.join(
+            Member, Member.current_subscription_id == Subscription.id
+        )
+        .filter(
+            Member.id == member_id,
+            Member.gym_id == gym_id,
+            Subscription.gym_id == gym_id,
+        )
+        .first()
+    )
+
+
 @subscription_bp.route("/add_subscription", methods=["POST"])
 @owner_required
 @validate_json_request
+@validate_payload(SUBSCRIPTION_SCHEMA)
 @handle_database_errors
-def add_subscription(current_gym):
-    data = request.get_json()
-
-    # Validate subscription data
-    validate_subscription_data(data)
-
+def add_subscription(current_gym, data):
     member_id = data["member_id"]
     gym_id = data.get("gym_id", current_gym.id)
     subscription_plan = data["subscription_plan"]
@@ -42,6 +59,9 @@ def add_subscription(current_gym):
         end_date=end_date,
     )
     db.session.add(subscription)
+    refresh_current_subscription(gym_id, [member_id])
+    bump_resource_version(gym_id, "subscriptions")
+    bump_resource_version(gym_id, "members")
     db.session.commit()
     return jsonify({"success": True, "message": "Subscription added successfully"}), 201
 
@@ -51,9 +71,7 @@ def add_subscription(current_gym):
 def get_subscription(current_gym):
     member_id = request.args.get("member_id")
     gym_id = request.args.get("gym_id", current_gym.id)
-    subscription = Subscription.query.filter_by(
-        member_id=member_id, gym_id=gym_id
-    ).first()
+    subscription = _current_subscription(member_id, gym_id)
     if not subscription:
         return jsonify({"success": False, "message": "Subscription not found"}), 404
     return (
@@ -78,9 +96,7 @@ def update_subscription(current_gym):
     subscription_status = data["subscription_status"]
     start_date = data["start_date"]
     end_date = data["end_date"]
-    subscription = Subscription.query.filter_by(
-        member_id=member_id, gym_id=gym_id
-    ).first()
+    subscription = _current_subscription(member_id, gym_id)
     if not subscription:
         return jsonify({"success": False, "message": "Subscription not found"}), 404
 
@@ -88,6 +104,9 @@ def update_subscription(current_gym):
     subscription.subscription_status = subscription_status
     subscription.start_date = start_date
     subscription.end_date = end_date
+    refresh_current_subscription(gym_id, [member_id])
+    bump_resource_version(gym_id, "subscriptions")
+    bump_resource_version(gym_id, "members")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Subscription updated successfully"}),
@@ -101,13 +120,15 @@ def delete_subscription(current_gym):
     data = request.get_json()
     member_id = data["member_id"]
     gym_id = data.get("gym_id", current_gym.id)
-    subscription = Subscription.query.filter_by(
-        member_id=member_id, gym_id=gym_id
-    ).first()
+    subscription = _current_subscription(member_id, gym_id)
     if not subscription:
         return jsonify({"success": False, "message": "Subscription not found"}), 404
 
     db.session.delete(subscription)
+    db.session.flush()
+    refresh_current_subscription(gym_id, [member_id])
+    bump_resource_version(gym_id, "subscriptions")
+    bump_resource_version(gym_id, "members")
     db.session.commit()
     return (
         jsonify({"success": True, "message": "Subscription deleted successfully"}),
@@ -117,17 +138,49 @@ def delete_subscription(current_gym):
 
 @subscription_bp.route("/get_all_subscriptions", methods=["GET"])
 @owner_required
+@conditional_get("subscriptions")
 def get_all_subscriptions(current_gym):
-    subscriptions = Subscription.query.filter_by(gym_id=current_gym.id).all()
+    fields = parse_fields(Subscription, request.args.get("fields"))
+    subscriptions = (
+        Subscription.query.options(projection(Subscription, fields))
+        .filter_by(gym_id=current_gym.id)
+        .all()
+    )
     return (
         jsonify(
             {
                 "success": True,
                 "message": "All subscriptions fetched successfully",
-                "subscriptions": [
-                    subscription.to_dict() for subscription in subscriptions
-                ],
+                "subscriptions": serialize_many(Subscription, subscriptions, fields),
             }
         ),
         200,
     )
+
+
+@subscription_bp.route("/export_subscriptions", methods=["GET"])
+@owner_required
+@handle_database_errors
+def export_subscriptions(current_gym):
+    """Stream all subscriptions of the gym as CSV (default) or NDJSON (?format=ndjson)"""
+    export_format = get_export_format(request.args.get("format"))
+    if not export_format:
+        return jsonify({"error": "Format must be one of: csv, ndjson"}), 400
+
+    statement = (
+        db.select(
+            Subscription.id.label("id"),
+            Subscription.member_id,
+            Member.name.label("member_name"),
+            Member.email.label("member_email"),
+            Subscription.subscription_plan,
+            Subscription.subscription_status,
+            Subscription.start_date,
+            Subscription.end_date,
+            Subscription.created_at,
+        )
+        .join(Member, Member.id == Subscription.member_id)
+        .where(Subscription.gym_id == current_gym.id)
+        .order_by(Subscription.id)
+    )
+    return stream_export(statement, export_format, "subscriptions")
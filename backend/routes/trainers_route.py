@@ -2,6 +2,12 @@ from flask import Blueprint, request, jsonify
 from database import db
 from models.trainers import Trainer
 from utils.auth_utils import owner_required
+from utils.etag_utils import bump_resource_version, conditional_get
+from utils.response_cache import cached_response
+from utils.serializers import serialize_many, parse_fields, projection
+from utils.middleware import handle_database_errors
+from utils.validation import validate_search_query
+from services.search_service import search
 
 trainers_bp = Blueprint("trainers", __name__, url_prefix="/api/trainers")
 
@@ -28,6 +34,7 @@ def add_trainer(current_gym):
         gym_id=current_gym.id,
     )
     db.session.add(trainer)
+    bump_resource_version(current_gym.id, "trainers")
     db.session.commit()
     return jsonify({"success": True, "message": "Trainer added successfully"}), 201
 
@@ -92,6 +99,7 @@ def update_trainer(current_gym):
     if "zip" in data and data["zip"]:
         trainer.zip = data["zip"]
 
+    bump_resource_version(current_gym.id, "trainers")
     db.session.commit()
     return jsonify({"success": True, "message": "Trainer updated successfully"}), 200
 
@@ -105,12 +113,14 @@ def delete_trainer(current_gym):
     if not trainer:
         return jsonify({"success": False, "message": "Trainer not found"}), 404
     db.session.delete(trainer)
+    bump_resource_version(current_gym.id, "trainers")
     db.session.commit()
     return jsonify({"success": True, "message": "Trainer deleted successfully"}), 200
 
 
 @trainers_bp.route("/get_trainer_by_id", methods=["GET"])
 @owner_required
+@cached_response("trainers")
 def get_trainer_by_id(current_gym):
     id = request.args.get("id")
     if not id:
@@ -132,14 +142,49 @@ def get_trainer_by_id(current_gym):
 
 @trainers_bp.route("/get_all_trainers", methods=["GET"])
 @owner_required
+@conditional_get("trainers")
+@cached_response("trainers")
 def get_all_trainers(current_gym):
-    trainers = Trainer.query.filter_by(gym_id=current_gym.id).all()
+    fields = parse_fields(Trainer, request.args.get("fields"))
+    trainers = (
+        Trainer.query.options(projection(Trainer, fields))
+        .filter_by(gym_id=current_gym.id)
+        .all()
+    )
     return (
         jsonify(
             {
                 "success": True,
                 "message": "All trainers fetched successfully",
-                "trainers": [trainer.to_dict() for trainer in trainers],
+                "trainers": serialize_many(Trainer, trainers, fields),
+            }
+        ),
+        200,
+    )
+
+
+@trainers_bp.route("/search_trainers", methods=["GET"])
+@owner_required
+@handle_database_errors
+def search_trainers(current_gym):
+    """
+    Trainers whose name, specialization or skills match ?q=, best match
+    first. Paginated with limit (default 20) and offset.
+    """
+    query = validate_search_query(request.args.get("q"))
+    fields = parse_fields(Trainer, request.args.get("fields"))
+    limit = request.args.get("limit", type=int, default=20)
+    offset = request.args.get("offset", type=int, default=0)
+    trainers, has_more = search(
+        Trainer, current_gym.id, query, limit=limit, offset=offset, fields=fields
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "message": "Trainers fetched successfully",
+                "trainers": serialize_many(Trainer, trainers, fields),
+                "has_more": has_more,
             }
         ),
         200,
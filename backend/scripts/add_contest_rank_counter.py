@@ -0,0 +1,60 @@
+# Script to add the contest_rank_counter table and the unique
+# (contest_id, member_id) constraint on participant
+# Run this script once to update your database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA_SQL = [
+    "CREATE TABLE IF NOT EXISTS contest_rank_counter ("
+    "contest_id INTEGER PRIMARY KEY "
+    "REFERENCES contest (contest_id) ON DELETE CASCADE, "
+    "last_rank INTEGER NOT NULL DEFAULT 0, "
+    "updated_at TIMESTAMP)",
+    "INSERT INTO contest_rank_counter (contest_id, last_rank, updated_at) "
+    "SELECT contest_id, MAX(contest_rank), CURRENT_TIMESTAMP FROM participant "
+    "GROUP BY contest_id ON CONFLICT (contest_id) DO NOTHING",
+    "ALTER TABLE participant DROP CONSTRAINT IF EXISTS uq_participant_contest_member",
+    "ALTER TABLE participant ADD CONSTRAINT uq_participant_contest_member "
+    "UNIQUE (contest_id, member_id)",
+]
+
+# Registrations that the unique constraint would reject
+DUPLICATES_SQL = (
+    "SELECT contest_id, member_id, COUNT(*) FROM participant "
+    "GROUP BY contest_id, member_id HAVING COUNT(*) > 1"
+)
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            for statement in SCHEMA_SQL:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("Successfully added contest_rank_counter table and unique constraint")
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            db.session.rollback()
+            print("\nIf the constraint failed, remove the duplicate registrations:")
+            print(f"{DUPLICATES_SQL};")
+            print("\nThen run this script again, or run this SQL manually:")
+            for statement in SCHEMA_SQL:
+                print(f"{statement};")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    for statement in SCHEMA_SQL:
+        print(f"{statement};")
@@ -0,0 +1,58 @@
+# Script to add the current-subscription columns to the member table
+# (current_subscription_id, subscription_status, subscription_end_date),
+# their indexes, and to fill them in from the existing subscriptions
+# Run this script once to update your database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA_SQL = [
+    "ALTER TABLE member ADD COLUMN IF NOT EXISTS current_subscription_id INTEGER",
+    "ALTER TABLE member ADD COLUMN IF NOT EXISTS subscription_status VARCHAR(100)",
+    "ALTER TABLE member ADD COLUMN IF NOT EXISTS subscription_end_date TIMESTAMP",
+    "ALTER TABLE member DROP CONSTRAINT IF EXISTS fk_member_current_subscription",
+    "ALTER TABLE member ADD CONSTRAINT fk_member_current_subscription "
+    "FOREIGN KEY (current_subscription_id) "
+    "REFERENCES subscription (subscription_id) ON DELETE SET NULL",
+    "CREATE INDEX IF NOT EXISTS ix_member_subscription_expiry "
+    "ON member (subscription_status, subscription_end_date)",
+    "CREATE INDEX IF NOT EXISTS ix_subscription_member_created "
+    "ON subscription (member_id, created_at)",
+]
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+    from services.subscription_state_service import backfill_current_subscriptions
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            for statement in SCHEMA_SQL:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("Successfully added current-subscription columns to member table")
+
+            updated = backfill_current_subscriptions()
+            print(f"Filled in the current subscription of {updated} members")
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            db.session.rollback()
+            print("\nPlease run this SQL manually in your database:")
+            for statement in SCHEMA_SQL:
+                print(f"{statement};")
+            print("Then run this script again to fill in the columns.")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    for statement in SCHEMA_SQL:
+        print(f"{statement};")
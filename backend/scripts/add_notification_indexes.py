@@ -0,0 +1,40 @@
+# Script to add the (gym_id, created_at, id) index used by the notification
+# listing and its cursor pagination
+# Run this script once to update your database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS ix_notification_gym_created "
+    "ON notification (gym_id, created_at, id)"
+)
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            db.session.execute(text(INDEX_SQL))
+            db.session.commit()
+            print("Successfully created index ix_notification_gym_created")
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            db.session.rollback()
+            print("\nPlease run this SQL manually in your database:")
+            print(f"{INDEX_SQL};")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    print(f"{INDEX_SQL};")
@@ -0,0 +1,58 @@
+# Script to add participant scores (score, score_version), the contest
+# ranking columns (score_version, ranks_computed_version) and their indexes
+# Run this script once to update your database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA_SQL = [
+    "ALTER TABLE participant ADD COLUMN IF NOT EXISTS score "
+    "DOUBLE PRECISION NOT NULL DEFAULT 0",
+    "ALTER TABLE participant ADD COLUMN IF NOT EXISTS score_version "
+    "INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE contest ADD COLUMN IF NOT EXISTS score_version "
+    "INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE contest ADD COLUMN IF NOT EXISTS ranks_computed_version "
+    "INTEGER NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_participant_contest_score "
+    "ON participant (contest_id, score)",
+    "CREATE INDEX IF NOT EXISTS ix_participant_contest_score_version "
+    "ON participant (contest_id, score_version)",
+    # Timestamp change markers used by an earlier version of this script
+    "DROP INDEX IF EXISTS ix_participant_contest_score_updated",
+    "ALTER TABLE participant DROP COLUMN IF EXISTS score_updated_at",
+    "ALTER TABLE contest DROP COLUMN IF EXISTS scores_updated_at",
+    "ALTER TABLE contest DROP COLUMN IF EXISTS ranks_computed_at",
+]
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            for statement in SCHEMA_SQL:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("Successfully added participant score and contest ranking columns")
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            db.session.rollback()
+            print("\nPlease run this SQL manually in your database:")
+            for statement in SCHEMA_SQL:
+                print(f"{statement};")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    for statement in SCHEMA_SQL:
+        print(f"{statement};")
@@ -0,0 +1,72 @@
+# Script to add the member and trainer search indexes (pg_trgm and tsvector)
+# Run this script once to update your PostgreSQL database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MEMBER_TEXT = (
+    "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(phone, '') || ' ' || coalesce(city, ''))"
+)
+TRAINER_TEXT = (
+    "lower(coalesce(name, '') || ' ' || coalesce(specialization, '') || ' ' || "
+    "coalesce(skills, ''))"
+)
+
+# Must match the expressions in models/search.py
+DOCUMENT_INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_member_search_document ON member "
+    f"USING gin (to_tsvector('simple'::regconfig, {MEMBER_TEXT}))",
+    "CREATE INDEX IF NOT EXISTS ix_trainer_search_document ON trainer "
+    f"USING gin (to_tsvector('simple'::regconfig, {TRAINER_TEXT}))",
+]
+
+# Optional: substring search and similarity ranking need pg_trgm
+TRIGRAM_INDEX_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_member_search_trgm ON member "
+    f"USING gin ({MEMBER_TEXT} gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_trainer_search_trgm ON trainer "
+    f"USING gin ({TRAINER_TEXT} gin_trgm_ops)",
+]
+
+
+def run(statements, description):
+    try:
+        for statement in statements:
+            db.session.execute(text(statement))
+        db.session.commit()
+        print(f"Successfully added {description}")
+    except Exception as e:
+        print(f"Error adding {description}: {str(e)}")
+        db.session.rollback()
+        print("\nPlease run this SQL manually in your database:")
+        for statement in statements:
+            print(f"{statement};")
+
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+
+    app = create_app()
+
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            print("Nothing to do: SQLite search tables are created on the first search")
+            sys.exit(0)
+        run(DOCUMENT_INDEX_SQL, "full-text search indexes")
+        run(TRIGRAM_INDEX_SQL, "trigram search indexes")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    for statement in DOCUMENT_INDEX_SQL + TRIGRAM_INDEX_SQL:
+        print(f"{statement};")
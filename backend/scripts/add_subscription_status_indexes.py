@@ -0,0 +1,53 @@
+# Script to add the subscription status indexes used by the subscription
+# expiry job and the dashboard stats, and to expire the subscriptions whose
+# end date has already passed
+# Run this script once to update your database schema
+# Make sure your virtual environment is activated before running
+
+import sys
+import os
+
+# Add parent directory to path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+INDEX_SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_subscription_status_end "
+    "ON subscription (subscription_status, end_date)",
+    "CREATE INDEX IF NOT EXISTS ix_subscription_gym_status "
+    "ON subscription (gym_id, subscription_status)",
+]
+
+try:
+    from app import create_app
+    from database import db
+    from sqlalchemy import text
+    from services.subscription_state_service import expire_overdue_subscriptions
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            for statement in INDEX_SQL:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("Successfully created subscription status indexes")
+
+            result = expire_overdue_subscriptions()
+            print(
+                f"Expired {result['subscriptions_expired']} overdue subscriptions "
+                f"({result['members_expired']} members)"
+            )
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            db.session.rollback()
+            print("\nPlease run this SQL manually in your database:")
+            for statement in INDEX_SQL:
+                print(f"{statement};")
+except ImportError as e:
+    print(f"Import error: {str(e)}")
+    print(
+        "\nMake sure your virtual environment is activated and dependencies are installed."
+    )
+    print("Or run this SQL manually in your database:")
+    for statement in INDEX_SQL:
+        print(f"{statement};")
@@ -0,0 +1,103 @@
+# Microbenchmark: to_dict() + Flask's default JSON provider vs
+# generated serializers + the orjson provider, serializing 10k members.
+# Runs against an in-memory SQLite database, no DATABASE_URL needed.
+#
+# Usage: python scripts/benchmark_serializers.py [member_count]
+
+import sys
+import os
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from database import db
+from models.gym import Gym
+from models.members import Member
+from utils.json_provider import OrjsonProvider, ORJSON_AVAILABLE
+from utils.serializers import serialize_many
+from datetime import datetime, timedelta
+
+MEMBER_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+ROUNDS = 5
+
+
+def best_of(func):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    if not ORJSON_AVAILABLE:
+        print("orjson is not installed - install it with: pip install orjson")
+        return
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        gym = Gym(
+            name="Benchmark Gym",
+            address="1 Main Street",
+            city="City",
+            state="State",
+            zip="12345",
+            phone="1234567890",
+            email="bench@example.com",
+            password="x",
+        )
+        db.session.add(gym)
+        db.session.flush()
+        now = datetime.utcnow()
+        db.session.add_all(
+            Member(
+                name=f"Member {i}",
+                email=f"member{i}@example.com",
+                phone="9876543210",
+                address=f"{i} Long Street Name",
+                city="City",
+                state="State",
+                zip="12345",
+                dp_link=f"https://res.cloudinary.com/demo/image/upload/gymsetu/members/gym_1/member_{i}.jpg",
+                expiration_date=now + timedelta(days=i % 90),
+                gym_id=gym.id,
+            )
+            for i in range(MEMBER_COUNT)
+        )
+        db.session.commit()
+        members = Member.query.all()
+
+        default_provider = DefaultJSONProvider(app)
+        orjson_provider = OrjsonProvider(app)
+
+        def baseline():
+            app.json = default_provider
+            default_provider.response(
+                {"members": [member.to_dict() for member in members]}
+            ).get_data()
+
+        def optimized():
+            app.json = orjson_provider
+            orjson_provider.response(
+                {"members": serialize_many(Member, members)}
+            ).get_data()
+
+        baseline_time = best_of(baseline)
+        optimized_time = best_of(optimized)
+
+    print(f"Serializing {MEMBER_COUNT} members (best of {ROUNDS} rounds)")
+    print(f"  to_dict() + default JSON provider:  {baseline_time * 1000:8.1f} ms")
+    print(f"  generated serializer + orjson:      {optimized_time * 1000:8.1f} ms")
+    print(f"  speedup: {baseline_time / optimized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
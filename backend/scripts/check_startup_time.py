@@ -0,0 +1,99 @@
+# Startup budget check: imports app.py and runs create_app() in a fresh
+# interpreter and fails if either is slower than its budget, or if startup
+# has side effects (database connections, scheduler threads, heavy optional
+# modules imported eagerly).
+#
+# Usage: python scripts/check_startup_time.py [--import-budget-ms N] [--create-budget-ms N]
+# Exit code is 1 when a check fails, so it can run in CI.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUNDS = 5
+
+# Optional modules that must only be imported when first used
+LAZY_MODULES = ("cloudinary", "apscheduler", "requests", "pywebpush", "openpyxl")
+
+PROBE = """
+import json, sys, threading, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+from database import db
+with application.app_context():
+    pool = db.engine.pool
+    connections = pool.checkedin() + pool.checkedout()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_ms": (created - imported) * 1000,
+    "eager_modules": [m for m in %r if m in sys.modules],
+    "threads": threading.active_count(),
+    "connections": connections,
+}))
+"""
+
+
+def run_probe():
+    env = dict(os.environ)
+    # No real database is needed: startup must not connect to it
+    env.setdefault("DATABASE_URL", "sqlite:///startup-check.db")
+    env.setdefault("JWT_SECRET_KEY", "startup-check")
+    env.pop("ENABLE_SCHEDULER", None)
+    env.pop("AUTO_CREATE_TABLES", None)
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE % (LAZY_MODULES,)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check app startup time and side effects"
+    )
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--create-budget-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(ROUNDS)]
+    import_ms = min(run["import_ms"] for run in runs)
+    create_ms = min(run["create_ms"] for run in runs)
+    last = runs[-1]
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(
+            f"import app took {import_ms:.0f} ms (budget {args.import_budget_ms:.0f} ms)"
+        )
+    if create_ms > args.create_budget_ms:
+        failures.append(
+            f"create_app() took {create_ms:.0f} ms (budget {args.create_budget_ms:.0f} ms)"
+        )
+    if last["eager_modules"]:
+        failures.append(f"imported at startup: {', '.join(last['eager_modules'])}")
+    if last["threads"] != 1:
+        failures.append(f"{last['threads'] - 1} background thread(s) started")
+    if last["connections"]:
+        failures.append("a database connection was opened at startup")
+
+    print(f"import app:   {import_ms:7.1f} ms (best of {ROUNDS})")
+    print(f"create_app(): {create_ms:7.1f} ms (best of {ROUNDS})")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
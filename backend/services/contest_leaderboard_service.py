@@ -0,0 +1,306 @@
+"""
+Score-based contest ranking.
+
+Scores are recorded on Participant rows. Every write to a contest's
+participants or scores also increments Contest.score_version, and stamps the
+participants it changed with the new version. The increment locks the
+contest row until commit, so versions are handed out in commit order: once
+a reader sees version N, every change up to N is visible. (Timestamps from
+each process's clock give no such guarantee.)
+
+Two views of the ranking are maintained:
+
+- Live: each process keeps a sorted leaderboard per recently queried contest
+  (ContestLeaderboard). A read compares the contest's version with the one
+  the leaderboard was synced at; when it moved, only the participants
+  stamped with a later version are loaded and re-inserted. Top-N and "my rank"
+  are then answered from memory with binary searches.
+- Stored: recompute_contest_ranks() (run by the scheduler) rewrites
+  Participant.contest_rank of the changed contests with one ROW_NUMBER()
+  UPDATE per batch of contests.
+
+Both order by score, highest first, and break ties by registration order.
+"""
+from database import db
+from models.contest import Contest
+from models.participants import Participant
+from utils.cache import LRUCache
+from sqlalchemy import bindparam, func, select, update
+import bisect
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+CONTEST_LEADERBOARD_CACHE_SIZE = int(os.getenv("CONTEST_LEADERBOARD_CACHE_SIZE", "100"))
+CONTEST_RANK_BATCH_SIZE = int(os.getenv("CONTEST_RANK_BATCH_SIZE", "50"))
+
+
+class ContestLeaderboard:
+    """
+    Participants of one contest sorted by (-score, participant id).
+    Rank lookups are binary searches; score changes re-insert one entry.
+    """
+
+    def __init__(self):
+        self.synced_marker = None
+        self._keys = []
+        self._by_participant = {}
+        self._by_member = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _insert(self, participant_id, member_id, score):
+        previous = self._by_participant.get(participant_id)
+        if previous is not None:
+            del self._keys[bisect.bisect_left(self._keys, previous[0])]
+        key = (-score, participant_id)
+        bisect.insort(self._keys, key)
+        self._by_participant[participant_id] = (key, member_id)
+        self._by_member[member_id] = participant_id
+
+    def load(self, rows, marker):
+        """Replace the leaderboard with (participant_id, member_id, score) rows"""
+        with self._lock:
+            self._by_participant = {
+                participant_id: ((-score, participant_id), member_id)
+                for participant_id, member_id, score in rows
+            }
+            self._by_member = {
+                member_id: participant_id
+                for participant_id, (_, member_id) in self._by_participant.items()
+            }
+            self._keys = sorted(key for key, _ in self._by_participant.values())
+            self.synced_marker = marker
+
+    def apply(self, rows, marker):
+        """Apply changed (participant_id, member_id, score) rows"""
+        with self._lock:
+            for participant_id, member_id, score in rows:
+                self._insert(participant_id, member_id, score)
+            self.synced_marker = marker
+
+    def top(self, limit=None, offset=0):
+        """[(rank, participant_id, member_id, score)] from rank offset + 1"""
+        with self._lock:
+            end = len(self._keys) if limit is None else offset + limit
+            return [
+                (
+                    offset + index + 1,
+                    participant_id,
+                    self._by_participant[participant_id][1],
+                    -negative_score,
+                )
+                for index, (negative_score, participant_id) in enumerate(
+                    self._keys[offset:end]
+                )
+            ]
+
+    def rank_of_member(self, member_id):
+        """(rank, score) of a member, or None if they aren't participating"""
+        with self._lock:
+            participant_id = self._by_member.get(member_id)
+            if participant_id is None:
+                return None
+            key = self._by_participant[participant_id][0]
+            return bisect.bisect_left(self._keys, key) + 1, -key[0]
+
+
+_leaderboards = LRUCache(CONTEST_LEADERBOARD_CACHE_SIZE)
+
+
+def _participant_rows(contest_id, changed_after=None):
+    conditions = [Participant.contest_id == contest_id]
+    if changed_after is not None:
+        conditions.append(Participant.score_version > changed_after)
+    return db.session.execute(
+        select(Participant.id, Participant.member_id, Participant.score).where(
+            *conditions
+        )
+    ).all()
+
+
+def get_leaderboard(contest):
+    """The contest's leaderboard, synced up to contest.score_version"""
+    marker = contest.score_version
+    leaderboard = _leaderboards.get(contest.id)
+    if leaderboard is not None and leaderboard.synced_marker == marker:
+        return leaderboard
+
+    if (
+        leaderboard is None
+        or leaderboard.synced_marker is None
+        or marker < leaderboard.synced_marker
+    ):
+        leaderboard = ContestLeaderboard()
+        leaderboard.load(_participant_rows(contest.id), marker)
+        _leaderboards.set(contest.id, leaderboard)
+        return leaderboard
+
+    changed = _participant_rows(contest.id, leaderboard.synced_marker)
+    count = db.session.execute(
+        select(func.count(Participant.id)).where(Participant.contest_id == contest.id)
+    ).scalar()
+    leaderboard.apply(changed, marker)
+    if len(leaderboard) != count:
+        # Participants were removed: the changed rows can't show that
+        leaderboard.load(_participant_rows(contest.id), marker)
+    return leaderboard
+
+
+def mark_scores_changed(contest_id):
+    """
+    Increment the contest's score_version. Call this in every transaction
+    that adds or removes participants or changes scores, before the
+    participant writes, and stamp added or changed participants with the
+    returned version.
+
+    Returns:
+        int: The new version, or None if the contest doesn't exist
+    """
+    statement = (
+        update(Contest)
+        .where(Contest.id == contest_id)
+        .values(score_version=Contest.score_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(statement.returning(Contest.score_version)).scalar()
+
+    # The UPDATE holds the row lock until commit, so this read is ours
+    if not db.session.execute(statement).rowcount:
+        return None
+    return db.session.execute(
+        select(Contest.score_version).where(Contest.id == contest_id)
+    ).scalar()
+
+
+def record_scores(contest_id, scores):
+    """
+    Set or add to participants' scores.
+
+    Args:
+        contest_id (int): Contest of the participants
+        scores (list): {"member_id", "score"} to set a score, or
+            {"member_id", "delta"} to add to it
+
+    Returns:
+        list: member ids in scores that aren't participating in the contest
+    """
+    member_ids = {entry["member_id"] for entry in scores}
+    registered = set(
+        db.session.execute(
+            select(Participant.member_id).where(
+                Participant.contest_id == contest_id,
+                Participant.member_id.in_(member_ids),
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    version = mark_scores_changed(contest_id)
+    table = Participant.__table__
+    for field, new_score in (
+        ("score", bindparam("new_score")),
+        ("delta", table.c.score + bindparam("new_score")),
+    ):
+        params = [
+            {"target_member_id": entry["member_id"], "new_score": entry[field]}
+            for entry in scores
+            if field in entry and entry["member_id"] in registered
+        ]
+        if params:
+            db.session.execute(
+                update(table)
+                .where(
+                    table.c.contest_id == contest_id,
+                    table.c.member_id == bindparam("target_member_id"),
+                )
+                .values(score=new_score, score_version=version),
+                params,
+            )
+    return sorted(member_ids - registered)
+
+
+def _changed_contests(after_id, limit):
+    """(id, score_version) of contests changed since their ranks were computed"""
+    return db.session.execute(
+        select(Contest.id, Contest.score_version)
+        .where(
+            Contest.id > after_id,
+            Contest.score_version > Contest.ranks_computed_version,
+        )
+        .order_by(Contest.id)
+        .limit(limit)
+    ).all()
+
+
+def recompute_contest_ranks(batch_size=None):
+    """
+    Rewrite Participant.contest_rank of contests whose scores changed, with
+    one ROW_NUMBER() UPDATE per batch of CONTEST_RANK_BATCH_SIZE contests.
+    This function is called by the scheduler every few minutes.
+
+    Returns:
+        dict: Number of contests ranked and participant ranks changed
+    """
+    batch_size = batch_size or CONTEST_RANK_BATCH_SIZE
+    counts = {"contests_ranked": 0, "ranks_changed": 0}
+    contest_table = Contest.__table__
+    # Each contest is ranked at most once per run (keyset on the id)
+    last_id = 0
+
+    while True:
+        # Versions read before ranking: later score writes raise score_version
+        # again and the contest is picked up by the next run
+        contests = _changed_contests(last_id, batch_size)
+        if not contests:
+            break
+        contest_ids = [contest_id for contest_id, _ in contests]
+        last_id = contest_ids[-1]
+        ranked = (
+            select(
+                Participant.id.label("participant_id"),
+                func.row_number()
+                .over(
+                    partition_by=Participant.contest_id,
+                    order_by=(Participant.score.desc(), Participant.id),
+                )
+                .label("rank"),
+            )
+            .where(Participant.contest_id.in_(contest_ids))
+            .subquery()
+        )
+        result = db.session.execute(
+            update(Participant)
+            .where(
+                Participant.id == ranked.c.participant_id,
+                Participant.contest_rank != ranked.c.rank,
+            )
+            .values(contest_rank=ranked.c.rank)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(contest_table)
+            .where(contest_table.c.contest_id == bindparam("target_contest_id"))
+            .values(ranks_computed_version=bindparam("version")),
+            [
+                {"target_contest_id": contest_id, "version": version}
+                for contest_id, version in contests
+            ],
+        )
+        db.session.commit()
+        counts["contests_ranked"] += len(contest_ids)
+        counts["ranks_changed"] += result.rowcount
+        if len(contest_ids) < batch_size:
+            break
+
+    logger.info(
+        f"Recomputed ranks of {counts['contests_ranked']} contests "
+        f"({counts['ranks_changed']} ranks changed)"
+    )
+    return counts
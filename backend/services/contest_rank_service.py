@@ -0,0 +1,87 @@
+"""
+Registration ranks of contest participants.
+
+Each contest has a counter row holding the last rank handed out. A new
+participant's rank comes from one UPDATE ... RETURNING on that row, so
+registration is a primary-key write instead of a MAX() over the contest's
+participants, and concurrent registrations queue on the row lock and get
+distinct ranks. A contest's counter is created from a MAX on its first
+registration (ranks given out before the counter existed are kept).
+"""
+from database import db
+from models.contest_rank_counter import ContestRankCounter
+from models.participants import Participant
+from sqlalchemy import func, select, update
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _initialize_counter(contest_id):
+    """Create a contest's counter from the highest rank already handed out"""
+    last_rank = db.session.execute(
+        select(func.coalesce(func.max(Participant.contest_rank), 0)).where(
+            Participant.contest_id == contest_id
+        )
+    ).scalar()
+    dialect = db.session.get_bind().dialect.name
+    values = {
+        "contest_id": contest_id,
+        "last_rank": last_rank,
+        "updated_at": datetime.utcnow(),
+    }
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # A concurrent registration may have created it first; its value wins
+        db.session.execute(
+            insert(ContestRankCounter)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[ContestRankCounter.contest_id])
+        )
+    else:
+        db.session.add(ContestRankCounter(**values))
+        db.session.flush()
+
+
+def _increment(contest_id):
+    """Increment the counter; returns the new rank, or None if there is no counter"""
+    statement = (
+        update(ContestRankCounter)
+        .where(ContestRankCounter.contest_id == contest_id)
+        .values(
+            last_rank=ContestRankCounter.last_rank + 1,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.get_bind().dialect.update_returning:
+        return db.session.execute(
+            statement.returning(ContestRankCounter.last_rank)
+        ).scalar()
+
+    # The UPDATE holds the row lock until commit, so this read is ours
+    if not db.session.execute(statement).rowcount:
+        return None
+    return db.session.execute(
+        select(ContestRankCounter.last_rank).where(
+            ContestRankCounter.contest_id == contest_id
+        )
+    ).scalar()
+
+
+def next_contest_rank(contest_id):
+    """
+    Hand out the next registration rank of a contest. Call this in the
+    transaction that inserts the participant, before committing.
+    """
+    rank = _increment(contest_id)
+    if rank is None:
+        _initialize_counter(contest_id)
+        rank = _increment(contest_id)
+    return rank
@@ -0,0 +1,175 @@
+"""
+In-memory gym directory for the public gym dropdowns on the login pages.
+
+The gym list is loaded once per worker and served from memory:
+- It is reloaded after GYM_DIRECTORY_TTL seconds, or right away when this
+  worker registers/updates/deletes a gym (invalidate_gym_directory()).
+- Other workers notice writes through the "gyms" resource version, checked
+  at most every GYM_DIRECTORY_VERSION_CHECK seconds (one primary-key read).
+- Response bodies are encoded once per snapshot and query, and carry a
+  strong ETag, so the compression middleware compresses each body once too.
+"""
+from flask import current_app, request
+from models.gym import Gym
+from models.resource_version import GLOBAL_SCOPE
+from utils.etag_utils import get_resource_version
+from utils.compression import etag_variants
+from utils.validation import ValidationError
+from collections import OrderedDict
+import bisect
+import hashlib
+import threading
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+GYM_DIRECTORY_TTL = int(os.getenv("GYM_DIRECTORY_TTL", "300"))
+GYM_DIRECTORY_VERSION_CHECK = int(os.getenv("GYM_DIRECTORY_VERSION_CHECK", "10"))
+GYM_DIRECTORY_MAX_AGE = int(os.getenv("GYM_DIRECTORY_MAX_AGE", "60"))
+MAX_CACHED_BODIES = 256
+MAX_PER_PAGE = 100
+
+# Fields of the dropdown entries (the full view uses Gym.to_dict())
+DROPDOWN_FIELDS = ("id", "name", "email", "city", "state")
+
+
+class GymDirectorySnapshot:
+    """Immutable view of all gyms, sorted by name, with encoded response bodies"""
+
+    def __init__(self, gyms, version):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.checked_at = self.loaded_at
+        gyms = sorted(gyms, key=lambda gym: (gym["name"].lower(), gym["id"]))
+        self.gyms = gyms
+        self.dropdown = [
+            {field: gym[field] for field in DROPDOWN_FIELDS} for gym in gyms
+        ]
+        self.sort_keys = [gym["name"].lower() for gym in gyms]
+        # Content hash, so every worker derives the same ETags for the same data
+        self.token = hashlib.sha1(repr(gyms).encode("utf-8")).hexdigest()
+        self.bodies = OrderedDict()
+        self.lock = threading.Lock()
+
+    def search(self, prefix):
+        """Return (start, end) of the gyms whose name starts with prefix"""
+        if not prefix:
+            return 0, len(self.gyms)
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.sort_keys, prefix)
+        end = bisect.bisect_left(self.sort_keys, prefix + "\uffff", lo=start)
+        return start, end
+
+
+class GymDirectory:
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def get(self):
+        """Return the current snapshot, reloading it if stale"""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - snapshot.loaded_at < GYM_DIRECTORY_TTL:
+            if now - snapshot.checked_at < GYM_DIRECTORY_VERSION_CHECK:
+                return snapshot
+            # Cheap cross-worker freshness check
+            if get_resource_version(GLOBAL_SCOPE, "gyms") == snapshot.version:
+                snapshot.checked_at = now
+                return snapshot
+
+        with self._lock:
+            if self._snapshot is not snapshot and self._snapshot is not None:
+                return self._snapshot
+            self._snapshot = self._load()
+            return self._snapshot
+
+    def _load(self):
+        version = get_resource_version(GLOBAL_SCOPE, "gyms")
+        gyms = [gym.to_dict() for gym in Gym.query.all()]
+        logger.info(f"Loaded gym directory: {len(gyms)} gyms (version {version})")
+        return GymDirectorySnapshot(gyms, version)
+
+
+gym_directory = GymDirectory()
+
+
+def invalidate_gym_directory():
+    """Drop this worker's directory after a gym write has been committed"""
+    gym_directory.invalidate()
+
+
+def _parse_paging():
+    q = request.args.get("q", "").strip()
+    page = request.args.get("page", type=int)
+    per_page = request.args.get("per_page", type=int)
+    if page is not None and page < 1:
+        raise ValidationError("page must be 1 or greater", "page")
+    if per_page is not None and not 1 <= per_page <= MAX_PER_PAGE:
+        raise ValidationError(
+            f"per_page must be between 1 and {MAX_PER_PAGE}", "per_page"
+        )
+    if per_page is not None and page is None:
+        page = 1
+    if page is not None and per_page is None:
+        per_page = 20
+    return q, page, per_page
+
+
+def _build_body(snapshot, view, q, page, per_page):
+    start, end = snapshot.search(q)
+    total = end - start
+    if page is not None:
+        start = min(start + (page - 1) * per_page, end)
+        end = min(start + per_page, end)
+    gyms = (snapshot.gyms if view == "full" else snapshot.dropdown)[start:end]
+
+    if view == "full":
+        body = {"message": "All gyms fetched successfully", "gyms": gyms}
+    else:
+        body = {"success": True, "gyms": gyms}
+    body["total"] = total
+    if page is not None:
+        body["page"] = page
+        body["per_page"] = per_page
+        body["has_more"] = page * per_page < total
+    return (current_app.json.dumps(body) + "\n").encode("utf-8")
+
+
+def gym_directory_response(view="dropdown"):
+    """
+    Build the response of a public gym list endpoint from the directory.
+
+    Query parameters: q (case-insensitive name prefix), page, per_page.
+
+    Args:
+        view (str): "dropdown" (id, name, email, city, state) or "full" (to_dict())
+    """
+    q, page, per_page = _parse_paging()
+    snapshot = gym_directory.get()
+    key = (view, q.lower(), page, per_page)
+    etag = hashlib.sha1(f"{snapshot.token}:{key}".encode("utf-8")).hexdigest()[:32]
+
+    if any(request.if_none_match.contains(tag) for tag in etag_variants(etag)):
+        response = current_app.response_class(status=304)
+    else:
+        with snapshot.lock:
+            body = snapshot.bodies.get(key)
+            if body is not None:
+                snapshot.bodies.move_to_end(key)
+        if body is None:
+            body = _build_body(snapshot, view, q, page, per_page)
+            with snapshot.lock:
+                snapshot.bodies[key] = body
+                while len(snapshot.bodies) > MAX_CACHED_BODIES:
+                    snapshot.bodies.popitem(last=False)
+        response = current_app.response_class(body, mimetype="application/json")
+
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={GYM_DIRECTORY_MAX_AGE}"
+    return response
@@ -0,0 +1,156 @@
+"""
+Member dashboard (home screen of the member app).
+
+Everything the dashboard shows is loaded with one query: the member, their
+current subscription (joined through Member.current_subscription_id), the
+number of contests joined, and the resource versions of the gym's members,
+subscriptions, contests and participants.
+
+The result is kept per member as a snapshot. Every write to a member,
+subscription, contest or participant bumps one of those versions, so a
+snapshot stays valid while the versions are unchanged, also across worker
+processes. A cached dashboard therefore costs a single primary-key read of
+the versions. Values that depend on the current time (days remaining, active
+days) are computed per request from the snapshot.
+"""
+from database import db
+from models.members import Member
+from models.subscription import Subscription
+from models.participants import Participant
+from models.resource_version import ResourceVersion
+from utils.cache import LRUCache
+from sqlalchemy import func, select
+from datetime import datetime
+import os
+
+MEMBER_DASHBOARD_CACHE_SIZE = int(os.getenv("MEMBER_DASHBOARD_CACHE_SIZE", "10000"))
+
+# Resources whose writes change a member's dashboard
+DASHBOARD_RESOURCES = ("members", "subscriptions", "contests", "participants")
+
+dashboard_cache = LRUCache(MEMBER_DASHBOARD_CACHE_SIZE)
+
+
+def _version_columns(gym_id):
+    return [
+        select(ResourceVersion.version)
+        .where(ResourceVersion.gym_id == gym_id, ResourceVersion.resource == resource)
+        .scalar_subquery()
+        .label(f"{resource}_version")
+        for resource in DASHBOARD_RESOURCES
+    ]
+
+
+def _versions(values):
+    return tuple(version or 0 for version in values)
+
+
+def _load_dashboard(member_id, gym_id):
+    """Load member, current subscription, contest count and versions in one query"""
+    contests_joined = (
+        select(func.count(Participant.id))
+        .where(Participant.member_id == Member.id, Participant.gym_id == Member.gym_id)
+        .correlate(Member)
+        .scalar_subquery()
+    )
+    return db.session.execute(
+        select(
+            Member,
+            Subscription,
+            contests_joined.label("contests_joined"),
+            *_version_columns(gym_id),
+        )
+        .outerjoin(Subscription, Subscription.id == Member.current_subscription_id)
+        .where(Member.id == member_id, Member.gym_id == gym_id)
+    ).first()
+
+
+def _build_snapshot(member, subscription, contests_joined):
+    member_data = member.to_dict()
+    member_data.update(
+        {
+            "phone": member.phone,
+            "address": member.address,
+            "city": member.city,
+            "state": member.state,
+            "zipCode": member.zip,
+            "dateOfBirth": member.dob.isoformat() if member.dob else None,
+            "gender": member.gender,
+            "fitnessGoals": None,  # Would need additional field
+            "profilePhoto": member.dp_link,
+            "stats": {
+                "weight": member.weight or 0,
+                "height": member.height or 0,
+                "bmi": (member.weight / ((member.height / 100) ** 2))
+                if member.weight and member.height
+                else 0,
+                "joinDate": member.created_at.isoformat()
+                if member.created_at
+                else None,
+            },
+        }
+    )
+    return {
+        "is_active": member.is_active,
+        "member": member_data,
+        "subscription": {
+            "status": subscription.subscription_status if subscription else "Expired",
+            "plan": subscription.subscription_plan if subscription else "None",
+            "startDate": subscription.start_date.isoformat()
+            if subscription and subscription.start_date
+            else None,
+            "endDate": subscription.end_date.isoformat()
+            if subscription and subscription.end_date
+            else None,
+        },
+        "end_date": subscription.end_date if subscription else None,
+        "created_at": member.created_at,
+        "contests_joined": contests_joined,
+    }
+
+
+def get_dashboard_snapshot(member_id, gym_id):
+    """
+    Return the member's dashboard snapshot, or None if the member doesn't exist.
+    The snapshot is shared between requests and must not be modified.
+    """
+    key = (gym_id, member_id)
+    cached = dashboard_cache.get(key)
+    if cached is not None:
+        versions = _versions(
+            db.session.execute(select(*_version_columns(gym_id))).one()
+        )
+        if versions == cached[0]:
+            return cached[1]
+
+    row = _load_dashboard(member_id, gym_id)
+    if row is None:
+        dashboard_cache.delete(key)
+        return None
+    member, subscription, contests_joined = row[0], row[1], row[2]
+    snapshot = _build_snapshot(member, subscription, contests_joined)
+    dashboard_cache.set(key, (_versions(row[3:]), snapshot))
+    return snapshot
+
+
+def build_dashboard(snapshot, now=None):
+    """Member and stats payloads of the dashboard, with day counts as of now"""
+    now = now or datetime.utcnow()
+    days_remaining = 0
+    if snapshot["end_date"]:
+        days_remaining = max(0, (snapshot["end_date"] - now).days)
+    active_days = (now - snapshot["created_at"]).days if snapshot["created_at"] else 0
+
+    member_data = dict(snapshot["member"])
+    member_data["subscription"] = {
+        **snapshot["subscription"],
+        "daysRemaining": days_remaining,
+    }
+    stats_data = {
+        "activeDays": active_days,
+        "daysRemaining": days_remaining,
+        # Placeholder - would need workout tracking model
+        "workoutsThisWeek": {"completed": 0, "total": 0},
+        "contestsJoined": snapshot["contests_joined"],
+    }
+    return member_data, stats_data
@@ -0,0 +1,178 @@
+"""
+Sections of the member app's home screen.
+
+Each section builder returns the response body of its standalone endpoint
+(get_member_dashboard, get_contests, ...), so /api/members/home can return
+any combination of them from one request, one authentication and one
+member lookup (the cached dashboard snapshot).
+"""
+from database import db
+from models.contest import Contest
+from models.participants import Participant
+from models.trainers import Trainer
+from services.member_dashboard_service import build_dashboard
+from utils.validation import ValidationError
+from sqlalchemy import exists, func, select
+from datetime import datetime, timedelta
+
+
+def dashboard_section(member_id, gym_id, snapshot):
+    member_data, stats_data = build_dashboard(snapshot)
+    return {"success": True, "member": member_data, "stats": stats_data}
+
+
+def profile_section(member_id, gym_id, snapshot):
+    return {"success": True, "member": snapshot["member"]}
+
+
+def workout_plan_section(member_id, gym_id, snapshot):
+    # Placeholder - would need workout plan model
+    return {
+        "success": True,
+        "workoutPlan": {
+            "name": "No Workout Plan",
+            "duration": "N/A",
+            "progress": 0,
+            "daysPerWeek": 0,
+            "weeklySchedule": [],
+            "exercises": {},
+        },
+    }
+
+
+def diet_plan_section(member_id, gym_id, snapshot):
+    # Placeholder - would need diet plan model
+    return {
+        "success": True,
+        "dietPlan": {
+            "name": "No Diet Plan",
+            "duration": "N/A",
+            "calories": 0,
+            "protein": 0,
+            "carbs": 0,
+            "fats": 0,
+            "meals": [],
+        },
+    }
+
+
+def trainer_section(member_id, gym_id, snapshot):
+    # First trainer of the gym (placeholder - would need trainer assignment model)
+    trainer = Trainer.query.filter_by(gym_id=gym_id, is_active=True).first()
+    if not trainer:
+        return {"success": True, "trainer": None, "message": "No trainer assigned"}
+
+    trainer_data = trainer.to_dict()
+    trainer_data.update(
+        {
+            "specialization": trainer.specialization,
+            "experience": trainer.experience,
+            "bio": trainer.bio,
+            "photo": trainer.dp_link,
+        }
+    )
+    return {"success": True, "trainer": trainer_data}
+
+
+def contests_section(member_id, gym_id, snapshot):
+    """The gym's contests with participant counts and whether the member joined"""
+    participant_counts = (
+        select(Participant.contest_id, func.count(Participant.id).label("count"))
+        .where(Participant.gym_id == gym_id)
+        .group_by(Participant.contest_id)
+        .subquery()
+    )
+    joined = (
+        exists()
+        .where(
+            Participant.contest_id == Contest.id,
+            Participant.member_id == member_id,
+            Participant.gym_id == gym_id,
+        )
+        .label("joined")
+    )
+    rows = db.session.execute(
+        select(Contest, func.coalesce(participant_counts.c.count, 0), joined)
+        .outerjoin(participant_counts, participant_counts.c.contest_id == Contest.id)
+        .where(Contest.gym_id == gym_id)
+        .order_by(Contest.id)
+    ).all()
+
+    now = datetime.utcnow()
+    contests_data = []
+    for contest, participants_count, is_joined in rows:
+        if contest.start_date > now:
+            status = "upcoming"
+        elif contest.end_date < now:
+            status = "completed"
+        else:
+            status = "ongoing"
+
+        contests_data.append(
+            {
+                "id": str(contest.id),
+                "name": contest.name,
+                "description": contest.description,
+                "startDate": contest.start_date.isoformat()
+                if contest.start_date
+                else None,
+                "endDate": contest.end_date.isoformat() if contest.end_date else None,
+                "status": status,
+                "participants": participants_count,
+                "prize": "Trophy",  # Placeholder
+                "joined": bool(is_joined),
+            }
+        )
+    return {"success": True, "contests": contests_data}
+
+
+def todays_schedule_section(member_id, gym_id, snapshot):
+    # Placeholder - would need schedule model
+    return {"success": True, "schedule": []}
+
+
+def weekly_progress_section(member_id, gym_id, snapshot):
+    # Placeholder - would need progress tracking model
+    today = datetime.utcnow()
+    week_start = today - timedelta(days=today.weekday())
+    weekly_progress = [
+        {"day": (week_start + timedelta(days=i)).strftime("%a"), "value": 0}
+        for i in range(7)
+    ]
+    return {"success": True, "weeklyProgress": weekly_progress}
+
+
+HOME_SECTIONS = {
+    "dashboard": dashboard_section,
+    "profile": profile_section,
+    "workout_plan": workout_plan_section,
+    "diet_plan": diet_plan_section,
+    "trainer": trainer_section,
+    "contests": contests_section,
+    "todays_schedule": todays_schedule_section,
+    "weekly_progress": weekly_progress_section,
+}
+
+
+def parse_sections(value):
+    """Parse the comma-separated sections parameter (all sections when empty)"""
+    if not value or not value.strip():
+        return list(HOME_SECTIONS)
+    sections = []
+    for name in value.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in HOME_SECTIONS:
+            raise ValidationError(
+                f"Unknown section '{name}'. Available: {', '.join(HOME_SECTIONS)}",
+                "sections",
+            )
+        if name not in sections:
+            sections.append(name)
+    return sections
+
+
+def build_member_home(member_id, gym_id, snapshot, sections):
+    """Response bodies of the requested sections, keyed by section name"""
+    return {name: HOME_SECTIONS[name](member_id, gym_id, snapshot) for name in sections}
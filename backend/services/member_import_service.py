@@ -0,0 +1,300 @@
+from database import db
+from models.members import Member
+from utils.validation import ValidationError
+from utils.schema import MEMBER_SCHEMA
+from utils.etag_utils import bump_resource_version
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, date
+import csv
+import logging
+import os
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+# Number of rows validated, deduplicated and inserted together
+IMPORT_BATCH_SIZE = int(os.getenv("MEMBER_IMPORT_BATCH_SIZE", "500"))
+
+MEMBER_IMPORT_FIELDS = (
+    "name",
+    "email",
+    "phone",
+    "address",
+    "city",
+    "state",
+    "zip",
+    "expiration_date",
+)
+
+# Alternative spellings accepted in the header row
+HEADER_ALIASES = {
+    "zip_code": "zip",
+    "zipcode": "zip",
+    "postal_code": "zip",
+    "expiry_date": "expiration_date",
+    "expiration": "expiration_date",
+}
+
+
+def _normalize_header(header):
+    key = str(header or "").strip().lower().replace(" ", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _normalize_value(value):
+    """Convert a raw cell value to the string form the validators expect"""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets store phone numbers and ZIP codes as numbers
+        return str(int(value))
+    return str(value).strip()
+
+
+def _build_row(headers, values):
+    row = {}
+    for header, value in zip(headers, values):
+        if header in MEMBER_IMPORT_FIELDS:
+            row[header] = _normalize_value(value)
+    return row
+
+
+class ImportFileError(ValidationError):
+    """The uploaded file can't be read (from row onwards)"""
+
+    def __init__(self, message, row):
+        super().__init__(message, "file")
+        self.row = row
+
+
+def _decode_lines(stream):
+    """
+    Decode a binary upload one line at a time, so a decoding error is raised
+    on the line it occurs in rather than somewhere in a larger chunk
+    """
+    for index, line in enumerate(stream):
+        yield line.decode("utf-8-sig" if index == 0 else "utf-8")
+
+
+def iter_csv_rows(file_storage):
+    """
+    Yield (line number, member row) from a CSV upload without reading it
+    into memory. A row spanning several lines (quoted newlines) gets the
+    number of the line it starts on.
+
+    Raises:
+        ImportFileError: The file isn't UTF-8 text or isn't valid CSV
+    """
+    line_number = 1
+    try:
+        reader = csv.reader(_decode_lines(file_storage.stream))
+        headers = [_normalize_header(h) for h in next(reader, [])]
+        line_number = reader.line_num + 1
+        for values in reader:
+            row_number, line_number = line_number, reader.line_num + 1
+            if not any(v.strip() for v in values):
+                continue
+            yield row_number, _build_row(headers, values)
+    except UnicodeDecodeError:
+        raise ImportFileError(
+            f"Row {line_number}: the file is not UTF-8 text. "
+            "Please save it as CSV UTF-8",
+            line_number,
+        )
+    except csv.Error as e:
+        raise ImportFileError(f"Row {line_number}: invalid CSV ({str(e)})", line_number)
+
+
+def iter_xlsx_rows(file_storage):
+    """
+    Yield (sheet row number, member row) from the first sheet of an XLSX upload
+
+    Raises:
+        ImportFileError: The file isn't a readable XLSX workbook
+    """
+    # Import openpyxl here so CSV imports work without it installed
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ValidationError("XLSX import is not available. Please upload a CSV file")
+
+    # Corrupt archives and sheets (ParseError is a SyntaxError subclass)
+    file_errors = (
+        zipfile.BadZipFile,
+        InvalidFileException,
+        KeyError,
+        ValueError,
+        OSError,
+        SyntaxError,
+    )
+    try:
+        workbook = load_workbook(file_storage.stream, read_only=True, data_only=True)
+    except file_errors:
+        raise ImportFileError("The file is not a valid XLSX workbook", 1)
+
+    row_number = 1
+    try:
+        # Blank rows are included, so positions are sheet row numbers
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if not any(v not in (None, "") for v in values):
+                continue
+            yield row_number, _build_row(headers, values)
+    except file_errors:
+        raise ImportFileError(
+            f"Row {row_number}: the workbook could not be read", row_number
+        )
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(file_storage):
+    """Pick a row reader based on the uploaded file's extension"""
+    filename = (file_storage.filename or "").lower()
+    if filename.endswith(".csv"):
+        return iter_csv_rows(file_storage)
+    if filename.endswith(".xlsx"):
+        return iter_xlsx_rows(file_storage)
+    raise ValidationError("Unsupported file type. Please upload a .csv or .xlsx file")
+
+
+def _import_batch(batch, gym_id, seen_emails, report):
+    """Validate one batch, drop duplicate emails and bulk insert the rest"""
+    candidates = []
+    for row_number, row in batch:
+        try:
+            row = MEMBER_SCHEMA.validate(row)
+        except ValidationError as e:
+            _add_error(report, row_number, row, e.message)
+            continue
+
+        if row["email"] in seen_emails:
+            _add_error(report, row_number, row, "Duplicate email in file")
+            continue
+        seen_emails.add(row["email"])
+
+        candidates.append(
+            (
+                row_number,
+                {
+                    "name": row["name"],
+                    "email": row["email"],
+                    "phone": row["phone"],
+                    "address": row["address"],
+                    "city": row["city"],
+                    "state": row["state"],
+                    "zip": row["zip"],
+                    "expiration_date": row.get("expiration_date"),
+                    "gym_id": gym_id,
+                },
+            )
+        )
+
+    if not candidates:
+        return
+
+    # Member.email is unique across all gyms, so dedupe against the whole table
+    existing_emails = {
+        email
+        for (email,) in db.session.query(Member.email).filter(
+            Member.email.in_([values["email"] for _, values in candidates])
+        )
+    }
+
+    rows_to_insert = []
+    for row_number, values in candidates:
+        if values["email"] in existing_emails:
+            _add_error(
+                report, row_number, values, "Member with this email already exists"
+            )
+        else:
+            rows_to_insert.append((row_number, values))
+
+    if not rows_to_insert:
+        return
+
+    try:
+        db.session.execute(insert(Member), [values for _, values in rows_to_insert])
+        bump_resource_version(gym_id, "members")
+        db.session.commit()
+        report["imported"] += len(rows_to_insert)
+    except IntegrityError as e:
+        # Another request inserted one of these emails after our check
+        db.session.rollback()
+        logger.warning(f"Member import batch rejected by database: {str(e)}")
+        for row_number, values in rows_to_insert:
+            _add_error(
+                report, row_number, values, "Duplicate entry found (unique constraint)"
+            )
+
+
+def _add_error(report, row_number, row, message):
+    report["failed"] += 1
+    report["errors"].append(
+        {"row": row_number, "email": row.get("email") or None, "error": message}
+    )
+
+
+def import_members_from_file(file_storage, gym_id, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import members for a gym from an uploaded CSV or XLSX file.
+
+    Rows are read as a stream and processed in batches: each batch is
+    validated, checked for existing emails with a single query and inserted
+    with one bulk INSERT. Invalid rows are skipped and reported.
+
+    If the file turns out to be unreadable before any batch was committed,
+    ImportFileError (a ValidationError) is raised and nothing is imported.
+    Once batches were committed, the rows read so far are still imported and
+    the report is returned with the unreadable row in errors and in
+    file_error.
+
+    Args:
+        file_storage: Uploaded file from request.files
+        gym_id: Gym the members are imported into
+        batch_size: Number of rows per validation/insert batch
+
+    Returns:
+        dict: Counts of total, imported and failed rows plus per-row errors
+    """
+    report = {
+        "total_rows": 0,
+        "imported": 0,
+        "failed": 0,
+        "errors": [],
+        "file_error": None,
+    }
+    seen_emails = set()
+    batch = []
+    committed = False
+
+    try:
+        # Readers number rows as they appear in the file (the header is row 1)
+        for row_number, row in iter_import_rows(file_storage):
+            report["total_rows"] += 1
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                _import_batch(batch, gym_id, seen_emails, report)
+                batch = []
+                committed = True
+    except ImportFileError as e:
+        if not committed:
+            raise
+        logger.warning(f"Member import for gym_id {gym_id} stopped: {e.message}")
+        report["file_error"] = e.message
+        report["errors"].append({"row": e.row, "email": None, "error": e.message})
+
+    if batch:
+        _import_batch(batch, gym_id, seen_emails, report)
+
+    report["errors"].sort(key=lambda error: error["row"])
+    logger.info(
+        f"Member import for gym_id {gym_id}: {report['imported']} imported, "
+        f"{report['failed']} failed"
+    )
+    return report
@@ -0,0 +1,166 @@
+"""
+Per-gym unread notification counters.
+
+The counter row is updated in the same transaction as the notification
+write, so the unread-count endpoint is a primary-key read instead of a
+COUNT(*) over the whole notification history. A gym's counter is created
+from a COUNT on its first notification write (until then reads fall back
+to counting), and repair_unread_counters() periodically creates missing
+counters and corrects any drift (e.g. rows changed by hand in the database).
+"""
+from database import db
+from models.notification import Notification
+from models.notification_counter import GymNotificationCounter
+from sqlalchemy import func, select, update
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _count_unread(gym_id):
+    return db.session.execute(
+        select(func.count(Notification.id)).where(
+            Notification.gym_id == gym_id, Notification.is_read == False
+        )
+    ).scalar()
+
+
+def _initialize_counter(gym_id):
+    """
+    Create a gym's counter from a COUNT (includes this transaction's writes).
+    Returns False if a concurrent request created it first.
+    """
+    count = _count_unread(gym_id)
+    dialect = db.session.get_bind().dialect.name
+    values = {"gym_id": gym_id, "unread_count": count, "updated_at": datetime.utcnow()}
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # A concurrent request may have created it first; its count wins
+        inserted = db.session.execute(
+            insert(GymNotificationCounter)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[GymNotificationCounter.gym_id])
+        ).rowcount
+        return bool(inserted)
+
+    db.session.add(GymNotificationCounter(**values))
+    db.session.flush()
+    return True
+
+
+def _increment_counter(gym_id, delta):
+    """Add delta to an existing counter; returns False if there is none"""
+    return bool(
+        db.session.execute(
+            update(GymNotificationCounter)
+            .where(GymNotificationCounter.gym_id == gym_id)
+            .values(
+                unread_count=GymNotificationCounter.unread_count + delta,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    )
+
+
+def adjust_unread_count(gym_id, delta):
+    """
+    Add delta to a gym's unread counter. Call this before committing the
+    notification write so both are part of the same transaction.
+    """
+    if not delta:
+        return
+    if _increment_counter(gym_id, delta):
+        return
+    if not _initialize_counter(gym_id):
+        # Lost the race to create the counter: the winner's COUNT can't see
+        # this transaction's write, so apply the delta to its row
+        _increment_counter(gym_id, delta)
+
+
+def get_unread_count(gym_id):
+    """Read a gym's unread count (primary-key lookup)"""
+    count = db.session.execute(
+        select(GymNotificationCounter.unread_count).where(
+            GymNotificationCounter.gym_id == gym_id
+        )
+    ).scalar()
+    if count is None:
+        # No counter yet (no notification writes since it was introduced)
+        count = _count_unread(gym_id)
+    return count
+
+
+def repair_unread_counters():
+    """
+    Recompute every gym's counter from the notification table and fix the
+    ones that drifted. This function is called by the scheduler daily.
+    """
+    try:
+        actual = dict(
+            db.session.execute(
+                select(Notification.gym_id, func.count(Notification.id))
+                .where(Notification.is_read == False)
+                .group_by(Notification.gym_id)
+            ).all()
+        )
+        stored = dict(
+            db.session.execute(
+                select(
+                    GymNotificationCounter.gym_id, GymNotificationCounter.unread_count
+                )
+            ).all()
+        )
+
+        created = 0
+        for gym_id in actual.keys() - stored.keys():
+            _initialize_counter(gym_id)
+            db.session.commit()
+            created += 1
+
+        repaired = 0
+        for gym_id, stored_count in stored.items():
+            actual_count = actual.get(gym_id, 0)
+            if stored_count != actual_count:
+                # Re-count under the row lock so concurrent writes aren't lost
+                db.session.execute(
+                    select(GymNotificationCounter.gym_id)
+                    .where(GymNotificationCounter.gym_id == gym_id)
+                    .with_for_update()
+                )
+                db.session.execute(
+                    update(GymNotificationCounter)
+                    .where(GymNotificationCounter.gym_id == gym_id)
+                    .values(
+                        unread_count=_count_unread(gym_id),
+                        updated_at=datetime.utcnow(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+                repaired += 1
+                logger.warning(
+                    f"Repaired unread counter for gym {gym_id}: "
+                    f"{stored_count} -> {actual_count}"
+                )
+
+        logger.info(
+            f"Checked {len(stored)} unread counters, repaired {repaired}, "
+            f"created {created}"
+        )
+        return {
+            "success": True,
+            "checked": len(stored),
+            "repaired": repaired,
+            "created": created,
+        }
+    except Exception as e:
+        logger.error(f"Error repairing unread counters: {str(e)}")
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
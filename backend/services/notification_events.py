@@ -0,0 +1,359 @@
+"""
+Real-time notification events for the owner dashboard (Server-Sent Events).
+
+Writers queue events on the SQLAlchemy session; they are only delivered once
+the transaction commits, and dropped if it rolls back:
+- On PostgreSQL events are sent with pg_notify() inside the transaction. A
+  LISTEN thread in every worker process fans them out to that process's
+  subscribers, so a notification created by any worker reaches every stream.
+- On other databases (single-process development setups) events are handed
+  to the in-process broker after commit.
+
+Streams block on a queue.Queue, so they work under threaded and gevent
+(monkey-patched) workers alike; each open stream occupies one thread/greenlet.
+"""
+from database import db
+from models.notification import Notification
+from services.notification_counter_service import get_unread_count
+from utils.db_routing import use_primary
+from sqlalchemy import event, text
+import threading
+import select as select_module
+import queue
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "gym_notifications"
+PG_NOTIFY_MAX_PAYLOAD = 7900  # PostgreSQL's limit is 8000 bytes
+SUBSCRIBER_QUEUE_SIZE = 100
+HEARTBEAT_INTERVAL = 15  # seconds; also how quickly closed connections are noticed
+MAX_STREAM_DURATION = 30 * 60  # seconds; clients reconnect with Last-Event-ID
+BACKFILL_LIMIT = 100
+RECONNECT_DELAY_MS = 5000
+
+RESYNC_EVENT = {"event": "resync", "id": None, "data": {}}
+
+_SESSION_KEY = "pending_notification_events"
+
+
+class NotificationBroker:
+    """In-process pub/sub: one bounded queue per open stream, grouped by gym"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, gym_id):
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(gym_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, gym_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(gym_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[gym_id]
+
+    def publish(self, gym_id, notification_event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(gym_id, ()))
+        for subscriber in subscribers:
+            _offer(subscriber, notification_event)
+
+    def publish_all(self, notification_event):
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        for subscriber in subscribers:
+            _offer(subscriber, notification_event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(group) for group in self._subscribers.values())
+
+
+def _offer(subscriber, notification_event):
+    try:
+        subscriber.put_nowait(notification_event)
+    except queue.Full:
+        # Slow consumer: drop its backlog and tell the client to refetch
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                break
+        subscriber.put_nowait(RESYNC_EVENT)
+
+
+broker = NotificationBroker()
+
+
+# ---------------------------------------------------------------------------
+# Publishing (transactional)
+# ---------------------------------------------------------------------------
+
+
+def _pending(session):
+    return session.info.setdefault(_SESSION_KEY, {"events": [], "unread_gyms": set()})
+
+
+def publish_notification(notification):
+    """Queue a 'notification' event for the current transaction"""
+    if notification.id is None:
+        db.session.flush()
+    pending = _pending(db.session)
+    pending["events"].append(
+        {
+            "event": "notification",
+            "id": notification.id,
+            "gym_id": notification.gym_id,
+            "data": notification.to_dict(),
+        }
+    )
+    pending["unread_gyms"].add(notification.gym_id)
+
+
+def publish_unread_count(gym_id):
+    """Queue an 'unread_count' event for the current transaction"""
+    _pending(db.session)["unread_gyms"].add(gym_id)
+
+
+def _uses_listen_notify(session):
+    return session.get_bind().dialect.name == "postgresql"
+
+
+def _to_payload(notification_event):
+    payload = json.dumps(notification_event)
+    if len(payload) > PG_NOTIFY_MAX_PAYLOAD:
+        # Too big for NOTIFY: send the id only, the stream loads the row
+        payload = json.dumps({**notification_event, "data": None})
+    return payload
+
+
+def _before_commit(session):
+    pending = session.info.get(_SESSION_KEY)
+    if not pending:
+        return
+    # Unread counts are read last so they include this transaction's writes
+    for gym_id in pending["unread_gyms"]:
+        pending["events"].append(
+            {
+                "event": "unread_count",
+                "id": None,
+                "gym_id": gym_id,
+                "data": {"count": get_unread_count(gym_id)},
+            }
+        )
+    pending["unread_gyms"] = set()
+
+    if _uses_listen_notify(session):
+        for notification_event in pending["events"]:
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": _to_payload(notification_event)},
+            )
+        pending["events"] = []
+
+
+def _after_commit(session):
+    pending = session.info.pop(_SESSION_KEY, None)
+    if not pending:
+        return
+    for notification_event in pending["events"]:
+        broker.publish(notification_event["gym_id"], notification_event)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def init_notification_events(app):
+    """Hook event delivery into the session's commit/rollback cycle"""
+    if not event.contains(db.session, "before_commit", _before_commit):
+        event.listen(db.session, "before_commit", _before_commit)
+        event.listen(db.session, "after_commit", _after_commit)
+        event.listen(db.session, "after_soft_rollback", _after_rollback)
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL LISTEN
+# ---------------------------------------------------------------------------
+
+
+class PostgresListener(threading.Thread):
+    """LISTENs on the notification channel and feeds the local broker"""
+
+    def __init__(self, app):
+        super().__init__(name="notification-listener", daemon=True)
+        self.app = app
+
+    def run(self):
+        delay = 1
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(
+                    f"Notification listener disconnected: {str(e)}. "
+                    f"Reconnecting in {delay}s"
+                )
+                # Events may have been missed while disconnected
+                broker.publish_all(RESYNC_EVENT)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    def _listen(self):
+        with self.app.app_context():
+            connection = db.engine.raw_connection()
+        # Keep this connection out of the pool: it stays in LISTEN mode
+        connection.detach()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"LISTEN {CHANNEL}")
+            logger.info(f"Listening for notification events on '{CHANNEL}'")
+            while True:
+                readable, _, _ = select_module.select(
+                    [dbapi_connection], [], [], HEARTBEAT_INTERVAL
+                )
+                if not readable:
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    notification_event = json.loads(notify.payload)
+                    broker.publish(notification_event["gym_id"], notification_event)
+        finally:
+            connection.close()
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def ensure_listener(app):
+    """Start this process's LISTEN thread on first use (PostgreSQL only)"""
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return
+    if db.engine.dialect.name != "postgresql":
+        return
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = PostgresListener(app)
+            _listener.start()
+
+
+# ---------------------------------------------------------------------------
+# SSE stream
+# ---------------------------------------------------------------------------
+
+
+def format_sse(notification_event):
+    """Format an event in the text/event-stream wire format"""
+    lines = [f"event: {notification_event['event']}"]
+    if notification_event.get("id") is not None:
+        lines.append(f"id: {notification_event['id']}")
+    lines.append(f"data: {json.dumps(notification_event['data'])}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _notification_event(notification):
+    return {
+        "event": "notification",
+        "id": notification.id,
+        "gym_id": notification.gym_id,
+        "data": notification.to_dict(),
+    }
+
+
+def open_notification_stream(app, gym_id, last_event_id=None):
+    """
+    Subscribe to a gym's events and return the SSE generator.
+
+    Called inside the request. Notifications after Last-Event-ID are
+    replayed from the database, then the database session is released so
+    the open stream doesn't hold a pooled connection.
+    """
+    ensure_listener(app)
+    # A lagging replica could miss events published before subscribing
+    use_primary()
+    # Subscribe before reading the backlog so nothing falls in between
+    subscriber = broker.subscribe(gym_id)
+
+    initial_events = []
+    last_sent_id = None
+    if last_event_id is not None:
+        try:
+            last_sent_id = int(last_event_id)
+        except (TypeError, ValueError):
+            last_sent_id = None
+    if last_sent_id is not None:
+        missed = (
+            Notification.query.filter(
+                Notification.gym_id == gym_id, Notification.id > last_sent_id
+            )
+            .order_by(Notification.id)
+            .limit(BACKFILL_LIMIT + 1)
+            .all()
+        )
+        if len(missed) > BACKFILL_LIMIT:
+            initial_events.append(RESYNC_EVENT)
+        else:
+            initial_events.extend(_notification_event(n) for n in missed)
+    initial_events.append(
+        {
+            "event": "unread_count",
+            "id": None,
+            "gym_id": gym_id,
+            "data": {"count": get_unread_count(gym_id)},
+        }
+    )
+    db.session.remove()
+
+    def generate():
+        nonlocal last_sent_id
+        deadline = time.monotonic() + MAX_STREAM_DURATION
+        try:
+            yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+            for notification_event in initial_events:
+                if notification_event.get("id") is not None:
+                    last_sent_id = notification_event["id"]
+                yield format_sse(notification_event)
+
+            while time.monotonic() < deadline:
+                try:
+                    notification_event = subscriber.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                event_id = notification_event.get("id")
+                if notification_event["event"] == "notification":
+                    if last_sent_id is not None and event_id <= last_sent_id:
+                        continue  # already replayed from the backlog
+                    if notification_event.get("data") is None:
+                        notification_event = _load_notification_event(app, event_id)
+                        if notification_event is None:
+                            continue
+                    last_sent_id = event_id
+                yield format_sse(notification_event)
+        finally:
+            broker.unsubscribe(gym_id, subscriber)
+
+    return generate()
+
+
+def _load_notification_event(app, notification_id):
+    with app.app_context():
+        try:
+            notification = db.session.get(Notification, notification_id)
+            return _notification_event(notification) if notification else None
+        finally:
+            db.session.remove()
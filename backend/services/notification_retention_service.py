@@ -0,0 +1,194 @@
+"""
+Notification retention: moves old read notifications from the hot
+notification table into notification_archive, and purges old archived rows.
+
+Work is done in small batches, each committed on its own: a batch's
+INSERT into the archive and DELETE from the hot table are one transaction,
+so an interrupted run leaves nothing half-moved and the next run simply
+continues where it stopped. A pause between batches and an overall time
+budget keep the job from monopolizing the database.
+"""
+from database import db
+from models.gym import Gym
+from models.notification import Notification
+from models.notification_archive import NotificationArchive
+from models.notification_retention_policy import NotificationRetentionPolicy
+from sqlalchemy import delete, insert, literal, select
+from datetime import datetime, timedelta
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_AFTER_DAYS = int(os.getenv("NOTIFICATION_ARCHIVE_AFTER_DAYS", "30"))
+DEFAULT_PURGE_AFTER_DAYS = int(os.getenv("NOTIFICATION_PURGE_AFTER_DAYS", "365"))
+RETENTION_BATCH_SIZE = 1000
+RETENTION_BATCH_PAUSE = 0.1  # seconds between batches
+RETENTION_MAX_DURATION = 10 * 60  # seconds per run; the rest waits for the next run
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "gym_id",
+    "member_id",
+    "title",
+    "message",
+    "type",
+    "is_read",
+    "created_at",
+)
+
+
+def get_retention_policy(gym_id):
+    """Return a gym's (archive_after_days, purge_after_days)"""
+    policy = db.session.get(NotificationRetentionPolicy, gym_id)
+    if policy:
+        return policy.archive_after_days, policy.purge_after_days
+    return DEFAULT_ARCHIVE_AFTER_DAYS, DEFAULT_PURGE_AFTER_DAYS
+
+
+def _gym_policies():
+    """(gym_id, archive_after_days, purge_after_days) for every gym"""
+    rows = db.session.execute(
+        select(
+            Gym.id,
+            NotificationRetentionPolicy.archive_after_days,
+            NotificationRetentionPolicy.purge_after_days,
+        )
+        .outerjoin(
+            NotificationRetentionPolicy,
+            NotificationRetentionPolicy.gym_id == Gym.id,
+        )
+        .order_by(Gym.id)
+    ).all()
+    for gym_id, archive_after_days, purge_after_days in rows:
+        if archive_after_days is None:
+            archive_after_days = DEFAULT_ARCHIVE_AFTER_DAYS
+            purge_after_days = DEFAULT_PURGE_AFTER_DAYS
+        yield gym_id, archive_after_days, purge_after_days
+
+
+def _archive_batch(gym_id, cutoff, batch_size):
+    """Move one batch of a gym's old read notifications; returns rows moved"""
+    ids = (
+        db.session.execute(
+            select(Notification.id)
+            .where(
+                Notification.gym_id == gym_id,
+                Notification.is_read == True,
+                Notification.created_at < cutoff,
+            )
+            .order_by(Notification.created_at, Notification.id)
+            .limit(batch_size)
+        )
+        .scalars()
+        .all()
+    )
+    if not ids:
+        return 0
+
+    archived_at = datetime.utcnow()
+    db.session.execute(
+        insert(NotificationArchive).from_select(
+            list(ARCHIVED_COLUMNS) + ["archived_at"],
+            select(
+                *(getattr(Notification, column) for column in ARCHIVED_COLUMNS),
+                literal(archived_at),
+            ).where(Notification.id.in_(ids)),
+        )
+    )
+    db.session.execute(
+        delete(Notification)
+        .where(Notification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return len(ids)
+
+
+def _purge_batch(gym_id, cutoff, batch_size):
+    """Delete one batch of a gym's old archived notifications; returns rows deleted"""
+    ids = (
+        db.session.execute(
+            select(NotificationArchive.id)
+            .where(
+                NotificationArchive.gym_id == gym_id,
+                NotificationArchive.created_at < cutoff,
+            )
+            .limit(batch_size)
+        )
+        .scalars()
+        .all()
+    )
+    if not ids:
+        return 0
+
+    db.session.execute(
+        delete(NotificationArchive)
+        .where(NotificationArchive.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return len(ids)
+
+
+def apply_notification_retention(
+    batch_size=RETENTION_BATCH_SIZE,
+    pause=RETENTION_BATCH_PAUSE,
+    max_duration=RETENTION_MAX_DURATION,
+):
+    """
+    Archive and purge notifications for all gyms according to their policies.
+    This function is called by the scheduler daily.
+    """
+    deadline = time.monotonic() + max_duration
+    archived = 0
+    purged = 0
+    try:
+        now = datetime.utcnow()
+        for gym_id, archive_after_days, purge_after_days in list(_gym_policies()):
+            archive_cutoff = now - timedelta(days=archive_after_days)
+            while time.monotonic() < deadline:
+                moved = _archive_batch(gym_id, archive_cutoff, batch_size)
+                archived += moved
+                if moved < batch_size:
+                    break
+                time.sleep(pause)
+
+            if purge_after_days is not None:
+                purge_cutoff = now - timedelta(days=purge_after_days)
+                while time.monotonic() < deadline:
+                    deleted = _purge_batch(gym_id, purge_cutoff, batch_size)
+                    purged += deleted
+                    if deleted < batch_size:
+                        break
+                    time.sleep(pause)
+
+            if time.monotonic() >= deadline:
+                logger.info(
+                    "Notification retention time budget used up; "
+                    "remaining work continues on the next run"
+                )
+                return {
+                    "success": True,
+                    "archived": archived,
+                    "purged": purged,
+                    "completed": False,
+                }
+
+        logger.info(f"Archived {archived} notifications, purged {purged}")
+        return {
+            "success": True,
+            "archived": archived,
+            "purged": purged,
+            "completed": True,
+        }
+    except Exception as e:
+        logger.error(f"Error applying notification retention: {str(e)}")
+        db.session.rollback()
+        return {
+            "success": False,
+            "error": str(e),
+            "archived": archived,
+            "purged": purged,
+        }
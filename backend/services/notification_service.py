@@ -2,6 +2,8 @@ from database import db
 from models.members import Member
 from models.notification import Notification
 from models.push_subscription import PushSubscription
+from services.notification_events import publish_notification
+from services.notification_counter_service import adjust_unread_count
 from datetime import datetime, date
 from sqlalchemy import func
 import json
@@ -51,6 +53,8 @@ def check_expired_memberships():
                     is_read=False,
                 )
                 db.session.add(notification)
+                adjust_unread_count(member.gym_id, 1)
+                publish_notification(notification)
                 notifications_created += 1
                 logger.info(
                     f"Created notification for expired member: {member.name} (ID: {member.id})"
@@ -192,6 +196,8 @@ def create_notification(gym_id, member_id, title, message, notification_type):
             is_read=False,
         )
         db.session.add(notification)
+        adjust_unread_count(gym_id, 1)
+        publish_notification(notification)
         db.session.commit()
         return notification
     except Exception as e:
@@ -1,17 +1,10 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
 import logging
 import os
 from services.notification_service import check_expired_memberships
-
-# Try to import requests, but don't fail if it's not available
-try:
-    import requests
-
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from services.notification_counter_service import repair_unread_counters
+from services.notification_retention_service import apply_notification_retention
+from services.subscription_state_service import expire_overdue_subscriptions
+from services.contest_leaderboard_service import recompute_contest_ranks
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +22,11 @@ def init_scheduler(app):
         logger.warning("Scheduler already initialized")
         return scheduler
 
+    # Imported here so processes that don't run the scheduler never load it
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+
     # Store app instance for use in background jobs
     app_instance = app
 
@@ -58,7 +56,56 @@ def init_scheduler(app):
         replace_existing=True,
     )
 
+    # Schedule daily unread-counter repair
+    repair_time = os.getenv("COUNTER_REPAIR_TIME", "03:00")
+    repair_hour, repair_minute = map(int, repair_time.split(":"))
+    scheduler.add_job(
+        func=run_counter_repair,
+        trigger=CronTrigger(hour=repair_hour, minute=repair_minute),
+        id="unread_counter_repair",
+        name="Unread Notification Counter Repair",
+        replace_existing=True,
+    )
+
+    # Schedule daily notification archival/purge
+    retention_time = os.getenv("NOTIFICATION_RETENTION_TIME", "02:00")
+    retention_hour, retention_minute = map(int, retention_time.split(":"))
+    scheduler.add_job(
+        func=run_notification_retention,
+        trigger=CronTrigger(hour=retention_hour, minute=retention_minute),
+        id="notification_retention",
+        name="Notification Archival and Purge",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    # Move subscriptions past their end date to expired
+    expiry_interval = int(os.getenv("SUBSCRIPTION_EXPIRY_INTERVAL_MINUTES", "10"))
+    scheduler.add_job(
+        func=run_subscription_expiry,
+        trigger=IntervalTrigger(minutes=expiry_interval),
+        id="subscription_expiry",
+        name="Subscription Status Expiry",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    # Store contest ranks computed from the participants' scores
+    rank_interval = int(os.getenv("CONTEST_RANK_INTERVAL_MINUTES", "5"))
+    scheduler.add_job(
+        func=run_contest_rank_recompute,
+        trigger=IntervalTrigger(minutes=rank_interval),
+        id="contest_rank_recompute",
+        name="Contest Rank Recompute",
+        replace_existing=True,
+        max_instances=1,
+    )
+
     logger.info(f"Scheduler initialized. Daily check scheduled for {check_time} UTC")
+    logger.info(f"Subscription expiry scheduled every {expiry_interval} minutes")
+    logger.info(f"Contest rank recompute scheduled every {rank_interval} minutes")
+    logger.info(f"Notification retention scheduled for {retention_time} UTC")
+    logger.info(f"Unread counter repair scheduled for {repair_time} UTC")
     logger.info("Keep-alive job scheduled to run every 14 minutes")
 
     # Also add a job to run immediately on startup (for testing)
@@ -89,6 +136,66 @@ def run_daily_check():
         logger.info(f"Daily check completed: {result}")
 
 
+def run_counter_repair():
+    """
+    Wrapper function to run the unread counter repair with app context.
+    """
+    global app_instance
+    if not app_instance:
+        logger.error("App instance not available for scheduler")
+        return
+
+    with app_instance.app_context():
+        logger.info("Running unread counter repair...")
+        result = repair_unread_counters()
+        logger.info(f"Unread counter repair completed: {result}")
+
+
+def run_notification_retention():
+    """
+    Wrapper function to run notification archival/purge with app context.
+    """
+    global app_instance
+    if not app_instance:
+        logger.error("App instance not available for scheduler")
+        return
+
+    with app_instance.app_context():
+        logger.info("Running notification retention...")
+        result = apply_notification_retention()
+        logger.info(f"Notification retention completed: {result}")
+
+
+def run_subscription_expiry():
+    """
+    Wrapper function to run the subscription expiry with app context.
+    """
+    global app_instance
+    if not app_instance:
+        logger.error("App instance not available for scheduler")
+        return
+
+    with app_instance.app_context():
+        logger.info("Running subscription expiry...")
+        result = expire_overdue_subscriptions()
+        logger.info(f"Subscription expiry completed: {result}")
+
+
+def run_contest_rank_recompute():
+    """
+    Wrapper function to run the contest rank recompute with app context.
+    """
+    global app_instance
+    if not app_instance:
+        logger.error("App instance not available for scheduler")
+        return
+
+    with app_instance.app_context():
+        logger.info("Running contest rank recompute...")
+        result = recompute_contest_ranks()
+        logger.info(f"Contest rank recompute completed: {result}")
+
+
 def run_keep_alive_and_check():
     """
     Function that runs every 14 minutes to:
@@ -106,7 +213,15 @@ def run_keep_alive_and_check():
             # This is what actually keeps the server alive on Render
             server_url = os.getenv("RENDER_EXTERNAL_URL") or os.getenv("SERVER_URL")
 
-            if server_url and REQUESTS_AVAILABLE:
+            # Try to import requests, but don't fail if it's not available
+            try:
+                import requests
+
+                requests_available = True
+            except ImportError:
+                requests_available = False
+
+            if server_url and requests_available:
                 # Remove trailing slash if present
                 server_url = server_url.rstrip("/")
                 health_url = f"{server_url}/health"
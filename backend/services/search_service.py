@@ -0,0 +1,227 @@
+"""
+Ranked search over a gym's members and trainers (model.SEARCH_FIELDS).
+
+- PostgreSQL: words of the query are matched as prefixes against a tsvector
+  index. When the pg_trgm extension is installed, queries of 3+ characters
+  also match as a substring through a trigram index (partial phone numbers
+  and emails), and trigram similarity is added to the ts_rank ranking.
+- SQLite: an FTS5 table per model, kept in sync by triggers, is created on
+  the first search and matched with prefix queries ranked by bm25.
+- Anything else (or SQLite without FTS5): LIKE on each column, ranking name
+  prefix matches first.
+"""
+from database import db
+from models.search import SEARCH_CONFIG, search_document, search_text
+from utils.serializers import projection
+from utils.sql_utils import get_dialect_name
+from sqlalchemy import and_, case, column, func, or_, select, table, text
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
+
+# Shorter queries only use word prefix matching
+SUBSTRING_MIN_LENGTH = 3
+
+_state = {}
+_state_lock = threading.Lock()
+
+
+def _terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def _like_pattern(value, prefix=False):
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def _engine_state(key, check):
+    """Per-engine flag (e.g. whether an extension is installed), checked once"""
+    key = (str(db.engine.url), key)
+    if key not in _state:
+        with _state_lock:
+            if key not in _state:
+                _state[key] = check()
+    return _state[key]
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL
+# ---------------------------------------------------------------------------
+
+
+def _has_pg_trgm():
+    return (
+        db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first()
+        is not None
+    )
+
+
+def _postgres_search(statement, model, query):
+    columns = [model.__table__.c[field] for field in model.SEARCH_FIELDS]
+    # Whole words, so to_tsquery() splits them like the indexed text
+    # (an email stays one token)
+    words = re.sub(r"[&|!():*<>'\\\\]", " ", query.lower()).split()
+    tsquery = func.to_tsquery(
+        SEARCH_CONFIG, " & ".join(f"'{word}':*" for word in words)
+    )
+    conditions = [search_document(columns).op("@@")(tsquery)]
+    rank = func.ts_rank(search_document(columns), tsquery)
+
+    normalized = query.lower()
+    # Without pg_trgm a substring match can't use an index
+    if len(normalized) >= SUBSTRING_MIN_LENGTH and _engine_state(
+        "pg_trgm", _has_pg_trgm
+    ):
+        conditions.append(
+            search_text(columns).like(_like_pattern(normalized), escape="\\")
+        )
+        rank = rank + func.similarity(search_text(columns), normalized)
+    return statement.where(or_(*conditions)).order_by(rank.desc(), model.id)
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+
+def _create_fts_table(model):
+    """Create the model's FTS5 table and sync triggers if they don't exist"""
+    name = model.__tablename__
+    fts = f"{name}_search"
+    key = model.__mapper__.primary_key[0].name
+    fields = ", ".join(model.SEARCH_FIELDS)
+    new_values = ", ".join(f"new.{field}" for field in model.SEARCH_FIELDS)
+    old_values = ", ".join(f"old.{field}" for field in model.SEARCH_FIELDS)
+    delete_old = (
+        f"INSERT INTO {fts} ({fts}, rowid, {fields}) "
+        f"VALUES ('delete', old.{key}, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {fts} (rowid, {fields}) VALUES (new.{key}, {new_values});"
+    )
+
+    with db.engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts},
+        ).first()
+        if exists:
+            return
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({fields}, "
+                f"content='{name}', content_rowid='{key}', prefix='2 3')"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {name} "
+                f"BEGIN {insert_new} END"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {name} "
+                f"BEGIN {delete_old} END"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_update "
+                f"AFTER UPDATE OF {fields} ON {name} "
+                f"BEGIN {delete_old} {insert_new} END"
+            )
+        )
+        # Index the rows that existed before the triggers
+        connection.execute(text(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')"))
+    logger.info(f"Created search table {fts}")
+
+
+def _has_fts_table(model):
+    try:
+        _create_fts_table(model)
+        return True
+    except Exception as e:
+        if not isinstance(getattr(e, "orig", e), sqlite3.OperationalError):
+            raise
+        logger.warning(f"FTS5 unavailable, searching with LIKE: {str(e)}")
+        return False
+
+
+def _sqlite_search(statement, model, terms):
+    fts = table(f"{model.__tablename__}_search", column("rowid"))
+    match = " ".join(f'"{term}"*' for term in terms)
+    return (
+        statement.join(fts, fts.c.rowid == model.id)
+        .where(column(fts.name).op("MATCH")(match))
+        .order_by(func.bm25(column(fts.name)), model.id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# LIKE fallback
+# ---------------------------------------------------------------------------
+
+
+def _like_search(statement, model, terms):
+    columns = [getattr(model, field) for field in model.SEARCH_FIELDS]
+    condition = and_(
+        *(
+            or_(*(col.ilike(_like_pattern(term), escape="\\") for col in columns))
+            for term in terms
+        )
+    )
+    name_prefix = model.name.ilike(_like_pattern(terms[0], prefix=True), escape="\\")
+    return statement.where(condition).order_by(
+        case((name_prefix, 0), else_=1), model.name, model.id
+    )
+
+
+def search(model, gym_id, query, limit=20, offset=0, fields=None):
+    """
+    Search a gym's rows of model (Member or Trainer).
+
+    Args:
+        query (str): Words to match as prefixes (validated to contain at
+            least one); 3+ characters also match as a substring on PostgreSQL
+            with pg_trgm
+        limit (int): Page size, at most SEARCH_MAX_LIMIT
+        offset (int): Rows to skip
+        fields (tuple): Columns to load (serializer fields)
+
+    Returns:
+        tuple: (rows best match first, whether there are more rows)
+    """
+    query = query.strip()
+    terms = _terms(query)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    offset = max(offset, 0)
+
+    statement = (
+        select(model)
+        .options(projection(model, fields))
+        .where(model.gym_id == gym_id)
+        .limit(limit + 1)
+        .offset(offset)
+    )
+    dialect = get_dialect_name()
+    if dialect == "postgresql":
+        statement = _postgres_search(statement, model, query)
+    elif dialect == "sqlite" and _engine_state(
+        ("fts", model.__tablename__), lambda: _has_fts_table(model)
+    ):
+        statement = _sqlite_search(statement, model, terms)
+    else:
+        statement = _like_search(statement, model, terms)
+
+    rows = db.session.execute(statement).scalars().all()
+    return rows[:limit], len(rows) > limit
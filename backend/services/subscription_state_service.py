@@ -0,0 +1,214 @@
+"""
+Current-subscription state on Member.
+
+A member's current subscription is their most recently created one.
+Member.current_subscription_id points at it, and Member.subscription_status
+and Member.subscription_end_date copy its status and end date, so status
+checks and expiry sweeps read one member row (or one index) instead of
+searching the subscription table. Member.expiration_date follows the
+current subscription's end date.
+
+Call these functions in the transaction that writes the subscription, before
+committing, so the member row never disagrees with its subscriptions.
+
+Subscription.subscription_status is also kept up to date with time:
+expire_overdue_subscriptions() (run by the scheduler) moves active
+subscriptions past their end date to expired, so queries can filter on the
+stored status alone.
+"""
+from database import db
+from models.members import Member
+from models.subscription import Subscription
+from sqlalchemy import case, func, select, update
+from utils.etag_utils import bump_resource_version
+from datetime import datetime, timezone
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_EXPIRY_BATCH_SIZE = int(
+    os.getenv("SUBSCRIPTION_EXPIRY_BATCH_SIZE", "1000")
+)
+
+
+def _latest_subscription(column):
+    """Correlated subquery: column of the member's most recent subscription"""
+    return (
+        select(column)
+        .where(
+            Subscription.member_id == Member.id,
+            Subscription.gym_id == Member.gym_id,
+        )
+        .order_by(Subscription.created_at.desc(), Subscription.id.desc())
+        .limit(1)
+        .correlate(Member)
+        .scalar_subquery()
+    )
+
+
+def refresh_current_subscription(gym_id, member_ids=None):
+    """
+    Recompute the current subscription of a gym's members with one UPDATE.
+
+    Args:
+        gym_id (int): Gym of the members
+        member_ids: Member ids (list or select), or None for all members of the gym
+
+    Returns:
+        int: Number of member rows updated
+    """
+    conditions = [Member.gym_id == gym_id]
+    if member_ids is not None:
+        conditions.append(Member.id.in_(member_ids))
+
+    end_date = _latest_subscription(Subscription.end_date)
+    result = db.session.execute(
+        update(Member)
+        .where(*conditions)
+        .values(
+            current_subscription_id=_latest_subscription(Subscription.id),
+            subscription_status=_latest_subscription(Subscription.subscription_status),
+            subscription_end_date=end_date,
+            # Members without subscriptions keep their own expiration date
+            expiration_date=func.coalesce(end_date, Member.expiration_date),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # Loaded members would otherwise keep the old values until commit
+    for member in list(db.session.identity_map.values()):
+        if isinstance(member, Member) and member.gym_id == gym_id:
+            db.session.expire(member)
+    return result.rowcount
+
+
+def extend_current_subscription(member, new_end_date):
+    """
+    Move a member's expiration date, together with the end date of their
+    current subscription. An expired current subscription becomes active again.
+    """
+    if isinstance(new_end_date, str):
+        new_end_date = datetime.fromisoformat(new_end_date.replace("Z", "+00:00"))
+    if new_end_date.tzinfo is not None:
+        # Dates are stored as naive UTC
+        new_end_date = new_end_date.astimezone(timezone.utc).replace(tzinfo=None)
+    member.expiration_date = new_end_date
+    if member.current_subscription_id is None:
+        return
+
+    subscription = db.session.get(Subscription, member.current_subscription_id)
+    if subscription is None:
+        return
+    subscription.end_date = new_end_date
+    if subscription.subscription_status == "expired":
+        subscription.subscription_status = "active"
+    member.subscription_end_date = new_end_date
+    member.subscription_status = subscription.subscription_status
+
+
+def extend_current_subscriptions(gym_id, member_ids):
+    """
+    Bulk version of extend_current_subscription: copy the (already updated)
+    expiration dates of the members to their current subscriptions.
+    """
+    current_ids = select(Member.current_subscription_id).where(
+        Member.gym_id == gym_id,
+        Member.id.in_(member_ids),
+        Member.current_subscription_id.isnot(None),
+    )
+    db.session.execute(
+        update(Subscription)
+        .where(Subscription.id.in_(current_ids))
+        .values(
+            end_date=select(Member.expiration_date)
+            .where(Member.current_subscription_id == Subscription.id)
+            .correlate(Subscription)
+            .scalar_subquery(),
+            subscription_status=case(
+                (Subscription.subscription_status == "expired", "active"),
+                else_=Subscription.subscription_status,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    refresh_current_subscription(gym_id, member_ids)
+
+
+def backfill_current_subscriptions():
+    """Set the current-subscription columns of every member, one gym at a time"""
+    gym_ids = db.session.execute(select(Member.gym_id).distinct()).scalars().all()
+    updated = 0
+    for gym_id in gym_ids:
+        updated += refresh_current_subscription(gym_id)
+        db.session.commit()
+    logger.info(f"Backfilled current subscriptions of {updated} members")
+    return updated
+
+
+def _expire_batch(model, status_column, end_column, now, batch_size):
+    """
+    Set status to expired on up to batch_size overdue active rows of model.
+    Returns the gym ids of the expired rows.
+    """
+    overdue = (status_column == "active", end_column < now)
+    rows = db.session.execute(
+        select(model.id, model.gym_id).where(*overdue).limit(batch_size)
+    ).all()
+    if rows:
+        db.session.execute(
+            update(model)
+            .where(model.id.in_([row.id for row in rows]), *overdue)
+            .values({status_column: "expired"})
+            .execution_options(synchronize_session=False)
+        )
+    return [row.gym_id for row in rows]
+
+
+def expire_overdue_subscriptions(now=None, batch_size=None):
+    """
+    Set active subscriptions whose end date has passed to expired, and copy
+    the new status to the members they are current for.
+
+    Runs one UPDATE per batch of SUBSCRIPTION_EXPIRY_BATCH_SIZE rows and
+    commits each batch, so a large backlog never holds long row locks.
+    This function is called by the scheduler every few minutes.
+
+    Returns:
+        dict: Number of subscriptions and members expired
+    """
+    now = now or datetime.utcnow()
+    batch_size = batch_size or SUBSCRIPTION_EXPIRY_BATCH_SIZE
+    counts = {"subscriptions_expired": 0, "members_expired": 0}
+
+    for key, model, status_column, end_column, resource in (
+        (
+            "subscriptions_expired",
+            Subscription,
+            Subscription.subscription_status,
+            Subscription.end_date,
+            "subscriptions",
+        ),
+        (
+            "members_expired",
+            Member,
+            Member.subscription_status,
+            Member.subscription_end_date,
+            "members",
+        ),
+    ):
+        while True:
+            gym_ids = _expire_batch(model, status_column, end_column, now, batch_size)
+            if not gym_ids:
+                break
+            for gym_id in set(gym_ids):
+                bump_resource_version(gym_id, resource)
+            db.session.commit()
+            counts[key] += len(gym_ids)
+            if len(gym_ids) < batch_size:
+                break
+
+    logger.info(
+        f"Expired {counts['subscriptions_expired']} subscriptions "
+        f"({counts['members_expired']} members)"
+    )
+    return counts
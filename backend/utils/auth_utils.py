@@ -1,13 +1,19 @@
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from itsdangerous import BadData, URLSafeTimedSerializer
 from models.gym import Gym
 from sqlalchemy.exc import SQLAlchemyError
 from utils.validation import ValidationError
+import hmac
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+STREAM_TOKEN_SALT = "notification-stream"
+STREAM_TOKEN_MAX_AGE = int(os.getenv("NOTIFICATION_STREAM_TOKEN_MAX_AGE", "60"))
+
 
 def owner_required(f):
     """
@@ -74,6 +80,74 @@ def owner_required(f):
     return decorated_function
 
 
+def _stream_token_serializer():
+    return URLSafeTimedSerializer(
+        current_app.config["JWT_SECRET_KEY"], salt=STREAM_TOKEN_SALT
+    )
+
+
+def create_stream_token(gym_id):
+    """Short-lived token that only authenticates a gym's notification stream"""
+    return _stream_token_serializer().dumps(gym_id)
+
+
+def stream_token_required(f):
+    """
+    Decorator for Server-Sent Events routes. EventSource can't send an
+    Authorization header, so the client passes ?token= from
+    create_stream_token() instead of its access JWT, which would otherwise
+    end up in proxy and access logs. The token is signed separately from
+    JWTs (it isn't accepted by any other route) and expires after
+    STREAM_TOKEN_MAX_AGE seconds; it is only checked when the stream opens.
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = request.args.get("token")
+        if not token:
+            return jsonify({"message": "Missing stream token"}), 401
+        try:
+            gym_id = _stream_token_serializer().loads(
+                token, max_age=STREAM_TOKEN_MAX_AGE
+            )
+        except BadData:
+            return jsonify({"message": "Invalid or expired stream token"}), 401
+
+        gym = Gym.query.get(gym_id)
+        if not gym:
+            return jsonify({"message": "User not found"}), 404
+        if not gym.is_owner():
+            return jsonify({"message": "Access denied. Owner role required"}), 403
+
+        kwargs["current_gym"] = gym
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def ops_token_required(f):
+    """
+    Decorator for operational endpoints (pool, replica, cache metrics). They
+    are only served when OPS_TOKEN is configured, to requests sending
+    "Authorization: Bearer <OPS_TOKEN>"; without OPS_TOKEN they return 404.
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        ops_token = current_app.config.get("OPS_TOKEN")
+        if not ops_token:
+            return jsonify({"message": "Not found"}), 404
+
+        authorization = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(
+            authorization.encode("utf-8"), f"Bearer {ops_token}".encode("utf-8")
+        ):
+            return jsonify({"message": "Invalid ops token"}), 401
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
 def role_required(required_role):
     """
     Decorator to require a specific role for accessing a route
@@ -133,11 +207,18 @@ def get_current_gym():
     return Gym.query.get(int(current_user_id))
 
 
-def member_required(f):
+def member_required(f=None, *, load_member=True):
     """
     Decorator to require member authentication for accessing a route
     Returns member_id and gym_id from token
+
+    Args:
+        load_member (bool): Look up the member (passed as member) and reject
+            missing or inactive ones. With False the route only gets the
+            token's member_id and gym_id and must check the member itself.
     """
+    if f is None:
+        return lambda func: member_required(func, load_member=load_member)
 
     @wraps(f)
     @jwt_required()
@@ -169,6 +250,11 @@ def member_required(f):
             member_id = int(parts[1])
             gym_id = int(parts[2])
 
+            if not load_member:
+                kwargs["member_id"] = member_id
+                kwargs["gym_id"] = gym_id
+                return f(*args, **kwargs)
+
             # Get the member from database
             member = Member.query.filter_by(id=member_id, gym_id=gym_id).first()
 
@@ -190,6 +276,9 @@ def member_required(f):
             kwargs["gym_id"] = gym_id
             kwargs["member"] = member
             return f(*args, **kwargs)
+        except ValidationError:
+            # Let ValidationError propagate to be handled by error handlers (returns 400)
+            raise
         except (ValueError, TypeError) as e:
             logger.error(f"Token validation error: {str(e)}", exc_info=True)
             return jsonify({"message": f"Invalid token: {str(e)}"}), 401
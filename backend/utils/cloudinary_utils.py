@@ -1,10 +1,8 @@
 """
 Cloudinary utility functions for image uploads
 """
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
 from dotenv import load_dotenv
+import threading
 import os
 import logging
 
@@ -12,13 +10,31 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True,  # Use HTTPS
-)
+_uploader = None
+_uploader_lock = threading.Lock()
+
+
+def get_uploader():
+    """
+    Import and configure Cloudinary on first use, so starting the app (and
+    every worker or script that imports it) doesn't pay for it
+    """
+    global _uploader
+    if _uploader is None:
+        with _uploader_lock:
+            if _uploader is None:
+                import cloudinary
+                import cloudinary.uploader
+
+                # Configure Cloudinary
+                cloudinary.config(
+                    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+                    api_key=os.getenv("CLOUDINARY_API_KEY"),
+                    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+                    secure=True,  # Use HTTPS
+                )
+                _uploader = cloudinary.uploader
+    return _uploader
 
 
 def upload_member_photo(file, member_id=None, gym_id=None):
@@ -45,7 +61,7 @@ def upload_member_photo(file, member_id=None, gym_id=None):
         filename = f"member_{member_id}" if member_id else "member"
 
         # Upload to Cloudinary with optimizations
-        result = cloudinary.uploader.upload(
+        result = get_uploader().upload(
             file,
             folder=folder_path,
             public_id=filename,
@@ -102,7 +118,7 @@ def upload_trainer_photo(file, trainer_id=None, gym_id=None):
         filename = f"trainer_{trainer_id}" if trainer_id else "trainer"
 
         # Upload to Cloudinary with optimizations
-        result = cloudinary.uploader.upload(
+        result = get_uploader().upload(
             file,
             folder=folder_path,
             public_id=filename,
@@ -146,7 +162,7 @@ def delete_image(public_id):
         bool: True if successful, False otherwise
     """
     try:
-        result = cloudinary.uploader.destroy(public_id)
+        result = get_uploader().destroy(public_id)
         if result.get("result") == "ok":
             logger.info(f"Successfully deleted image from Cloudinary: {public_id}")
             return True
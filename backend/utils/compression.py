@@ -0,0 +1,170 @@
+"""
+Response compression middleware (brotli / gzip)
+"""
+from flask import request
+from collections import OrderedDict
+import threading
+import logging
+import zlib
+
+# brotli is optional - fall back to gzip only if it isn't installed
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Content codings in order of preference
+SUPPORTED_ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+}
+
+DEFAULT_MIN_SIZE = 500  # bytes; smaller bodies aren't worth compressing
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+DEFAULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def encoded_etag(etag, encoding):
+    """ETag of the compressed representation (strong ETags must differ per coding)"""
+    return f"{etag}-{encoding}"
+
+
+def etag_variants(etag):
+    """All ETags a client may hold for a resource: plain and per-coding"""
+    return [etag] + [encoded_etag(etag, encoding) for encoding in SUPPORTED_ENCODINGS]
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies keyed by (ETag, encoding), bounded in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = body
+            self.current_bytes += len(body)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+
+def compress_body(data, encoding, gzip_level, brotli_quality):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _stream_compressed(chunks, encoding, gzip_level, brotli_quality):
+    """Compress a streamed body chunk by chunk, flushing so clients see progress"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def compression_middleware(app):
+    """
+    Compress responses with brotli or gzip based on Accept-Encoding.
+
+    - Bodies smaller than COMPRESS_MIN_SIZE are sent as-is
+    - Streamed (generator) responses are compressed chunk by chunk
+    - Compressed bodies of responses with a strong ETag are cached, so the
+      same payload is only compressed once
+    """
+    min_size = app.config.get("COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE)
+    gzip_level = app.config.get("COMPRESS_GZIP_LEVEL", DEFAULT_GZIP_LEVEL)
+    brotli_quality = app.config.get("COMPRESS_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY)
+    cache = CompressedBodyCache(
+        app.config.get("COMPRESS_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+    )
+    app.extensions["compression_cache"] = cache
+
+    @app.after_request
+    def compress_response(response):
+        encoding = request.accept_encodings.best_match(SUPPORTED_ENCODINGS)
+        etag, is_weak = response.get_etag()
+
+        # Echo the coding-specific ETag the client revalidated with
+        if response.status_code == 304:
+            if (
+                encoding
+                and etag
+                and request.if_none_match.contains(encoded_etag(etag, encoding))
+            ):
+                response.set_etag(encoded_etag(etag, encoding), weak=is_weak)
+            return response
+
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code >= 300
+            or response.status_code == 204
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        if not encoding:
+            return response
+
+        if response.is_streamed:
+            response.response = _stream_compressed(
+                response.iter_encoded(), encoding, gzip_level, brotli_quality
+            )
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+
+            cache_key = (etag, encoding) if etag and not is_weak else None
+            compressed = cache.get(cache_key) if cache_key else None
+            if compressed is None:
+                compressed = compress_body(data, encoding, gzip_level, brotli_quality)
+                if cache_key:
+                    cache.set(cache_key, compressed)
+            response.set_data(compressed)
+
+        response.headers["Content-Encoding"] = encoding
+        if etag:
+            response.set_etag(encoded_etag(etag, encoding), weak=is_weak)
+        return response
@@ -0,0 +1,181 @@
+"""
+Connection-pool telemetry: checkout wait time, connections in use, overflow,
+and connect / recycle / invalidation counts per engine.
+"""
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+SLOW_CHECKOUT_MS = 500
+
+
+class PoolMetrics:
+    """Thread-safe counters of one engine's pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.connects = 0
+        self.recycles = 0
+        self.reconnects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def record_wait(self, wait_ms, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self):
+        with self._lock:
+            waits = self.checkouts + self.checkout_timeouts
+            buckets = {
+                f"le_{bound}ms": n
+                for bound, n in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            buckets[f"gt_{WAIT_BUCKETS_MS[-1]}ms"] = self.wait_buckets[-1]
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_histogram": buckets,
+                "connects": self.connects,
+                "recycles": self.recycles,
+                "reconnects_after_invalidation": self.reconnects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            _metrics_for(self).record_wait(
+                (time.perf_counter() - start) * 1000, timed_out=True
+            )
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+        _metrics_for(self).record_wait(wait_ms)
+        if wait_ms > SLOW_CHECKOUT_MS:
+            logger.warning(
+                f"Waited {wait_ms:.0f} ms for a database connection "
+                f"(in use: {self.checkedout()}, overflow: {self.overflow()})"
+            )
+        return connection
+
+
+def _metrics_for(pool):
+    # Stored on the pool; recreated pools (after dispose) start fresh
+    metrics = pool.__dict__.get("_gymsetu_metrics")
+    if metrics is None:
+        metrics = pool.__dict__.setdefault("_gymsetu_metrics", PoolMetrics())
+    return metrics
+
+
+def instrument_engine(engine):
+    """Attach connect/recycle/invalidation counters to an engine's pool events"""
+    if engine.__dict__.get("_gymsetu_instrumented"):
+        return
+    engine._gymsetu_instrumented = True
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # record_info survives reconnects of the same pool slot; info does not
+        metrics = _metrics_for(engine.pool)
+        metrics.increment("connects")
+        record_info = connection_record.record_info
+        if record_info.get("connected"):
+            if record_info.pop("invalidated", False):
+                metrics.increment("reconnects")
+            else:
+                # Reconnected without an invalidation: pool_recycle expired it
+                metrics.increment("recycles")
+        record_info["connected"] = True
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        _metrics_for(engine.pool).increment("invalidations")
+        connection_record.record_info["invalidated"] = True
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        _metrics_for(engine.pool).increment("soft_invalidations")
+        connection_record.record_info["invalidated"] = True
+
+
+def pool_status(engine):
+    """Current state and counters of an engine's pool"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "in_use": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    status.update(_metrics_for(pool).to_dict())
+    return status
+
+
+def init_pool_metrics(app):
+    """Instrument every engine of the app and add GET /health/pool"""
+    from flask import jsonify
+    from database import db
+    from utils.auth_utils import ops_token_required
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+
+    @app.route("/health/pool", methods=["GET"])
+    @ops_token_required
+    def pool_health():
+        """Connection-pool metrics of every database bind"""
+        return (
+            jsonify(
+                {
+                    "profile": app.config.get("DB_POOL_PROFILE", "default"),
+                    "pools": {
+                        bind or "default": pool_status(engine)
+                        for bind, engine in db.engines.items()
+                    },
+                }
+            ),
+            200,
+        )
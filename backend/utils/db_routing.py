@@ -0,0 +1,248 @@
+"""
+Read-replica routing for db.session.
+
+With DATABASE_REPLICA_URLS set (see config.get_replica_binds), read-only
+requests are served from a replica:
+- GET/HEAD requests read from a healthy replica; other requests, CLI
+  commands and scheduler jobs (no request) always use the primary.
+- Anything that writes (a flush, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE,
+  raw SQL text) goes to the primary, and the rest of the request stays there.
+- After a client commits a write, its requests stay on the primary for
+  REPLICA_STICKY_SECONDS so it reads its own changes. Clients are told apart
+  by their Authorization header; the window is kept per worker process.
+- Replica lag is measured at most every REPLICA_LAG_CHECK_INTERVAL seconds.
+  A replica lagging more than REPLICA_MAX_LAG seconds, or unreachable, is
+  skipped (requests fall back to the primary) until it catches up.
+"""
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+import hashlib
+import threading
+import logging
+import random
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = "replica_"
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+MAX_STICKY_CLIENTS = 10000
+READ_METHODS = ("GET", "HEAD")
+
+# Seconds since the replica last replayed a transaction from the primary;
+# 0 when it has replayed everything it received
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+_WROTE = "routing_wrote"
+_REPLICA = "routing_replica"
+
+
+class ReplicaMonitor:
+    """Cached health and lag of every replica engine"""
+
+    def __init__(self):
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def is_healthy(self, bind_key, engine):
+        state = self._state.get(bind_key)
+        if state is None or time.monotonic() - state["checked_at"] >= (
+            REPLICA_LAG_CHECK_INTERVAL
+        ):
+            # One thread measures; the others keep using the last result
+            if self._lock.acquire(blocking=state is None):
+                try:
+                    state = self._state.get(bind_key)
+                    if state is None or time.monotonic() - state["checked_at"] >= (
+                        REPLICA_LAG_CHECK_INTERVAL
+                    ):
+                        state = self._check(bind_key, engine, state)
+                finally:
+                    self._lock.release()
+        return state["healthy"]
+
+    def _check(self, bind_key, engine, previous):
+        error = None
+        lag = None
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == "postgresql":
+                    lag = connection.execute(REPLICA_LAG_SQL).scalar()
+                    lag = float(lag) if lag is not None else None
+                else:
+                    lag = 0.0
+        except Exception as e:
+            error = e
+
+        healthy = lag is not None and lag <= REPLICA_MAX_LAG
+        if previous is None or previous["healthy"] != healthy:
+            if healthy:
+                logger.info(f"Replica {bind_key} in use (lag {lag:.1f}s)")
+            elif error:
+                logger.warning(
+                    f"Replica {bind_key} unreachable, using primary: {str(error)}"
+                )
+            else:
+                logger.warning(f"Replica {bind_key} lagging ({lag}s), using primary")
+
+        state = {
+            "healthy": healthy,
+            "lag_seconds": lag,
+            # Only the exception type: its message can include hosts and users
+            "error": type(error).__name__ if error else None,
+            "checked_at": time.monotonic(),
+        }
+        self._state[bind_key] = state
+        return state
+
+    def status(self):
+        now = time.monotonic()
+        return {
+            bind_key: {
+                "healthy": state["healthy"],
+                "lag_seconds": state["lag_seconds"],
+                "error": state["error"],
+                "checked_seconds_ago": round(now - state["checked_at"], 1),
+            }
+            for bind_key, state in self._state.items()
+        }
+
+
+class StickyClients:
+    """Clients that recently wrote, and until when they read from the primary"""
+
+    def __init__(self):
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def mark(self, client_key):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= MAX_STICKY_CLIENTS:
+                self._until = {
+                    key: until for key, until in self._until.items() if until > now
+                }
+            self._until[client_key] = now + REPLICA_STICKY_SECONDS
+
+    def is_sticky(self, client_key):
+        until = self._until.get(client_key)
+        return until is not None and until > time.monotonic()
+
+
+replica_monitor = ReplicaMonitor()
+sticky_clients = StickyClients()
+
+
+def _client_key():
+    auth_header = request.headers.get("Authorization")
+    if not auth_header:
+        return None
+    return hashlib.sha1(auth_header.encode("utf-8")).hexdigest()
+
+
+def _is_write(clause):
+    if clause is None:
+        return False
+    # Plain SELECTs can be served by a replica; DML, locking reads and
+    # raw SQL text (which may write) cannot
+    return not (
+        getattr(clause, "is_select", False)
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica during read-only requests"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or engine is not self._db.engines.get(None):
+            return engine
+        if self._flushing or _is_write(clause):
+            self.info[_WROTE] = True
+            return engine
+        replica = self._replica_engine()
+        return replica if replica is not None else engine
+
+    def _replica_engine(self):
+        if self.info.get(_WROTE):
+            return None
+        if _REPLICA not in self.info:
+            self.info[_REPLICA] = self._choose_replica()
+        return self.info[_REPLICA]
+
+    def _choose_replica(self):
+        # Decided once per request (the session is scoped to the app context)
+        if not has_request_context() or request.method not in READ_METHODS:
+            return None
+        replicas = [
+            (bind_key, engine)
+            for bind_key, engine in self._db.engines.items()
+            if bind_key and bind_key.startswith(REPLICA_BIND_PREFIX)
+        ]
+        if not replicas:
+            return None
+        client_key = _client_key()
+        if client_key and sticky_clients.is_sticky(client_key):
+            return None
+        healthy = [
+            engine
+            for bind_key, engine in replicas
+            if replica_monitor.is_healthy(bind_key, engine)
+        ]
+        return random.choice(healthy) if healthy else None
+
+
+def use_primary():
+    """Serve the rest of the current request from the primary"""
+    from database import db
+
+    db.session.info[_REPLICA] = None
+
+
+def _after_commit(session):
+    if session.info.get(_WROTE) and has_request_context():
+        client_key = _client_key()
+        if client_key:
+            sticky_clients.mark(client_key)
+
+
+def init_replica_routing(app):
+    """Track writes for read-after-write stickiness and add GET /health/replicas"""
+    from flask import jsonify
+    from database import db
+    from utils.auth_utils import ops_token_required
+
+    if not event.contains(db.session, "after_commit", _after_commit):
+        event.listen(db.session, "after_commit", _after_commit)
+
+    @app.route("/health/replicas", methods=["GET"])
+    @ops_token_required
+    def replica_health():
+        """Health and lag of every read replica"""
+        return (
+            jsonify(
+                {
+                    "replicas": sorted(
+                        key
+                        for key in db.engines
+                        if key and key.startswith(REPLICA_BIND_PREFIX)
+                    ),
+                    "max_lag_seconds": REPLICA_MAX_LAG,
+                    "status": replica_monitor.status(),
+                }
+            ),
+            200,
+        )
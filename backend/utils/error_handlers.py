@@ -15,16 +15,15 @@ logger = logging.getLogger(__name__)
 def handle_validation_error(error):
     """Handle validation errors"""
     logger.warning(f"Validation error: {error.message}")
-    return (
-        jsonify(
-            {
-                "error": "Validation Error",
-                "message": error.message,
-                "field": error.field,
-            }
-        ),
-        400,
-    )
+    body = {
+        "error": "Validation Error",
+        "message": error.message,
+        "field": error.field,
+    }
+    if error.errors:
+        # Schema validation reports every invalid field at once
+        body["errors"] = error.errors
+    return jsonify(body), 400
 
 
 def register_error_handlers(app):
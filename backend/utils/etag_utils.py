@@ -0,0 +1,192 @@
+"""
+ETag / conditional GET support backed by per-gym resource version stamps.
+
+Versions are bumped automatically when rows of a versioned model are
+flushed (see init_resource_versioning). Writes that bypass the ORM unit of
+work (bulk UPDATE/INSERT statements) still call bump_resource_version().
+"""
+from functools import wraps
+from flask import request, make_response, current_app, g, has_request_context
+from sqlalchemy import event
+from database import db
+from models.resource_version import ResourceVersion, GLOBAL_SCOPE
+from utils.compression import etag_variants
+from datetime import datetime
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Table name -> resource name of models whose writes bump a version
+VERSIONED_TABLES = {
+    "member": "members",
+    "subscription": "subscriptions",
+    "subscription_plan": "subscription_plans",
+    "trainer": "trainers",
+    "contest": "contests",
+    "participant": "participants",
+    "gym": "gyms",
+}
+
+# Resources that aren't scoped to a single gym
+GLOBAL_RESOURCES = {"gyms"}
+
+_BUMPED_KEY = "bumped_resource_versions"
+
+
+def get_resource_version(gym_id, resource):
+    """Read the current version of a resource (primary-key lookup, no row loading)"""
+    version = db.session.execute(
+        db.select(ResourceVersion.version).where(
+            ResourceVersion.gym_id == gym_id, ResourceVersion.resource == resource
+        )
+    ).scalar()
+    return version or 0
+
+
+def current_resource_version(gym_id, resource):
+    """
+    The resource version for this request: read once per GET request and
+    shared by the decorators that need it (ETag, response cache).
+    """
+    if not has_request_context() or request.method not in ("GET", "HEAD"):
+        return get_resource_version(gym_id, resource)
+    versions = g.setdefault("resource_versions", {})
+    key = (gym_id, resource)
+    if key not in versions:
+        versions[key] = get_resource_version(gym_id, resource)
+    return versions[key]
+
+
+def bump_resource_version(gym_id, resource):
+    """
+    Increment the version of a resource. Call this before committing a write
+    so the bump is part of the same transaction. Only the first bump of a
+    resource in a transaction is executed.
+    """
+    bumped = db.session.info.setdefault(_BUMPED_KEY, set())
+    if (gym_id, resource) in bumped:
+        return
+    bumped.add((gym_id, resource))
+
+    dialect = db.session.get_bind().dialect.name
+    values = {
+        "gym_id": gym_id,
+        "resource": resource,
+        "version": 1,
+        "updated_at": datetime.utcnow(),
+    }
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(ResourceVersion).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ResourceVersion.gym_id, ResourceVersion.resource],
+            set_={
+                "version": ResourceVersion.version + 1,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        db.session.execute(statement)
+        return
+
+    # Generic fallback for databases without an upsert statement
+    updated = ResourceVersion.query.filter_by(gym_id=gym_id, resource=resource).update(
+        {
+            "version": ResourceVersion.version + 1,
+            "updated_at": values["updated_at"],
+        }
+    )
+    if not updated:
+        db.session.add(ResourceVersion(**values))
+
+
+def make_etag(resource, gym_id, version):
+    """Build a strong ETag for one representation of a resource version"""
+    # The query string is part of the key because it changes the response body
+    key = f"{resource}:{gym_id}:{version}:{request.full_path}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:32]
+
+
+def conditional_get(resource, gym_id_arg=None):
+    """
+    Decorator adding ETag / If-None-Match support to a GET endpoint.
+
+    The ETag is derived from the resource's version stamp, so a matching
+    request is answered with 304 without running the view or loading rows.
+    Gym-scoped views get the gym from the current_gym kwarg set by
+    owner_required; views without it use the global scope.
+
+    Args:
+        resource (str): Resource name, e.g. "members"
+        gym_id_arg (str): Optional query parameter that overrides the gym id
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            current_gym = kwargs.get("current_gym")
+            gym_id = current_gym.id if current_gym else GLOBAL_SCOPE
+            if gym_id_arg:
+                gym_id = request.args.get(gym_id_arg, gym_id, type=int)
+
+            etag = make_etag(
+                resource, gym_id, current_resource_version(gym_id, resource)
+            )
+
+            # Compressed responses carry a per-coding variant of the ETag
+            if any(request.if_none_match.contains(tag) for tag in etag_variants(etag)):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # Clients may keep the response but must revalidate before reuse
+            response.headers["Cache-Control"] = (
+                "private, no-cache" if current_gym else "public, no-cache"
+            )
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _flushed_resources(session):
+    """(gym_id, resource) of the versioned rows about to be flushed"""
+    resources = set()
+    for instance in (
+        *session.new,
+        *session.deleted,
+        *(obj for obj in session.dirty if session.is_modified(obj)),
+    ):
+        resource = VERSIONED_TABLES.get(getattr(instance, "__tablename__", None))
+        if resource in GLOBAL_RESOURCES:
+            resources.add((GLOBAL_SCOPE, resource))
+        elif resource and getattr(instance, "gym_id", None) is not None:
+            resources.add((instance.gym_id, resource))
+    return resources
+
+
+def _before_flush(session, flush_context, instances):
+    for gym_id, resource in _flushed_resources(session):
+        bump_resource_version(gym_id, resource)
+
+
+def _end_transaction(session, *args):
+    session.info.pop(_BUMPED_KEY, None)
+
+
+def init_resource_versioning(app):
+    """Bump resource versions on flush of versioned models"""
+    if not event.contains(db.session, "before_flush", _before_flush):
+        event.listen(db.session, "before_flush", _before_flush)
+        event.listen(db.session, "after_commit", _end_transaction)
+        event.listen(db.session, "after_soft_rollback", _end_transaction)
@@ -0,0 +1,65 @@
+"""
+Fast JSON provider built on orjson
+"""
+from flask.json.provider import DefaultJSONProvider
+import decimal
+import os
+
+# orjson is optional - Flask's default provider is used if it isn't installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(o):
+    """Fallback for types orjson doesn't serialize natively"""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider using orjson. datetime/date values are serialized natively
+    as ISO 8601 strings (same output as .isoformat()).
+    """
+
+    options = orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        option = self.options
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.options | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        # Build the body as bytes directly instead of going through str
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option),
+            mimetype=self.mimetype,
+        )
+
+
+def uses_native_datetimes(app):
+    """True if the app's JSON provider serializes datetimes as ISO 8601 itself"""
+    return isinstance(app.json, OrjsonProvider)
+
+
+def init_json_provider(app):
+    """Install the orjson provider unless disabled with JSON_PROVIDER=default"""
+    if ORJSON_AVAILABLE and os.getenv("JSON_PROVIDER", "orjson").lower() != "default":
+        app.json = OrjsonProvider(app)
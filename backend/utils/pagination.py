@@ -0,0 +1,34 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+from utils.validation import ValidationError
+from datetime import datetime
+import base64
+
+
+def encode_cursor(created_at, row_id):
+    """Encode the (created_at, id) of the last row on a page as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back into (created_at, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError):
+        raise ValidationError("Invalid cursor", "cursor")
+
+
+def after_cursor(query, created_at_column, id_column, cursor):
+    """
+    Restrict a query ordered by (created_at DESC, id DESC) to the rows after
+    the cursor. Uses the index instead of scanning skipped rows like OFFSET.
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return query.filter(
+        (created_at_column < created_at)
+        | ((created_at_column == created_at) & (id_column < row_id))
+    )
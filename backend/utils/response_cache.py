@@ -0,0 +1,335 @@
+"""
+Read-through cache of gym-scoped GET responses.
+
+Entries are keyed by (gym_id, resource, path and query arguments) and stamped
+with the resource version they were built from. A lookup costs the version
+read (shared with the ETag check) and returns the stored body while the
+version is unchanged. Writes bump the version (see utils/etag_utils.py), so
+entries never need to be invalidated by hand; an outdated entry is simply
+replaced the next time its key is requested.
+
+Backends, chosen with RESPONSE_CACHE_BACKEND:
+- "memory" (default): per-process LRU bounded by entries and bytes
+- "sqlite": a SQLite file shared by all worker processes on the host
+- "off": no caching
+"""
+from functools import wraps
+from flask import request, make_response, current_app, jsonify
+from models.resource_version import GLOBAL_SCOPE
+from utils.auth_utils import ops_token_required
+from utils.etag_utils import current_resource_version
+from collections import OrderedDict
+from urllib.parse import urlencode
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+# Larger responses are never cached
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024))
+)
+
+
+class MemoryCacheBackend:
+    """Thread-safe per-process LRU bounded by entry count and total body size"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes or RESPONSE_CACHE_MAX_BYTES
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, version, value):
+        size = len(value[0])
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1][0])
+            self._entries[key] = (version, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+def _private_cache_dir():
+    """
+    Per-user cache directory under TMPDIR, readable only by this user.
+    Raises PermissionError if it exists but someone else could read it.
+    """
+    path = os.path.join(
+        os.getenv("TMPDIR", "/tmp"), f"gymsetu-response-cache-{os.getuid()}"
+    )
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise PermissionError(f"{path} is not a private directory")
+    return path
+
+
+class SQLiteCacheBackend:
+    """
+    Cache in a local SQLite file, shared by the worker processes of a host.
+    Keeps at most max_entries rows; the least recently stored are pruned.
+
+    Cached bodies contain member and trainer details, so the file is created
+    readable by its owner only; SQLite gives its -wal and -shm files the
+    same mode.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600))
+        os.chmod(path, 0o600)
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        self.evictions = 0
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+            "body BLOB NOT NULL, mimetype TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_response_cache_stored "
+            "ON response_cache (stored_at)"
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key, version):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT body, mimetype FROM response_cache "
+                "WHERE key = ? AND version = ?",
+                (key, version),
+            )
+            .fetchone()
+        )
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, key, version, value):
+        body, mimetype = value
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO response_cache "
+            "(key, version, body, mimetype, stored_at) VALUES (?, ?, ?, ?, ?)",
+            (key, version, body, mimetype, time.time()),
+        )
+        self._sets += 1
+        if self._sets % 100 == 0:
+            self._prune(connection)
+
+    def _prune(self, connection):
+        pruned = connection.execute(
+            "DELETE FROM response_cache WHERE key IN ("
+            "SELECT key FROM response_cache ORDER BY stored_at DESC "
+            "LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self.evictions += max(pruned, 0)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM response_cache")
+
+    def stats(self):
+        entries, size = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM response_cache"
+            )
+            .fetchone()
+        )
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "path": self.path,
+        }
+
+
+class CacheMetrics:
+    """Thread-safe hit / miss / store counters per resource"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def increment(self, resource, name):
+        with self._lock:
+            counts = self._counts.setdefault(
+                resource, {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+            )
+            counts[name] += 1
+
+    def to_dict(self):
+        with self._lock:
+            resources = {
+                resource: dict(counts) for resource, counts in self._counts.items()
+            }
+        for counts in resources.values():
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_ratio"] = round(counts["hits"] / lookups, 3) if lookups else 0
+        return resources
+
+
+metrics = CacheMetrics()
+backend = None
+
+
+def create_backend(name=None):
+    """Backend for RESPONSE_CACHE_BACKEND (memory, sqlite or off)"""
+    name = (name or os.getenv("RESPONSE_CACHE_BACKEND", "memory")).lower()
+    if name == "off":
+        return None
+    if name == "sqlite":
+        path = os.getenv("RESPONSE_CACHE_PATH")
+        try:
+            if not path:
+                path = os.path.join(_private_cache_dir(), "responses.sqlite3")
+            return SQLiteCacheBackend(path)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Can't open response cache at {path or 'TMPDIR'}: {str(e)}")
+            return MemoryCacheBackend()
+    if name != "memory":
+        logger.warning(f"Unknown RESPONSE_CACHE_BACKEND '{name}', using 'memory'")
+    return MemoryCacheBackend()
+
+
+def _cache_key(gym_id, resource):
+    # Sorted so equivalent query strings share an entry
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"{gym_id}:{resource}:{request.path}?{query}"
+
+
+def cached_response(resource, gym_id_arg=None):
+    """
+    Decorator caching a GET endpoint's 200 responses per gym and resource
+    version. Place it below owner_required (and conditional_get): gym-scoped
+    views get the gym from the current_gym kwarg, others use the global scope.
+
+    Args:
+        resource (str): Resource whose version the response depends on
+        gym_id_arg (str): Optional query parameter that overrides the gym id
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if backend is None:
+                return f(*args, **kwargs)
+
+            current_gym = kwargs.get("current_gym")
+            gym_id = current_gym.id if current_gym else GLOBAL_SCOPE
+            if gym_id_arg:
+                gym_id = request.args.get(gym_id_arg, gym_id, type=int)
+            key = _cache_key(gym_id, resource)
+            version = current_resource_version(gym_id, resource)
+
+            try:
+                cached = backend.get(key, version)
+            except Exception as e:
+                logger.warning(f"Response cache read failed: {str(e)}")
+                metrics.increment(resource, "errors")
+                cached = None
+            if cached is not None:
+                metrics.increment(resource, "hits")
+                body, mimetype = cached
+                response = current_app.response_class(body, mimetype=mimetype)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            metrics.increment(resource, "misses")
+            response = make_response(f(*args, **kwargs))
+            response.headers["X-Cache"] = "MISS"
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+            body = response.get_data()
+            if len(body) <= RESPONSE_CACHE_MAX_ENTRY_BYTES:
+                try:
+                    backend.set(key, version, (body, response.mimetype))
+                    metrics.increment(resource, "stores")
+                except Exception as e:
+                    logger.warning(f"Response cache write failed: {str(e)}")
+                    metrics.increment(resource, "errors")
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def init_response_cache(app):
+    """Create the configured cache backend and add GET /health/cache"""
+    global backend
+    backend = create_backend()
+
+    @app.route("/health/cache", methods=["GET"])
+    @ops_token_required
+    def cache_health():
+        """Response cache backend state and hit/miss counts per resource"""
+        return (
+            jsonify(
+                {
+                    "backend": backend.name if backend else "off",
+                    "store": backend.stats() if backend else None,
+                    "resources": metrics.to_dict(),
+                }
+            ),
+            200,
+        )
@@ -0,0 +1,437 @@
+"""
+Declarative request payload schemas.
+
+A Schema is built once at import time from Field declarations and compiled
+into one generated function (like the serializers in utils/serializers.py)
+that checks every field inline, with its regexes already compiled.
+Validating a payload collects every field's error instead of stopping at
+the first, and returns a cleaned copy of the payload (strings stripped,
+numbers and dates converted).
+
+JSON bodies and form-data are validated the same way: empty strings count
+as missing, like absent keys.
+
+    MEMBER_SCHEMA.validate(data)        # returns cleaned data or raises
+
+    @validate_payload(SUBSCRIPTION_SCHEMA)
+    def add_subscription(current_gym, data): ...
+"""
+from functools import wraps
+from flask import request
+from utils.validation import (
+    ValidationError,
+    EMAIL_RE,
+    DIGITS_RE,
+    PASSWORD_RULES,
+)
+from datetime import datetime, timezone
+import math
+import re
+
+
+class Field:
+    """
+    One payload field.
+
+    Args:
+        kind (str): string, email, phone, password, integer, number, choice,
+            date (YYYY-MM-DD) or datetime (ISO 8601)
+        required (bool): Whether the field must be present and non-empty
+        label (str): Name used in error messages (defaults to the field name)
+        min_length / max_length (int): String length bounds
+        min_value / max_value (float): Numeric bounds
+        choices (tuple): Allowed values for kind="choice"
+        pattern (str): Regex the string must match fully
+        message (str): Error message when the pattern doesn't match
+        strip (bool): Strip surrounding whitespace (default: all but
+            password kinds)
+    """
+
+    def __init__(
+        self,
+        kind="string",
+        required=True,
+        label=None,
+        min_length=None,
+        max_length=None,
+        min_value=None,
+        max_value=None,
+        choices=None,
+        pattern=None,
+        message=None,
+        strip=None,
+    ):
+        self.kind = kind
+        self.required = required
+        self.label = label
+        self.min_length = min_length
+        self.max_length = max_length
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = choices
+        self.pattern = pattern
+        self.message = message
+        self.strip = kind != "password" if strip is None else strip
+
+    def optional(self):
+        """Copy of this field that may be omitted"""
+        field = Field.__new__(Field)
+        field.__dict__.update(self.__dict__, required=False)
+        return field
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+
+def _to_number(value):
+    if value.__class__ is bool:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # float() also accepts "nan" and "inf", which no column can store
+    return number if math.isfinite(number) else None
+
+
+def _to_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _to_datetime(value):
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # Stored in naive UTC columns
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _field_checks(field, label, constant):
+    """
+    (condition, message) pairs for a present value, tried in order (the
+    first true condition is the field's error), and the expression of the
+    cleaned value. A condition may assign the converted value with :=.
+    """
+    kind = field.kind
+    if kind in ("integer", "number"):
+        checks = [
+            (
+                "(value := _to_number(value)) is None",
+                f"{label} must be a valid number",
+            )
+        ]
+        if kind == "integer":
+            checks.append(("not value.is_integer()", f"{label} must be a whole number"))
+        if field.min_value is not None:
+            checks.append(
+                (
+                    f"value < {float(field.min_value)!r}",
+                    f"{label} must be at least {field.min_value}",
+                )
+            )
+        if field.max_value is not None:
+            checks.append(
+                (
+                    f"value > {float(field.max_value)!r}",
+                    f"{label} must be no more than {field.max_value}",
+                )
+            )
+        return checks, "int(value)" if kind == "integer" else "value"
+
+    checks = [("value.__class__ is not str", f"{label} must be a string")]
+    if field.min_length is not None:
+        checks.append(
+            (
+                f"len(value) < {int(field.min_length)}",
+                f"{label} must be at least {field.min_length} characters long",
+            )
+        )
+    if field.max_length is not None:
+        checks.append(
+            (
+                f"len(value) > {int(field.max_length)}",
+                f"{label} must be no more than {field.max_length} characters long",
+            )
+        )
+    if field.pattern is not None:
+        regex = constant(re.compile(field.pattern))
+        checks.append(
+            (
+                f"{regex}.fullmatch(value) is None",
+                field.message or f"{label} has an invalid format",
+            )
+        )
+    if kind == "email":
+        checks.append(("_EMAIL_RE.match(value) is None", "Invalid email format"))
+    elif kind == "phone":
+        checks.append(
+            (
+                'not 7 <= len(_DIGITS_RE.sub("", value)) <= 15',
+                "Invalid phone number format",
+            )
+        )
+    elif kind == "password":
+        for regex, message in PASSWORD_RULES:
+            checks.append((f"{constant(regex)}.search(value) is None", message))
+    elif kind == "choice":
+        choices = constant(frozenset(field.choices))
+        checks.append(
+            (
+                f"value not in {choices}",
+                f"{label} must be one of: {', '.join(field.choices)}",
+            )
+        )
+    elif kind == "date":
+        checks.append(
+            (
+                "(value := _to_date(value)) is None",
+                f"{label} must be in YYYY-MM-DD format",
+            )
+        )
+    elif kind == "datetime":
+        checks.append(
+            (
+                "(value := _to_datetime(value)) is None",
+                f"{label} must be an ISO date (YYYY-MM-DD)",
+            )
+        )
+    return checks, "value"
+
+
+def _compile_schema(fields):
+    """
+    Generate the source of a function validating every field in one pass
+    and compile it. It returns (cleaned, missing, errors).
+    """
+    namespace = {
+        "_EMAIL_RE": EMAIL_RE,
+        "_DIGITS_RE": DIGITS_RE,
+        "_to_number": _to_number,
+        "_to_date": _to_date,
+        "_to_datetime": _to_datetime,
+    }
+
+    def constant(value):
+        name = f"_c{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    lines = [
+        "def validate(data):",
+        "    cleaned = dict(data)",
+        "    missing = []",
+        "    errors = {}",
+    ]
+    for name, field in fields.items():
+        key = repr(name)
+        label = field.label or name
+        lines.append(f"    value = data.get({key})")
+        if field.strip:
+            lines.append("    if value.__class__ is str:")
+            lines.append("        value = value.strip()")
+            lines.append('    if value is None or value == "":')
+        else:
+            lines.append(
+                "    if value is None or (value.__class__ is str "
+                "and not value.strip()):"
+            )
+        if field.required:
+            lines.append(f"        missing.append({key})")
+        else:
+            lines.append(f"        if {key} in data:")
+            lines.append(f"            cleaned[{key}] = None")
+        checks, result = _field_checks(field, label, constant)
+        for condition, message in checks:
+            lines.append(f"    elif {condition}:")
+            lines.append(f"        errors[{key}] = {message!r}")
+        lines.append("    else:")
+        lines.append(f"        cleaned[{key}] = {result}")
+    lines.append("    return cleaned, missing, errors")
+
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, "<schema>", "exec"), namespace)
+    return namespace["validate"]
+
+
+class Schema:
+    """
+    Fields compiled into a validation function.
+
+    Args:
+        fields (dict): Field name -> Field, in the order errors are reported
+        checks (tuple): (function(data), field, message) run on the cleaned
+            data when every field is valid; function returns False to fail
+    """
+
+    def __init__(self, fields, checks=()):
+        self.fields = dict(fields)
+        self.checks = tuple(checks)
+        self._validate = _compile_schema(self.fields)
+
+    def partial(self):
+        """Schema with the same fields, all optional (for updates)"""
+        return Schema(
+            {name: field.optional() for name, field in self.fields.items()},
+            self.checks,
+        )
+
+    def validate(self, data):
+        """
+        Validate a payload and return a cleaned copy. Keys that aren't
+        declared are kept as they are.
+
+        Raises:
+            ValidationError: with every field error in .errors
+        """
+        if not isinstance(data, dict):
+            raise ValidationError("Request body must be an object")
+
+        cleaned, missing, errors = self._validate(data)
+        if not missing and not errors:
+            for check, field, message in self.checks:
+                if not check(cleaned):
+                    errors[field] = message
+        if missing or errors:
+            raise _validation_error(missing, errors)
+        return cleaned
+
+
+def _validation_error(missing, errors):
+    messages = list(errors.values())
+    if missing:
+        messages.insert(0, f"Missing required fields: {', '.join(missing)}")
+    all_errors = {name: "This field is required" for name in missing}
+    all_errors.update(errors)
+    field = next(iter(all_errors)) if len(all_errors) == 1 else None
+    return ValidationError("; ".join(messages), field, all_errors)
+
+
+def request_payload():
+    """The request's JSON body, or its form fields for form-data requests"""
+    if request.is_json:
+        return request.get_json(silent=True)
+    return request.form.to_dict()
+
+
+def validate_payload(schema):
+    """
+    Decorator validating the JSON or form-data body against a schema and
+    passing the cleaned payload to the view as the data keyword argument.
+    Errors propagate as ValidationError (400 with every field error).
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            # Skip validation for OPTIONS requests (CORS preflight)
+            if request.method == "OPTIONS":
+                return f(*args, **kwargs)
+            kwargs["data"] = schema.validate(request_payload())
+            return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Payload schemas
+# ---------------------------------------------------------------------------
+
+_ADDRESS_FIELDS = {
+    "address": Field(label="Address", min_length=5, max_length=200),
+    "city": Field(label="City", min_length=2, max_length=50),
+    "state": Field(label="State", min_length=2, max_length=50),
+    "zip": Field(label="ZIP code", min_length=5, max_length=10),
+}
+
+GYM_REGISTRATION_SCHEMA = Schema(
+    {
+        "name": Field(label="Name", min_length=2, max_length=100),
+        **_ADDRESS_FIELDS,
+        "phone": Field("phone"),
+        "email": Field("email"),
+        "password": Field("password"),
+    }
+)
+
+MEMBER_SCHEMA = Schema(
+    {
+        "name": Field(label="Name", min_length=2, max_length=100),
+        "email": Field("email"),
+        "phone": Field("phone"),
+        **_ADDRESS_FIELDS,
+        "expiration_date": Field("datetime", required=False, label="Expiration date"),
+    }
+)
+
+MEMBER_UPDATE_SCHEMA = Schema(
+    {
+        **MEMBER_SCHEMA.partial().fields,
+        # Optional here: the route reports a missing member_id itself
+        "member_id": Field("integer", required=False, label="Member ID", min_value=1),
+        "expiration_date": Field("date", required=False, label="Expiration date"),
+    }
+)
+
+SUBSCRIPTION_PLAN_SCHEMA = Schema(
+    {
+        "name": Field(label="Name", min_length=2, max_length=100),
+        "description": Field(label="Description", min_length=10, max_length=500),
+        "price": Field("number", label="Price", min_value=0),
+        "duration": Field("integer", label="Duration", min_value=1),
+    }
+)
+
+SUBSCRIPTION_SCHEMA = Schema(
+    {
+        "member_id": Field("integer", label="Member ID", min_value=1),
+        "subscription_plan": Field(label="Subscription plan"),
+        "subscription_status": Field(
+            "choice",
+            label="Subscription status",
+            choices=("active", "inactive", "expired", "cancelled"),
+        ),
+        "start_date": Field("date", label="Start date"),
+        "end_date": Field("date", label="End date"),
+    }
+)
+
+LOGIN_SCHEMA = Schema(
+    {
+        "email": Field("email"),
+        # Not checked against the strength rules: older passwords may not meet them
+        "password": Field("string", strip=False),
+    }
+)
+
+PASSWORD_RESET_SCHEMA = Schema(
+    {
+        "email": Field("email"),
+        "otp": Field(pattern=r"\d{6}", message="OTP must be 6 digits"),
+        "password": Field("password"),
+    }
+)
+
+CHANGE_PASSWORD_SCHEMA = Schema(
+    {
+        "email": Field("email"),
+        "old_password": Field("string", strip=False),
+        "new_password": Field("password"),
+    },
+    checks=(
+        (
+            lambda data: data["old_password"] != data["new_password"],
+            "new_password",
+            "New password must be different from old password",
+        ),
+    ),
+)
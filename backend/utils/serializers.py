@@ -0,0 +1,221 @@
+"""
+Generated, cached model serializers for list endpoints.
+
+Each serializer is compiled once per (model, fields) into a plain function
+that builds the response dict straight from the instance's loaded column
+values, instead of running to_dict()'s per-field isoformat() calls and
+conditionals. With the orjson provider datetimes are left as-is and
+serialized natively.
+
+List endpoints accept a sparse fieldset (?fields=id,name,phone) which is
+also turned into a load_only() projection, so only the needed columns are
+read from the database. Without it the default projection is the model's
+to_dict() fields, which never include password hashes or profile columns
+such as dob/weight.
+"""
+from flask import current_app
+from sqlalchemy.orm import load_only
+from datetime import datetime, date
+from models.members import Member
+from models.trainers import Trainer
+from models.subscription import Subscription
+from models.contest import Contest
+from models.participants import Participant
+from models.notification import Notification
+from utils.json_provider import uses_native_datetimes
+from utils.validation import ValidationError
+import threading
+
+# Output fields per model (same keys and order as the model's to_dict()).
+# These are also the only fields a client may request with ?fields=
+SERIALIZER_FIELDS = {
+    Member: (
+        "id",
+        "name",
+        "email",
+        "phone",
+        "address",
+        "city",
+        "dp_link",
+        "state",
+        "zip",
+        "expiration_date",
+        "gym_id",
+        "created_at",
+        "current_subscription_id",
+        "subscription_status",
+        "subscription_end_date",
+    ),
+    Trainer: (
+        "id",
+        "name",
+        "email",
+        "phone",
+        "address",
+        "city",
+        "dp_link",
+        "state",
+        "zip",
+        "gym_id",
+        "created_at",
+    ),
+    Subscription: (
+        "id",
+        "member_id",
+        "gym_id",
+        "subscription_plan",
+        "subscription_status",
+        "start_date",
+        "end_date",
+        "created_at",
+    ),
+    Contest: (
+        "id",
+        "name",
+        "description",
+        "banner_link",
+        "start_date",
+        "end_date",
+        "gym_id",
+        "created_at",
+        "updated_at",
+    ),
+    Participant: (
+        "id",
+        "member_id",
+        "contest_id",
+        "gym_id",
+        "contest_rank",
+        "participant_status",
+        "score",
+        "created_at",
+        "updated_at",
+    ),
+    Notification: (
+        "id",
+        "gym_id",
+        "member_id",
+        "title",
+        "message",
+        "type",
+        "is_read",
+        "created_at",
+        "member_name",
+        "member_phone",
+        "member_dp_link",
+    ),
+}
+
+# Output key -> (relationship, attribute) read from a related object
+SERIALIZER_RELATED_FIELDS = {
+    Notification: {
+        "member_name": ("member", "name"),
+        "member_phone": ("member", "phone"),
+        "member_dp_link": ("member", "dp_link"),
+    },
+}
+
+_serializers = {}
+_lock = threading.Lock()
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _is_datetime_column(model, field):
+    column = model.__mapper__.column_attrs[field].columns[0]
+    try:
+        return column.type.python_type in (datetime, date)
+    except NotImplementedError:
+        return False
+
+
+def _compile_serializer(model, fields, native_datetimes):
+    """Generate the source of a serializer function and compile it"""
+    related = SERIALIZER_RELATED_FIELDS.get(model, {})
+    fast_items = []
+    slow_items = []
+    for field in fields:
+        if field in related:
+            relationship, attribute = related[field]
+            fast_items.append(
+                f"{field!r}: d[{relationship!r}].{attribute} "
+                f"if d[{relationship!r}] is not None else None"
+            )
+            slow_items.append(
+                f"{field!r}: obj.{relationship}.{attribute} "
+                f"if obj.{relationship} is not None else None"
+            )
+        elif not native_datetimes and _is_datetime_column(model, field):
+            fast_items.append(f"{field!r}: _isoformat(d[{field!r}])")
+            slow_items.append(f"{field!r}: _isoformat(obj.{field})")
+        else:
+            fast_items.append(f"{field!r}: d[{field!r}]")
+            slow_items.append(f"{field!r}: obj.{field}")
+
+    source = (
+        "def serialize(obj):\n"
+        "    d = obj.__dict__\n"
+        "    try:\n"
+        f"        return {{{', '.join(fast_items)}}}\n"
+        "    except KeyError:\n"
+        "        # Expired or unloaded attributes: go through the ORM\n"
+        f"        return {{{', '.join(slow_items)}}}\n"
+    )
+    namespace = {"_isoformat": _isoformat}
+    exec(compile(source, f"<serializer {model.__name__}>", "exec"), namespace)
+    return namespace["serialize"]
+
+
+def get_serializer(model, fields=None):
+    """Return the cached serializer for a model and an optional field subset"""
+    fields = tuple(fields) if fields else SERIALIZER_FIELDS[model]
+    native_datetimes = uses_native_datetimes(current_app)
+    key = (model, fields, native_datetimes)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        with _lock:
+            serializer = _serializers.get(key)
+            if serializer is None:
+                serializer = _compile_serializer(model, fields, native_datetimes)
+                _serializers[key] = serializer
+    return serializer
+
+
+def serialize_many(model, objects, fields=None):
+    """Serialize a list of model instances"""
+    serializer = get_serializer(model, fields)
+    return [serializer(obj) for obj in objects]
+
+
+def parse_fields(model, value):
+    """
+    Parse a comma-separated ?fields= value into a field tuple.
+
+    Returns None (default projection) for an empty value. The id is always
+    included, and fields are returned in the model's canonical order so
+    equivalent requests share one compiled serializer.
+    """
+    if not value:
+        return None
+    allowed = SERIALIZER_FIELDS[model]
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValidationError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Allowed fields: {', '.join(allowed)}",
+            "fields",
+        )
+    requested.add("id")
+    return tuple(field for field in allowed if field in requested)
+
+
+def projection(model, fields=None):
+    """load_only() option that loads just the columns the serializer reads"""
+    fields = fields or SERIALIZER_FIELDS[model]
+    related = SERIALIZER_RELATED_FIELDS.get(model, {})
+    return load_only(
+        *(getattr(model, field) for field in fields if field not in related)
+    )
@@ -0,0 +1,199 @@
+"""
+Single-flight coalescing of identical concurrent GET requests.
+
+When several requests with the same signature (gym, path and query
+arguments) arrive while one of them is still being computed, only the
+first (the leader) runs the view. The others wait for its response and
+receive a copy of it. A request that waits longer than
+SINGLE_FLIGHT_TIMEOUT seconds stops waiting and runs the view itself.
+
+Endpoints include the versions of the resources they read (see
+utils/etag_utils.py) in the signature, so a request that arrives after a
+write never shares the pre-write response (which would also be served
+under the post-write ETag).
+
+Coalescing is per process; requests served by different workers are
+computed independently. Under sync workers a process handles one request
+at a time, so nothing is coalesced: it needs threaded or gevent workers.
+"""
+from functools import wraps
+from flask import request, make_response, current_app, jsonify
+from models.resource_version import GLOBAL_SCOPE
+from utils.etag_utils import current_resource_version
+from utils.auth_utils import ops_token_required
+from urllib.parse import urlencode
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "10"))
+
+
+class _Call:
+    """One in-flight computation and the response it produced"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time, sharing its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn() for key, or wait for the run already in flight.
+
+        Returns:
+            tuple: (result, shared). result is None for a follower whose
+            leader failed or didn't finish within timeout.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait(timeout)
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class SingleFlightMetrics:
+    """Thread-safe counters per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def increment(self, endpoint, name):
+        with self._lock:
+            counts = self._counts.setdefault(
+                endpoint, {"executed": 0, "coalesced": 0, "fallbacks": 0}
+            )
+            counts[name] += 1
+
+    def to_dict(self):
+        with self._lock:
+            endpoints = {
+                endpoint: dict(counts) for endpoint, counts in self._counts.items()
+            }
+        for counts in endpoints.values():
+            requests = counts["executed"] + counts["coalesced"]
+            counts["coalesced_ratio"] = (
+                round(counts["coalesced"] / requests, 3) if requests else 0
+            )
+        return endpoints
+
+
+flights = SingleFlight()
+metrics = SingleFlightMetrics()
+
+
+def _request_key(current_gym, resource=None, gym_id_arg=None):
+    # Sorted so equivalent query strings share a computation
+    query = urlencode(sorted(request.args.items(multi=True)))
+    gym_id = current_gym.id if current_gym else None
+    key = f"{gym_id}:{request.path}?{query}"
+    if resource:
+        scope = gym_id if gym_id is not None else GLOBAL_SCOPE
+        if gym_id_arg:
+            scope = request.args.get(gym_id_arg, scope, type=int)
+        resources = (resource,) if isinstance(resource, str) else resource
+        key += "@" + ".".join(
+            str(current_resource_version(scope, name)) for name in resources
+        )
+    return key
+
+
+def coalesce_requests(timeout=None, resource=None, gym_id_arg=None):
+    """
+    Decorator sharing one computation between identical concurrent GET
+    requests. Place it below owner_required so the gym is part of the key.
+
+    Args:
+        timeout (float): Seconds a request waits for the in-flight one
+            (SINGLE_FLIGHT_TIMEOUT by default)
+        resource (str or tuple): Resource version(s) to include in the key,
+            i.e. every resource whose writes change the response; required
+            below conditional_get (same resource and gym_id_arg), so a
+            shared response always matches the request's ETag
+        gym_id_arg (str): Optional query parameter that overrides the gym id
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            endpoint = request.endpoint
+            own = {}
+
+            def compute():
+                response = own["response"] = make_response(f(*args, **kwargs))
+                if response.is_streamed:
+                    return None
+                # Copied out so every waiting request gets its own response
+                return (
+                    response.get_data(),
+                    response.status_code,
+                    list(response.headers.items()),
+                )
+
+            result, shared = flights.do(
+                _request_key(kwargs.get("current_gym"), resource, gym_id_arg),
+                compute,
+                SINGLE_FLIGHT_TIMEOUT if timeout is None else timeout,
+            )
+            if not shared:
+                metrics.increment(endpoint, "executed")
+                return own["response"]
+            if result is None:
+                # The leader failed, streamed or timed out: compute our own
+                metrics.increment(endpoint, "fallbacks")
+                return f(*args, **kwargs)
+
+            metrics.increment(endpoint, "coalesced")
+            body, status, headers = result
+            response = current_app.response_class(body, status=status, headers=headers)
+            response.headers["X-Coalesced"] = "1"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def init_single_flight(app):
+    """Add GET /health/coalescing"""
+
+    @app.route("/health/coalescing", methods=["GET"])
+    @ops_token_required
+    def coalescing_health():
+        """Requests executed and coalesced per endpoint"""
+        return (
+            jsonify(
+                {
+                    "timeout_seconds": SINGLE_FLIGHT_TIMEOUT,
+                    "in_flight": flights.in_flight(),
+                    "endpoints": metrics.to_dict(),
+                }
+            ),
+            200,
+        )
@@ -0,0 +1,39 @@
+"""
+Dialect-aware SQL expression helpers
+"""
+from sqlalchemy import func
+from database import db
+
+
+def get_dialect_name():
+    """Return the name of the database dialect in use (e.g. 'postgresql', 'sqlite')"""
+    return db.session.get_bind().dialect.name
+
+
+def start_of_day(expression):
+    """Truncate a datetime expression to midnight"""
+    dialect = get_dialect_name()
+    if dialect == "postgresql":
+        return func.date_trunc("day", expression)
+    if dialect == "sqlite":
+        # SQLite compares datetimes as text: use the format SQLAlchemy binds
+        # datetime parameters in, so comparisons with them are exact
+        return func.strftime("%Y-%m-%d 00:00:00.000000", expression, type_=db.DateTime)
+    raise ValueError(f"Date arithmetic is not supported for database: {dialect}")
+
+
+def add_months(expression, months):
+    """
+    Add a whole number of months to a datetime expression in SQL.
+
+    PostgreSQL clamps to the end of shorter months (Jan 31 + 1 month = Feb 28),
+    matching dateutil's relativedelta. SQLite's date modifier normalizes
+    overflowing days instead (Jan 31 + 1 month = Mar 3).
+    """
+    months = int(months)
+    dialect = get_dialect_name()
+    if dialect == "postgresql":
+        return expression + func.make_interval(0, months)
+    if dialect == "sqlite":
+        return func.datetime(expression, f"{months:+d} months")
+    raise ValueError(f"Date arithmetic is not supported for database: {dialect}")
@@ -1,3 +1,4 @@
+import math
 import re
 from functools import wraps
 from flask import request, jsonify
@@ -7,36 +8,42 @@ from datetime import datetime
 class ValidationError(Exception):
     """Custom exception for validation errors"""
 
-    def __init__(self, message, field=None):
+    def __init__(self, message, field=None, errors=None):
         self.message = message
         self.field = field
+        # Field name -> message, when several fields were checked at once
+        self.errors = errors
         super().__init__(self.message)
 
 
+EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+DIGITS_RE = re.compile(r"\D")
+PASSWORD_RULES = (
+    (re.compile(r".{8}", re.DOTALL), "Password must be at least 8 characters long"),
+    (re.compile(r"[A-Z]"), "Password must contain at least one uppercase letter"),
+    (re.compile(r"[a-z]"), "Password must contain at least one lowercase letter"),
+    (re.compile(r"\d"), "Password must contain at least one number"),
+)
+
+
 def validate_email(email):
     """Validate email format"""
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return re.match(pattern, email) is not None
+    return EMAIL_RE.match(email) is not None
 
 
 def validate_phone(phone):
     """Validate phone number format"""
     # Remove all non-digit characters
-    digits = re.sub(r"\D", "", phone)
+    digits = DIGITS_RE.sub("", phone)
     # Check if it's a valid length (7-15 digits)
     return 7 <= len(digits) <= 15
 
 
 def validate_password(password):
     """Validate password strength"""
-    if len(password) < 8:
-        raise ValidationError("Password must be at least 8 characters long")
-    if not re.search(r"[A-Z]", password):
-        raise ValidationError("Password must contain at least one uppercase letter")
-    if not re.search(r"[a-z]", password):
-        raise ValidationError("Password must contain at least one lowercase letter")
-    if not re.search(r"\d", password):
-        raise ValidationError("Password must contain at least one number")
+    for regex, message in PASSWORD_RULES:
+        if not regex.search(password):
+            raise ValidationError(message)
     return True
 
 
@@ -120,173 +127,57 @@ def validate_json_request(f):
     return decorated_function
 
 
-def validate_gym_registration(data):
-    """Validate gym registration data"""
-    required_fields = [
-        "name",
-        "address",
-        "city",
-        "state",
-        "zip",
-        "phone",
-        "email",
-        "password",
-    ]
-    validate_required_fields(data, required_fields)
-
-    # Validate email
-    if not validate_email(data["email"]):
-        raise ValidationError("Invalid email format")
-
-    # Validate phone
-    if not validate_phone(data["phone"]):
-        raise ValidationError("Invalid phone number format")
-
-    # Validate password
-    validate_password(data["password"])
-
-    # Validate string lengths
-    validate_string_length(data["name"], "Name", 2, 100)
-    validate_string_length(data["address"], "Address", 5, 200)
-    validate_string_length(data["city"], "City", 2, 50)
-    validate_string_length(data["state"], "State", 2, 50)
-    validate_string_length(data["zip"], "ZIP code", 5, 10)
-
-
-def validate_member_data(data):
-    """Validate member data (for creating new members - all fields required)"""
-    required_fields = ["name", "email", "phone", "address", "city", "state", "zip"]
-    validate_required_fields(data, required_fields)
-
-    # Validate email
-    if not validate_email(data["email"]):
-        raise ValidationError("Invalid email format")
-
-    # Validate phone
-    if not validate_phone(data["phone"]):
-        raise ValidationError("Invalid phone number format")
-
-    # Validate string lengths
-    validate_string_length(data["name"], "Name", 2, 100)
-    validate_string_length(data["address"], "Address", 5, 200)
-    validate_string_length(data["city"], "City", 2, 50)
-    validate_string_length(data["state"], "State", 2, 50)
-    validate_string_length(data["zip"], "ZIP code", 5, 10)
-
-
-def validate_member_update_data(data):
-    """Validate member update data (for partial updates - only validate fields that are provided)"""
-    # Only validate fields that are present in the data
-    if "email" in data:
-        if not validate_email(data["email"]):
-            raise ValidationError("Invalid email format")
-
-    if "phone" in data:
-        if not validate_phone(data["phone"]):
-            raise ValidationError("Invalid phone number format")
-
-    if "name" in data:
-        validate_string_length(data["name"], "Name", 2, 100)
-
-    if "address" in data:
-        validate_string_length(data["address"], "Address", 5, 200)
-
-    if "city" in data:
-        validate_string_length(data["city"], "City", 2, 50)
-
-    if "state" in data:
-        validate_string_length(data["state"], "State", 2, 50)
-
-    if "zip" in data:
-        validate_string_length(data["zip"], "ZIP code", 5, 10)
-
-    if "expiration_date" in data:
-        validate_date_format(data["expiration_date"], "Expiration date")
-
-
-def validate_subscription_plan_data(data):
-    """Validate subscription plan data"""
-    required_fields = ["name", "description", "price", "duration"]
-    validate_required_fields(data, required_fields)
-
-    # Validate string lengths
-    validate_string_length(data["name"], "Name", 2, 100)
-    validate_string_length(data["description"], "Description", 10, 500)
-
-    # Validate numeric values
-    validate_numeric(data["price"], "Price", 0)
-    validate_numeric(data["duration"], "Duration", 1)
-
-
-def validate_subscription_data(data):
-    """Validate subscription data"""
-    required_fields = [
-        "member_id",
-        "subscription_plan",
-        "subscription_status",
-        "start_date",
-        "end_date",
-    ]
-    validate_required_fields(data, required_fields)
-
-    # Validate dates
-    validate_date_format(data["start_date"], "Start date")
-    validate_date_format(data["end_date"], "End date")
+# Largest absolute score or delta, so adding deltas can't overflow to inf
+MAX_SCORE = 1e12
+
 
-    # Validate subscription status
-    valid_statuses = ["active", "inactive", "expired", "cancelled"]
-    if data["subscription_status"] not in valid_statuses:
+def validate_scores(scores, max_entries=1000):
+    """
+    Validate score entries ({"member_id", "score"} or {"member_id", "delta"})
+    and return them with numeric values
+    """
+    if not isinstance(scores, list) or not scores:
+        raise ValidationError("Scores must be a non-empty list", "scores")
+    if len(scores) > max_entries:
         raise ValidationError(
-            f"Subscription status must be one of: {', '.join(valid_statuses)}"
+            f"No more than {max_entries} scores can be recorded at once", "scores"
         )
 
-    # Validate member_id is numeric
-    validate_numeric(data["member_id"], "Member ID", 1)
-
-
-def validate_login_data(data):
-    """Validate login data"""
-    required_fields = ["email", "password"]
-    validate_required_fields(data, required_fields)
-
-    # Validate email
-    if not validate_email(data["email"]):
-        raise ValidationError("Invalid email format")
-
-    # Validate password is not empty
-    if not data["password"] or len(data["password"]) < 1:
-        raise ValidationError("Password cannot be empty")
-
-
-def validate_password_reset_data(data):
-    """Validate password reset data"""
-    required_fields = ["email", "otp", "password"]
-    validate_required_fields(data, required_fields)
-
-    # Validate email
-    if not validate_email(data["email"]):
-        raise ValidationError("Invalid email format")
-
-    # Validate OTP format (6 digits)
-    if not re.match(r"^\d{6}$", data["otp"]):
-        raise ValidationError("OTP must be 6 digits")
-
-    # Validate new password
-    validate_password(data["password"])
-
-
-def validate_change_password_data(data):
-    """Validate change password data"""
-    required_fields = ["email", "old_password", "new_password"]
-    validate_required_fields(data, required_fields)
-
-    # Validate email
-    if not validate_email(data["email"]):
-        raise ValidationError("Invalid email format")
-
-    # Validate new password
-    validate_password(data["new_password"])
-
-    # Ensure old and new passwords are different
-    if data["old_password"] == data["new_password"]:
-        raise ValidationError("New password must be different from old password")
+    validated = []
+    for entry in scores:
+        if not isinstance(entry, dict) or ("score" in entry) == ("delta" in entry):
+            raise ValidationError(
+                "Each score needs a member_id and either score or delta", "scores"
+            )
+        field = "score" if "score" in entry else "delta"
+        member_id = entry.get("member_id")
+        value = entry[field]
+        # JSON numbers only: float() would also accept strings like "nan" and "inf"
+        if (
+            not isinstance(member_id, int)
+            or isinstance(member_id, bool)
+            or member_id < 1
+        ):
+            raise ValidationError("Member ID must be a positive integer", "scores")
+        if (
+            not isinstance(value, (int, float))
+            or isinstance(value, bool)
+            or (isinstance(value, float) and not math.isfinite(value))
+        ):
+            raise ValidationError(f"{field} must be a finite number", "scores")
+        if abs(value) > MAX_SCORE:
+            raise ValidationError(
+                f"{field} must be between -{MAX_SCORE:.0f} and {MAX_SCORE:.0f}",
+                "scores",
+            )
+        validated.append({"member_id": member_id, field: float(value)})
+    return validated
+
+
+def validate_search_query(query, max_length=100):
+    """Validate a search query (?q=) and return it stripped"""
+    query = (query or "").strip()
+    if not re.search(r"\w", query):
+        raise ValidationError("Search query must contain a letter or digit", "q")
+    validate_string_length(query, "Search query", 1, max_length)
+    return query
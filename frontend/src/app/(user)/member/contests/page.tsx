@@ -3,7 +3,7 @@
 
 import React, { useState, useEffect } from 'react';
 import { Contest } from '@/types/member';
-import { fetchMemberContests } from '@/lib/memberApi';
+import { fetchMemberContests, invalidateMemberHome } from '@/lib/memberApi';
 import { getApiUrl } from '@/lib/api';
 
 const ContestsPage: React.FC = () => {
@@ -64,6 +64,7 @@ const ContestsPage: React.FC = () => {
         await response.json();
         alert('Successfully joined the contest!');
         // Reload contests to get updated data
+        invalidateMemberHome();
         const contestsData = await fetchMemberContests();
         if (contestsData.contests) {
           setContests(contestsData.contests);
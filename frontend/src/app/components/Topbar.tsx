@@ -13,7 +13,7 @@ import { FaGlobe } from "react-icons/fa";
 import Image from "next/image";
 import { logoutUser, getCurrentUser, UserData, fetchGymProfile, GymProfile, isMember, isTrainer } from "@/lib/auth";
 import { fetchMemberProfile } from "@/lib/memberApi";
-import { getNotifications, getUnreadCount, markAsRead, markAllAsRead, Notification, subscribePushNotifications } from "@/lib/notificationApi";
+import { getNotifications, getUnreadCount, markAsRead, markAllAsRead, Notification, subscribePushNotifications, subscribeToNotificationStream } from "@/lib/notificationApi";
 import { registerServiceWorker, subscribeToPushNotifications, requestNotificationPermission } from "@/lib/pushNotifications";
 import MemberModal from "@/app/dashboard/members/MemberModal";
 import { getApiUrl } from "@/lib/api";
@@ -334,10 +334,30 @@ const Topbar: React.FC<TopbarProps> = ({ onMenuClick }) => {
     loadNotifications();
     setupPushNotifications();
 
-    // Poll for new notifications every 30 seconds
-    const interval = setInterval(loadNotifications, 30000);
+    // Live updates over Server-Sent Events when enabled; otherwise poll every 30 seconds
+    let interval: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(loadNotifications, 30000);
+      }
+    };
+    const closeStream = subscribeToNotificationStream({
+      onNotification: (notification) =>
+        setNotifications(prev => [notification, ...prev.filter(n => n.id !== notification.id)].slice(0, 10)),
+      onUnreadCount: setNotificationCount,
+      onResync: loadNotifications,
+      onUnavailable: startPolling,
+    });
+    if (!closeStream) {
+      startPolling();
+    }
 
-    return () => clearInterval(interval);
+    return () => {
+      closeStream?.();
+      if (interval) {
+        clearInterval(interval);
+      }
+    };
   }, [isMemberUser, isTrainerUser]);
 
   // Generate profile image from user's first letter (fallback)
@@ -16,26 +16,102 @@ const getAuthHeaders = () => {
 };
 
 /**
- * Fetch member dashboard data
+ * Sections of GET api/members/home. Each section is the response body of
+ * its own endpoint (dashboard = get_member_dashboard, ...).
  */
-export const fetchMemberDashboard = async () => {
-  try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
+export type MemberHomeSection =
+  | 'dashboard'
+  | 'profile'
+  | 'workout_plan'
+  | 'diet_plan'
+  | 'trainer'
+  | 'contests'
+  | 'todays_schedule'
+  | 'weekly_progress';
+
+const MEMBER_HOME_SECTIONS: MemberHomeSection[] = [
+  'dashboard',
+  'profile',
+  'workout_plan',
+  'diet_plan',
+  'trainer',
+  'contests',
+  'todays_schedule',
+  'weekly_progress',
+];
+
+// The screens and widgets rendered on app open each ask for their own
+// section; requests within this window share one home request
+const MEMBER_HOME_REUSE_MS = 5000;
+
+let memberHomeRequest: {
+  token: string;
+  startedAt: number;
+  promise: Promise<Record<string, any>>;
+} | null = null;
 
-    const response = await fetch(getApiUrl('api/members/get_member_dashboard'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
+/**
+ * Fetch several member sections in one request
+ */
+export const fetchMemberHome = async (
+  sections: MemberHomeSection[] = MEMBER_HOME_SECTIONS
+): Promise<Record<string, any>> => {
+  const token = getToken();
+  if (!token) {
+    throw new Error('No authentication token found');
+  }
+
+  const params = new URLSearchParams({ sections: sections.join(',') });
+  const response = await fetch(getApiUrl(`api/members/home?${params}`), {
+    method: 'GET',
+    headers: getAuthHeaders(),
+  });
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch member data: ${response.statusText}`);
+  }
+
+  const data = await response.json();
+  return data.sections;
+};
+
+/**
+ * Drop the shared home response, e.g. after the member changed something
+ */
+export const invalidateMemberHome = () => {
+  memberHomeRequest = null;
+};
+
+const fetchMemberHomeSection = async (section: MemberHomeSection) => {
+  const token = getToken();
+  if (!token) {
+    throw new Error('No authentication token found');
+  }
+
+  if (
+    !memberHomeRequest ||
+    memberHomeRequest.token !== token ||
+    Date.now() - memberHomeRequest.startedAt > MEMBER_HOME_REUSE_MS
+  ) {
+    const promise = fetchMemberHome();
+    memberHomeRequest = { token, startedAt: Date.now(), promise };
+    promise.catch(() => {
+      if (memberHomeRequest?.promise === promise) {
+        memberHomeRequest = null;
+      }
     });
+  }
 
-    if (!response.ok) {
-      throw new Error(`Failed to fetch dashboard data: ${response.statusText}`);
-    }
+  const sections = await memberHomeRequest.promise;
+  return sections[section];
+};
 
-    const data = await response.json();
-    return data;
+/**
+ * Fetch member dashboard data
+ */
+export const fetchMemberDashboard = async () => {
+  try {
+    return await fetchMemberHomeSection('dashboard');
   } catch (error) {
     console.error('Error fetching member dashboard:', error);
     throw error;
@@ -47,22 +123,7 @@ export const fetchMemberDashboard = async () => {
  */
 export const fetchMemberProfile = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_member_profile'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch profile data: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('profile');
   } catch (error) {
     console.error('Error fetching member profile:', error);
     throw error;
@@ -74,22 +135,7 @@ export const fetchMemberProfile = async () => {
  */
 export const fetchWorkoutPlan = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_workout_plan'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch workout plan: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('workout_plan');
   } catch (error) {
     console.error('Error fetching workout plan:', error);
     throw error;
@@ -101,22 +147,7 @@ export const fetchWorkoutPlan = async () => {
  */
 export const fetchDietPlan = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_diet_plan'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch diet plan: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('diet_plan');
   } catch (error) {
     console.error('Error fetching diet plan:', error);
     throw error;
@@ -128,22 +159,7 @@ export const fetchDietPlan = async () => {
  */
 export const fetchMyTrainer = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_my_trainer'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch trainer data: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('trainer');
   } catch (error) {
     console.error('Error fetching trainer data:', error);
     throw error;
@@ -202,6 +218,7 @@ export const logProgress = async (progressData: {
       throw new Error(`Failed to log progress: ${response.statusText}`);
     }
 
+    invalidateMemberHome();
     const data = await response.json();
     return data;
   } catch (error) {
@@ -215,22 +232,7 @@ export const logProgress = async (progressData: {
  */
 export const fetchMemberContests = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_contests'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch contests: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('contests');
   } catch (error) {
     console.error('Error fetching contests:', error);
     throw error;
@@ -273,6 +275,7 @@ export const updateMemberProfile = async (profileData: UpdateMemberProfileData)
       throw new Error(`Failed to update profile: ${response.statusText}`);
     }
 
+    invalidateMemberHome();
     const data = await response.json();
     return data;
   } catch (error) {
@@ -301,6 +304,7 @@ export const markExerciseComplete = async (exerciseId: string, day: number) => {
       throw new Error(`Failed to mark exercise complete: ${response.statusText}`);
     }
 
+    invalidateMemberHome();
     const data = await response.json();
     return data;
   } catch (error) {
@@ -329,6 +333,7 @@ export const markMealComplete = async (mealId: string) => {
       throw new Error(`Failed to mark meal complete: ${response.statusText}`);
     }
 
+    invalidateMemberHome();
     const data = await response.json();
     return data;
   } catch (error) {
@@ -389,6 +394,7 @@ export const requestTrainingSession = async (sessionData: {
       throw new Error(`Failed to request session: ${response.statusText}`);
     }
 
+    invalidateMemberHome();
     const data = await response.json();
     return data;
   } catch (error) {
@@ -402,22 +408,7 @@ export const requestTrainingSession = async (sessionData: {
  */
 export const fetchTodaysSchedule = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_todays_schedule'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch schedule: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('todays_schedule');
   } catch (error) {
     console.error('Error fetching schedule:', error);
     throw error;
@@ -429,22 +420,7 @@ export const fetchTodaysSchedule = async () => {
  */
 export const fetchWeeklyProgress = async () => {
   try {
-    const token = getToken();
-    if (!token) {
-      throw new Error('No authentication token found');
-    }
-
-    const response = await fetch(getApiUrl('api/members/get_weekly_progress'), {
-      method: 'GET',
-      headers: getAuthHeaders(),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Failed to fetch weekly progress: ${response.statusText}`);
-    }
-
-    const data = await response.json();
-    return data;
+    return await fetchMemberHomeSection('weekly_progress');
   } catch (error) {
     console.error('Error fetching weekly progress:', error);
     throw error;
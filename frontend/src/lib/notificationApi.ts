@@ -117,6 +117,105 @@ export async function getUnreadCount(): Promise<number> {
   }
 }
 
+// Live updates over Server-Sent Events are opt-in: each open stream holds a backend
+// worker thread, so the backend needs NOTIFICATION_STREAM_ENABLED=true and threaded or
+// gevent workers (see SETUP_GUIDE.md). Otherwise the dashboard polls.
+export const NOTIFICATION_STREAM_ENABLED = process.env.NEXT_PUBLIC_NOTIFICATION_STREAM === 'true';
+
+const STREAM_RECONNECT_DELAY_MS = 5000;
+
+export interface NotificationStreamHandlers {
+  onNotification: (notification: Notification) => void;
+  onUnreadCount: (count: number) => void;
+  // Events were missed (slow connection or server reconnect) - refetch the list
+  onResync: () => void;
+  // The stream can't be opened (disabled on the server or signed out) - fall back to polling
+  onUnavailable: () => void;
+}
+
+// Short-lived token that only opens the notification stream. EventSource can't send an
+// Authorization header, and the access token must not end up in URLs (and server logs).
+async function getStreamToken(): Promise<string | null> {
+  const token = getToken();
+  if (!token) {
+    return null;
+  }
+
+  const response = await fetch(getApiUrl('api/notifications/stream-token'), {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Authorization': `Bearer ${token}`,
+    },
+  });
+  if (!response.ok) {
+    return null;
+  }
+
+  const data = await response.json();
+  return data.token || null;
+}
+
+// Open the Server-Sent Events stream of new notifications and unread counts.
+// Returns a function that closes the stream, or null if the stream is disabled or the
+// browser has no EventSource support (callers should poll instead).
+export function subscribeToNotificationStream(handlers: NotificationStreamHandlers): (() => void) | null {
+  if (!NOTIFICATION_STREAM_ENABLED || !getToken() || typeof window === 'undefined' || !('EventSource' in window)) {
+    return null;
+  }
+
+  let source: EventSource | null = null;
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+  let lastEventId: string | null = null;
+  let closed = false;
+
+  // Stream tokens expire within a minute, so the browser's own reconnect (same URL) would
+  // be rejected. Every connection gets a fresh token and resumes after the last event seen.
+  const connect = async () => {
+    const streamToken = await getStreamToken().catch(() => null);
+    if (closed) {
+      return;
+    }
+    if (!streamToken) {
+      closed = true;
+      handlers.onUnavailable();
+      return;
+    }
+
+    const params = new URLSearchParams({ token: streamToken });
+    if (lastEventId) {
+      params.set('last_event_id', lastEventId);
+    }
+    source = new EventSource(`${getApiUrl('api/notifications/stream')}?${params}`);
+
+    source.addEventListener('notification', (event) => {
+      const message = event as MessageEvent;
+      lastEventId = message.lastEventId || lastEventId;
+      handlers.onNotification(JSON.parse(message.data));
+    });
+    source.addEventListener('unread_count', (event) => {
+      handlers.onUnreadCount(JSON.parse((event as MessageEvent).data).count);
+    });
+    source.addEventListener('resync', () => handlers.onResync());
+    source.onerror = () => {
+      source?.close();
+      source = null;
+      if (!closed) {
+        reconnectTimer = setTimeout(connect, STREAM_RECONNECT_DELAY_MS);
+      }
+    };
+  };
+  connect();
+
+  return () => {
+    closed = true;
+    if (reconnectTimer) {
+      clearTimeout(reconnectTimer);
+    }
+    source?.close();
+  };
+}
+
 // Mark notification as read
 export async function markAsRead(notificationId: number): Promise<boolean> {
   const token = getToken();